@@ -5,10 +5,9 @@ import logging
 from datetime import datetime
 
 import redis
-from bson import ObjectId
 from dotenv import load_dotenv
-from flask import Flask, render_template, request
-from flask_jwt_extended import JWTManager, get_jwt_identity, verify_jwt_in_request
+from flask import Flask, jsonify, render_template, request
+from flask_jwt_extended import JWTManager
 from flask_mongoengine import MongoEngine
 from flask_session import Session
 from flask_socketio import SocketIO
@@ -16,15 +15,30 @@ from flasgger import Swagger
 from mongoengine import disconnect
 
 from config import config_by_name
+from src.cli import register_cli_commands
 from src.exceptions.user_does_not_exists import UserDoesNotExist
-from src.models.user import User
-from src.repositories.auction_repository import AuctionRepository
+from src.repositories.auction_repository import AuctionRepository, auction_cache, featured_cache, summary_cache
+from src.repositories.user_repository import user_cache
 from src.routers.user_router import user_router
 from src.routers.auth_router import auth_router
 from src.routers.auction_router import auction_router
 from src.routers.bid_router import bid_router
 from src.routers.socket_events import register_socketio_events
+from src.services.auction_scheduler import AuctionCloseScheduler
 from src.services.auction_service import AuctionService
+from src.services.bid_broadcaster import BidBroadcaster
+from src.services.bid_engine import RedisBidEngine
+from src.services.bid_event_log import BidEventLog
+from src.services.bid_sequencer import BidSequencer
+from src.services.bid_service import BidService
+from src.services.bid_writer import BidWriteBehind
+from src.services.socket_auth import listen_for_deactivations
+from src.utils import metrics
+from src.utils.request_identity import current_identity, current_user, load_identity
+from src.utils.rate_limit import RateLimiter
+from src.utils.fragment_cache import FragmentCacheExtension, fragment_cache
+from src.utils.serialization import socketio_serializer_options
+from src.utils.snapshot_cache import listen_for_invalidations
 
 # Load .env file early
 load_dotenv()
@@ -83,10 +97,107 @@ def create_app(config_name: str = "default"):
         async_mode="eventlet",
         logger=True,
         engineio_logger=True,
-        message_queue=redis_url
+        # Flask-SocketIO's test client can't run with a message queue
+        message_queue=None if my_app.config.get("TESTING") else redis_url,
+        **socketio_serializer_options(my_app.config.get("SOCKETIO_SERIALIZER", "json"))
     )
+    my_app.extensions["bid_broadcaster"] = BidBroadcaster(
+        socketio, max_rate=my_app.config.get("BID_BROADCAST_MAX_RATE", 4.0)
+    )
+    if my_app.config.get("BID_ENGINE", "mongo") == "redis":
+        my_app.extensions["bid_engine"] = RedisBidEngine(redis_client)
+    if my_app.config.get("BID_SEQUENCER_ENABLED", False):
+        my_app.extensions["bid_sequencer"] = BidSequencer(
+            my_app, socketio, BidService.commit_bid, window=my_app.config["BID_SEQUENCER_WINDOW"],
+            timeout=my_app.config.get("BID_SEQUENCER_TIMEOUT", 5.0),
+        )
+    if my_app.config.get("BID_EVENT_LOG_ENABLED", False):
+        my_app.extensions["bid_event_log"] = BidEventLog(
+            redis_client,
+            maxlen=my_app.config["BID_EVENT_LOG_MAXLEN"],
+            max_replay=my_app.config["BID_EVENT_LOG_MAX_REPLAY"],
+            ttl=my_app.config["BID_EVENT_LOG_TTL"],
+        )
+    if my_app.config.get("BID_RATE_LIMIT_ENABLED", False):
+        my_app.extensions["bid_rate_limiter"] = RateLimiter(
+            redis_client, "bid", my_app.config["BID_RATE_LIMITS"]
+        )
     register_socketio_events(socketio)
 
+    # ----------------------------
+    # Read-through caches (Redis + per-worker LRU)
+    # ----------------------------
+    auction_cache.configure(
+        redis_client=redis_client,
+        ttl=my_app.config.get("AUCTION_CACHE_TTL", 60),
+        local_size=my_app.config.get("AUCTION_CACHE_LOCAL_SIZE", 1024),
+        local_ttl=my_app.config.get("AUCTION_CACHE_LOCAL_TTL", 5),
+    )
+    summary_cache.configure(
+        redis_client=redis_client,
+        ttl=my_app.config.get("AUCTION_CACHE_TTL", 60),
+        local_size=my_app.config.get("AUCTION_CACHE_LOCAL_SIZE", 1024),
+        local_ttl=my_app.config.get("AUCTION_CACHE_LOCAL_TTL", 5),
+    )
+    featured_cache.configure(
+        redis_client=redis_client,
+        ttl=my_app.config.get("FEATURED_CACHE_TTL", 30),
+        local_ttl=my_app.config.get("AUCTION_CACHE_LOCAL_TTL", 5),
+    )
+    fragment_cache.configure(
+        redis_client=redis_client,
+        ttl=my_app.config.get("FRAGMENT_CACHE_TTL", 300),
+        local_size=my_app.config.get("FRAGMENT_CACHE_LOCAL_SIZE", 512),
+        local_ttl=my_app.config.get("FRAGMENT_CACHE_LOCAL_TTL", 60),
+    )
+    user_cache.configure(
+        redis_client=redis_client,
+        ttl=my_app.config.get("USER_CACHE_TTL", 30),
+        local_ttl=my_app.config.get("AUCTION_CACHE_LOCAL_TTL", 5),
+    )
+
+    # ----------------------------
+    # Redis pub/sub listeners (cache invalidation, socket drops for deactivated users)
+    # ----------------------------
+    def start_listener(name, listen, *args):
+        def run():
+            while True:
+                try:
+                    listen(*args)
+                except Exception as e:
+                    logger.warning(f"{name} listener stopped, retrying: {e}")
+                socketio.sleep(5)
+        socketio.start_background_task(run)
+
+    if not my_app.config.get("TESTING"):
+        start_listener("Cache invalidation", listen_for_invalidations, redis_client)
+        start_listener("User deactivation", listen_for_deactivations, socketio, redis_client)
+
+    # ----------------------------
+    # Write-behind bid persistence (replays unflushed bids on start)
+    # ----------------------------
+    if my_app.config.get("BID_WRITE_BEHIND", False):
+        bid_writer = BidWriteBehind(
+            my_app, socketio, redis_client,
+            batch_size=my_app.config["BID_FLUSH_BATCH_SIZE"],
+            interval=my_app.config["BID_FLUSH_INTERVAL"],
+        )
+        my_app.extensions["bid_writer"] = bid_writer
+        bid_writer.start()
+
+    # ----------------------------
+    # Auction close scheduler
+    # ----------------------------
+    if my_app.config.get("AUCTION_SCHEDULER_ENABLED", False):
+        scheduler = AuctionCloseScheduler(
+            my_app, socketio, redis_client,
+            horizon=my_app.config["AUCTION_SCHEDULER_HORIZON"],
+            batch_size=my_app.config["AUCTION_SCHEDULER_BATCH_SIZE"],
+            lease_ttl=my_app.config["AUCTION_SCHEDULER_LEASE_TTL"],
+        )
+        my_app.extensions["auction_scheduler"] = scheduler
+        scheduler.start()
+
     # ----------------------------
     # JWT callbacks
     # ----------------------------
@@ -95,33 +206,20 @@ def create_app(config_name: str = "default"):
         logger.debug(f"Identity loader received: {user} (type={type(user)})")
         return user if user else None
 
-    @jwt.user_lookup_loader
-    def user_lookup_callback(_jwt_header, jwt_data):
-        try:
-            identity = ObjectId(jwt_data["sub"])
-            logger.info(f"User lookup for: {identity}")
-            return User.objects.get(id=identity)
-        except Exception as e:
-            logger.warning(f"User lookup failed: {e}")
-            return None
-
     # ----------------------------
     # Middleware / hooks
     # ----------------------------
     @my_app.before_request
-    def log_cookies_and_jwt():
-        logger.info("=== Incoming Request ===")
-        logger.debug(f"Cookies: {request.cookies}")
-        try:
-            verify_jwt_in_request(optional=True)
-            identity = get_jwt_identity()
-            logger.info(f"JWT Identity: {identity}")
-        except Exception as e:
-            logger.error(f"JWT verification failed: {e}")
+    def load_request_identity():
+        # Decodes the JWT once per request and keeps it on g (static files skipped)
+        logger.debug(f"=== Incoming Request === {request.method} {request.path}")
+        load_identity()
 
     # ----------------------------
-    # Template filters
+    # Template filters / extensions
     # ----------------------------
+    my_app.jinja_env.add_extension(FragmentCacheExtension)
+
     @my_app.template_filter("datetimeformat")
     def datetimeformat(value, fmt: str = "%Y-%m-%d %H:%M"):
         return "" if value is None else value.strftime(fmt)
@@ -144,25 +242,12 @@ def create_app(config_name: str = "default"):
     @my_app.context_processor
     def inject_common_context():
         def is_authenticated():
-            try:
-                verify_jwt_in_request(optional=True)
-                return bool(get_jwt_identity())
-            except Exception:
-                return False
-
-        def get_current_user():
-            try:
-                verify_jwt_in_request(optional=True)
-                if user_id := get_jwt_identity():
-                    return User.objects.get(id=ObjectId(user_id))
-            except Exception as e:
-                logger.error(f"User lookup failed: {e}")
-            return None
+            return bool(current_identity())
 
         return dict(
             datetime=datetime,
             is_authenticated=is_authenticated,
-            current_user=get_current_user,
+            current_user=current_user,
             AuctionRepository=AuctionRepository,
             config=my_app.config,
         )
@@ -176,14 +261,24 @@ def create_app(config_name: str = "default"):
         my_app.register_blueprint(auction_router, url_prefix="/auction")
         my_app.register_blueprint(bid_router, url_prefix="/bid")
 
+    # ----------------------------
+    # CLI commands
+    # ----------------------------
+    register_cli_commands(my_app)
+
     # ----------------------------
     # Routes
     # ----------------------------
     @my_app.route("/")
     def index():
-        featured_auctions = AuctionService.get_featured_auctions(limit=20)
+        featured_auctions = AuctionService.get_featured_summaries(limit=20)
         return render_template("index.html", featured_auctions=featured_auctions)
 
+    @my_app.route("/metrics")
+    def metrics_snapshot():
+        """Per-worker counters (cache hits/misses, ...) and gauges."""
+        return jsonify(metrics.snapshot())
+
     # ----------------------------
     # Error handlers
     # ----------------------------
@@ -0,0 +1,160 @@
+"""
+Bid contention benchmark: database operations per accepted bid, with and without the BidSequencer.
+
+Many bidders hammer one auction in rounds: each round they all read the current price
+and then bid a little above it at the same moment, as in the final seconds of an auction.
+Every Mongo call made by the bid path (find, find_one_and_update, insert, update) is
+counted, and reported per accepted bid along with median/p95 latency.
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.bid_contention_benchmark --bidders 200
+    python -m benchmarks.bid_contention_benchmark --mongomock   # no server needed
+"""
+import argparse
+import os
+import random
+import statistics
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from mongoengine import connect, disconnect
+
+from src.exceptions.auction_app_error import AuctionAppError
+from src.models.auction import Auction
+from src.models.bid import Bid
+from src.models.user import User  # noqa: F401  (registers User for the ReferenceFields)
+from src.services.bid_sequencer import BidSequencer
+from src.services.bid_service import BidService
+
+COUNTED_METHODS = ('find', 'find_one', 'find_one_and_update', 'insert_one', 'insert_many',
+                   'update_one', 'update_many', 'count_documents')
+
+
+class ThreadSocketIO:
+    """The two SocketIO helpers BidSequencer uses, backed by plain threads."""
+
+    def start_background_task(self, target, *args):
+        threading.Thread(target=target, args=args, daemon=True).start()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+
+def count_db_ops():
+    """
+    Wrap the collection class's query/write methods; returns the shared Counter.
+    Only outermost calls count (mongomock implements some methods on top of others).
+    """
+    ops = Counter()
+    depth = threading.local()
+    collection_class = type(Auction._get_collection())
+    for name in COUNTED_METHODS:
+        method = getattr(collection_class, name, None)
+        if method is None:
+            continue
+
+        def counted(self, *args, _method=method, _name=name, **kwargs):
+            level = getattr(depth, 'level', 0)
+            if level == 0:
+                ops[_name] += 1
+            depth.level = level + 1
+            try:
+                return _method(self, *args, **kwargs)
+            finally:
+                depth.level = level
+        setattr(collection_class, name, counted)
+    return ops
+
+
+def seed_auction():
+    Auction._get_collection().drop()
+    Bid._get_collection().drop()
+    auction = Auction(
+        item_title='Contested item', item_description='Benchmark', starting_bid=10.0,
+        current_bid=10.0, item_condition='New', seller=ObjectId(), status='Active',
+        end_time=datetime.utcnow() + timedelta(hours=1), category='Other'
+    )
+    auction.save()
+    return auction.id
+
+
+def run(app, ops, bidders, bids_per_bidder, sequencer_window):
+    auction_id = seed_auction()
+    if sequencer_window is None:
+        app.extensions.pop('bid_sequencer', None)
+    else:
+        app.extensions['bid_sequencer'] = BidSequencer(
+            app, ThreadSocketIO(), BidService.commit_bid, window=sequencer_window
+        )
+
+    latencies, accepted = [], Counter()
+    barrier = threading.Barrier(bidders)
+
+    def bidder(index):
+        rng = random.Random(index)
+        bidder_id = ObjectId()
+        with app.app_context():
+            for _ in range(bids_per_bidder):
+                seen = Auction.objects(id=auction_id).only('current_bid').as_pymongo().first()['current_bid']
+                barrier.wait()
+                started = time.perf_counter()
+                try:
+                    BidService.place_bid(auction_id, bidder_id, seen + rng.randint(1, 5))
+                    accepted['ok'] += 1
+                except AuctionAppError:
+                    accepted['rejected'] += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+    ops.clear()
+    with ThreadPoolExecutor(max_workers=bidders) as pool:
+        list(pool.map(bidder, range(bidders)))
+    # The bidders' own price reads are client behaviour, not bid-path cost
+    ops['find'] -= bidders * bids_per_bidder
+
+    total_ops = sum(ops.values())
+    latencies.sort()
+    return {
+        'accepted': accepted['ok'],
+        'rejected': accepted['rejected'],
+        'db_ops': total_ops,
+        'ops_per_accepted': total_ops / max(accepted['ok'], 1),
+        'p50_ms': statistics.median(latencies),
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bidders', type=int, default=100)
+    parser.add_argument('--bids-per-bidder', type=int, default=5)
+    parser.add_argument('--window', type=float, default=0.02, help="Sequencer window in seconds.")
+    parser.add_argument('--db', default='auction_bid_bench')
+    parser.add_argument('--mongomock', action='store_true', help="Use an in-memory mongomock database.")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        connect(args.db, host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+    else:
+        connect(args.db, host=os.getenv('MONGO_URI', 'mongodb://localhost:27017'))
+    app = Flask(__name__)
+    ops = count_db_ops()
+    try:
+        print(f"{'mode':<22} {'accepted':>8} {'rejected':>8} {'db ops':>8} {'ops/accepted':>13} "
+              f"{'p50 ms':>8} {'p95 ms':>8}")
+        for label, window in (('one write per bid', None), (f'sequencer {args.window * 1000:.0f}ms', args.window)):
+            r = run(app, ops, args.bidders, args.bids_per_bidder, window)
+            print(f"{label:<22} {r['accepted']:>8} {r['rejected']:>8} {r['db_ops']:>8} "
+                  f"{r['ops_per_accepted']:>13.2f} {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f}")
+    finally:
+        Auction._get_collection().drop()
+        Bid._get_collection().drop()
+        disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+/auction/ JSON listing benchmark: jsonify(Auction.to_dict()) vs json_response(AuctionView).
+
+Loads one listing page exactly as the route does (AuctionService.search_auctions_page) and
+times only the response encoding, before (a dict per auction, then Flask's JSON provider)
+and after (msgspec Structs encoded straight to bytes), plus the response sizes.
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.listing_json_benchmark --page-size 100
+    python -m benchmarks.listing_json_benchmark --mongomock   # no server needed
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask, jsonify
+from mongoengine import connect, disconnect
+
+from src.models.auction import Auction
+from src.models.bid import Bid  # noqa: F401  (registers the Bid document for Auction.bids)
+from src.models.user import User  # noqa: F401  (registers User for the ReferenceFields)
+from src.models.views import AuctionView
+from src.services.auction_service import AuctionService
+from src.utils.serialization import json_response
+
+WORDS = "vintage camera lens leather jacket oak table ceramic vase signed vinyl record guitar".split()
+
+
+def seed(count, images):
+    rng = random.Random(7)
+    collection = Auction._get_collection()
+    collection.drop()
+    now = datetime.utcnow()
+    seller, bidder = ObjectId(), ObjectId()
+    collection.insert_many([{
+        'item_title': ' '.join(rng.choice(WORDS) for _ in range(4)),
+        'item_description': ' '.join(rng.choice(WORDS) for _ in range(60)),
+        'starting_bid': 10.0,
+        'current_bid': 10.0 + i,
+        'item_condition': 'New',
+        'seller': seller,
+        'status': 'Active',
+        'start_time': now - timedelta(seconds=i),
+        'end_time': now + timedelta(days=7),
+        'category': 'Other',
+        'image_urls': [f"https://res.cloudinary.com/demo/image/upload/v1/auction/{i}-{n}.jpg" for n in range(images)],
+        'bid_count': i,
+        'highest_bidder': bidder if i else None,
+        'highest_bidder_name': 'bidder' if i else None,
+        'last_bid_at': now if i else None,
+    } for i in range(count)])
+
+
+def median_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--auctions', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--images', type=int, default=6)
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--db', default='auction_listing_json_bench')
+    parser.add_argument('--mongomock', action='store_true', help="Use an in-memory mongomock database.")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        connect(args.db, host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+    else:
+        connect(args.db, host=os.getenv('MONGO_URI', 'mongodb://localhost:27017'))
+    app = Flask(__name__)
+    app.config['AUCTION_SEARCH_BACKEND'] = 'regex'
+    try:
+        seed(args.auctions, args.images)
+        with app.app_context():
+            auctions, next_cursor = AuctionService.search_auctions_page(limit=args.page_size)
+
+            def before():
+                return jsonify({'auctions': [a.to_dict() for a in auctions], 'next_cursor': next_cursor})
+
+            def after():
+                return json_response({'auctions': [AuctionView.from_document(a) for a in auctions],
+                                      'next_cursor': next_cursor})
+
+            before_ms, after_ms = median_ms(before, args.runs), median_ms(after, args.runs)
+            before_bytes, after_bytes = len(before().get_data()), len(after().get_data())
+
+        print(f"/auction/ JSON page of {len(auctions)} auctions ({args.images} images each)")
+        print(f"{'':<34} {'encode ms':>10} {'bytes':>9}")
+        print(f"{'before: jsonify(to_dict)':<34} {before_ms:>10.3f} {before_bytes:>9,}")
+        print(f"{'after: json_response(AuctionView)':<34} {after_ms:>10.3f} {after_bytes:>9,}")
+        print(f"speedup: {before_ms / after_ms:.1f}x")
+    finally:
+        Auction._get_collection().drop()
+        disconnect()
+
+
+if __name__ == '__main__':
+    main()
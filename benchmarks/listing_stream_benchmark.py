@@ -0,0 +1,108 @@
+"""
+Streamed vs materialized /auction/ JSON listing: time-to-first-byte and peak memory.
+
+For growing numbers of matching auctions, compares
+ - materialized: every match loaded into a list, then encoded into one body
+ - streamed: /auction/?stream=1 (batched no-cache cursor, array elements encoded one by one)
+reporting time to the first body chunk, total time and peak Python heap (tracemalloc) while
+producing the response.
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.listing_stream_benchmark --sizes 1000 10000 50000
+    python -m benchmarks.listing_stream_benchmark --mongomock   # no server needed
+
+mongomock sorts every match in memory before returning the first one, so its streamed
+numbers grow with the result set; use a real mongod to see the flat profile.
+"""
+import argparse
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from mongoengine import connect, disconnect
+
+from src.models.auction import Auction
+from src.models.bid import Bid  # noqa: F401  (registers the Bid document for Auction.bids)
+from src.models.user import User  # noqa: F401  (registers User for the ReferenceFields)
+from src.models.views import AuctionView
+from src.routers.auction_router import auction_router
+from src.services.auction_service import AuctionService
+from src.utils.serialization import json_response
+
+
+def seed(count):
+    collection = Auction._get_collection()
+    collection.drop()
+    now = datetime.utcnow()
+    seller = ObjectId()
+    for start in range(0, count, 5000):
+        collection.insert_many([{
+            'item_title': f"Auction {i}",
+            'item_description': "A reasonably long description of the item on sale. " * 8,
+            'starting_bid': 10.0,
+            'current_bid': 10.0,
+            'item_condition': 'New',
+            'seller': seller,
+            'status': 'Active',
+            'start_time': now - timedelta(seconds=i),
+            'end_time': now + timedelta(days=7),
+            'category': 'Other',
+            'image_urls': [f"https://res.cloudinary.com/demo/image/upload/v1/auction/{i}.jpg"],
+            'bid_count': 0,
+        } for i in range(start, min(start + 5000, count))])
+
+
+def materialized():
+    auctions = list(AuctionService.search_auctions())
+    return json_response({'auctions': [AuctionView.from_document(a) for a in auctions], 'next_cursor': None})
+
+
+def measure(app, build):
+    """(ms to first chunk, total ms, peak MiB) for producing and draining one response."""
+    with app.test_request_context('/auction/?stream=1', headers={'Accept': 'application/json'}):
+        tracemalloc.start()
+        started = time.perf_counter()
+        chunks = iter(build().response)
+        next(chunks)
+        first = time.perf_counter() - started
+        for _ in chunks:
+            pass
+        total = time.perf_counter() - started
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return first * 1000, total * 1000, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[500, 2000, 8000])
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--db', default='auction_listing_stream_bench')
+    parser.add_argument('--mongomock', action='store_true', help="Use an in-memory mongomock database.")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        connect(args.db, host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+    else:
+        connect(args.db, host=os.getenv('MONGO_URI', 'mongodb://localhost:27017'))
+    app = Flask(__name__)
+    app.config.update(AUCTION_SEARCH_BACKEND='regex', AUCTION_STREAM_BATCH_SIZE=args.batch_size)
+    app.register_blueprint(auction_router, url_prefix='/auction')
+    streamed = app.view_functions['auction_router.list_auctions']
+    try:
+        print(f"{'matches':>8} {'mode':<13} {'first byte ms':>14} {'total ms':>9} {'peak MiB':>9}")
+        for size in args.sizes:
+            seed(size)
+            for mode, build in (('materialized', materialized), ('streamed', streamed)):
+                first, total, peak = measure(app, build)
+                print(f"{size:>8} {mode:<13} {first:>14.1f} {total:>9.1f} {peak:>9.1f}")
+    finally:
+        Auction._get_collection().drop()
+        disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Search benchmark: legacy icontains regex vs the Mongo text index.
+
+Seeds a scratch database with synthetic auctions and times the first page of
+AuctionRepository.search_auctions_page under both AUCTION_SEARCH_BACKEND settings.
+Needs a real MongoDB (mongomock has no $text support):
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.search_benchmark --sizes 100000 1000000
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from flask import Flask
+from mongoengine import connect, disconnect
+
+from src.models.auction import Auction
+from src.models.bid import Bid  # noqa: F401  (registers the Bid document for Auction.bids)
+from src.repositories.auction_repository import AuctionRepository
+
+WORDS = (
+    "vintage camera lens leather jacket oak table ceramic vase signed vinyl record guitar amplifier "
+    "silver watch mechanical keyboard gaming laptop mountain bike espresso machine antique clock "
+    "wool scarf sneakers limited edition poster comic book trading card drone tripod speaker"
+).split()
+CATEGORIES = ['Electronics', 'Fashion', 'Home', 'Collectibles', 'Other']
+TERMS = ['camera', 'antique clock', 'limited edition', 'zeppelin']  # last one has no matches
+
+
+def _sentence(rng, n):
+    return ' '.join(rng.choice(WORDS) for _ in range(n))
+
+
+def seed(size, batch=10000):
+    rng = random.Random(42)
+    collection = Auction._get_collection()
+    collection.drop()
+    now = datetime.utcnow()
+    seller = ObjectId()
+    for start in range(0, size, batch):
+        docs = []
+        for i in range(start, min(start + batch, size)):
+            docs.append({
+                'item_title': _sentence(rng, 4),
+                'item_description': _sentence(rng, 60),
+                'starting_bid': 10.0,
+                'current_bid': 10.0,
+                'item_condition': 'New',
+                'seller': seller,
+                'status': 'Active',
+                'bids': [],
+                'start_time': now - timedelta(seconds=i),
+                'end_time': now + timedelta(days=7),
+                'category': rng.choice(CATEGORIES),
+                'image_urls': [],
+            })
+        collection.insert_many(docs, ordered=False)
+    Auction.ensure_indexes()
+
+
+def time_search(app, backend, term, runs):
+    app.config['AUCTION_SEARCH_BACKEND'] = backend
+    timings = []
+    with app.app_context():
+        for _ in range(runs):
+            started = time.perf_counter()
+            AuctionRepository.search_auctions_page(search_query=term, limit=24)
+            timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--db', default='auction_search_bench')
+    args = parser.parse_args()
+
+    connect(args.db, host=os.getenv('MONGO_URI', 'mongodb://localhost:27017'))
+    app = Flask(__name__)
+    try:
+        print(f"{'auctions':>10}  {'term':<16} {'regex ms':>10} {'text ms':>10} {'speedup':>8}")
+        for size in args.sizes:
+            seed(size)
+            for term in TERMS:
+                regex_ms = time_search(app, 'regex', term, args.runs)
+                text_ms = time_search(app, 'text', term, args.runs)
+                print(f"{size:>10}  {term:<16} {regex_ms:>10.1f} {text_ms:>10.1f} {regex_ms / text_ms:>7.1f}x")
+    finally:
+        Auction._get_collection().drop()
+        disconnect()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Auction card benchmark: full Auction documents vs projected AuctionSummary rows.
+
+Seeds auctions shaped like busy production ones (long descriptions, several images, a large
+`bids` reference list) and, for one listing page, reports:
+ - bytes returned by Mongo (BSON size of the documents the query sends back)
+ - time to turn those raw documents into what the template renders
+   (Auction._from_son vs AuctionSummary.from_mongo)
+ - end-to-end time of the repository call
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.summary_benchmark --bids-per-auction 2000
+    python -m benchmarks.summary_benchmark --mongomock   # no server needed
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+import bson
+from bson import ObjectId
+from flask import Flask
+from mongoengine import connect, disconnect
+
+from src.models.auction import Auction
+from src.models.auction_summary import AuctionSummary
+from src.models.bid import Bid  # noqa: F401  (registers the Bid document for Auction.bids)
+from src.models.user import User  # noqa: F401  (registers User for the ReferenceFields)
+from src.repositories.auction_repository import AuctionRepository, _summary_rows
+
+WORDS = "vintage camera lens leather jacket oak table ceramic vase signed vinyl record guitar".split()
+
+
+def seed(count, bids_per_auction, images):
+    rng = random.Random(7)
+    collection = Auction._get_collection()
+    collection.drop()
+    now = datetime.utcnow()
+    seller = ObjectId()
+    docs = [{
+        'item_title': ' '.join(rng.choice(WORDS) for _ in range(4)),
+        'item_description': ' '.join(rng.choice(WORDS) for _ in range(300)),
+        'starting_bid': 10.0,
+        'current_bid': 10.0 + bids_per_auction,
+        'item_condition': 'New',
+        'seller': seller,
+        'status': 'Active',
+        'bids': [ObjectId() for _ in range(bids_per_auction)],
+        'start_time': now - timedelta(seconds=i),
+        'end_time': now + timedelta(days=7),
+        'category': 'Other',
+        'image_urls': [f"https://res.cloudinary.com/demo/image/upload/v1/auction/{i}-{n}.jpg" for n in range(images)],
+        'bid_count': bids_per_auction,
+    } for i in range(count)]
+    collection.insert_many(docs)
+
+
+def median_ms(fn, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--auctions', type=int, default=200)
+    parser.add_argument('--page-size', type=int, default=24)
+    parser.add_argument('--bids-per-auction', type=int, default=500)
+    parser.add_argument('--images', type=int, default=6)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--db', default='auction_summary_bench')
+    parser.add_argument('--mongomock', action='store_true', help="Use an in-memory mongomock database.")
+    args = parser.parse_args()
+
+    if args.mongomock:
+        import mongomock
+        connect(args.db, host='mongodb://localhost', mongo_client_class=mongomock.MongoClient)
+    else:
+        connect(args.db, host=os.getenv('MONGO_URI', 'mongodb://localhost:27017'))
+    app = Flask(__name__)
+    app.config['AUCTION_SEARCH_BACKEND'] = 'regex'
+    try:
+        seed(args.auctions, args.bids_per_auction, args.images)
+        page = Auction.objects(status='Active').order_by('-start_time', '-id').limit(args.page_size)
+        full_rows = list(page.as_pymongo())
+        summary_rows = list(_summary_rows(page.clone()))
+
+        full_bytes = sum(len(bson.encode(row)) for row in full_rows)
+        summary_bytes = sum(len(bson.encode(row)) for row in summary_rows)
+        full_decode = median_ms(lambda: [Auction._from_son(row) for row in full_rows], args.runs)
+        summary_decode = median_ms(lambda: [AuctionSummary.from_mongo(row) for row in summary_rows], args.runs)
+        with app.app_context():
+            full_page = median_ms(lambda: AuctionRepository.search_auctions_page(limit=args.page_size), args.runs)
+            summary_page = median_ms(
+                lambda: AuctionRepository.search_auctions_page(limit=args.page_size, summaries=True), args.runs
+            )
+
+        print(f"page of {args.page_size} auctions, {args.bids_per_auction} bid refs and {args.images} images each")
+        print(f"{'':<18} {'bytes/page':>12} {'decode ms':>10} {'page ms':>9}")
+        print(f"{'Auction':<18} {full_bytes:>12,} {full_decode:>10.2f} {full_page:>9.2f}")
+        print(f"{'AuctionSummary':<18} {summary_bytes:>12,} {summary_decode:>10.2f} {summary_page:>9.2f}")
+        print(f"saved per page: {full_bytes - summary_bytes:,} bytes ({1 - summary_bytes / full_bytes:.0%}), "
+              f"{full_decode - summary_decode:.2f} ms decoding")
+    finally:
+        Auction._get_collection().drop()
+        disconnect()
+
+
+if __name__ == '__main__':
+    main()
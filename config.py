@@ -34,6 +34,72 @@ class Config:
     # Redis Configuration
     REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 
+    # Real-time bid broadcasting: max bid_update emits per auction per second (0 = no throttling)
+    BID_BROADCAST_MAX_RATE = float(os.getenv("BID_BROADCAST_MAX_RATE", 4))
+
+    # Socket.IO wire format: 'json' (msgspec-encoded JSON) or 'msgpack' (binary frames; the pages
+    # then load socket.io-msgpack-parser so bid_update / update_price arrive as msgpack)
+    SOCKETIO_SERIALIZER = os.getenv("SOCKETIO_SERIALIZER", "json")
+
+    # Who accepts bids: 'mongo' (conditional update on the auction) or 'redis' (atomic Lua
+    # bid engine with a per-auction sequence; bids are then persisted to Mongo)
+    BID_ENGINE = os.getenv("BID_ENGINE", "mongo")
+
+    # Write-behind bid persistence: accepted bids go to a Redis stream and are inserted in
+    # batches by a background greenlet (size / max seconds to wait for a batch to fill)
+    BID_WRITE_BEHIND = os.getenv("BID_WRITE_BEHIND", "false").lower() == "true"
+    BID_FLUSH_BATCH_SIZE = 500
+    BID_FLUSH_INTERVAL = 0.2
+
+    # Group commit for contested auctions: bids arriving within the window are decided together,
+    # only the highest is written
+    BID_SEQUENCER_ENABLED = os.getenv("BID_SEQUENCER_ENABLED", "false").lower() == "true"
+    BID_SEQUENCER_WINDOW = 0.02  # seconds
+    BID_SEQUENCER_TIMEOUT = 5.0  # seconds a submitter waits for its batch
+
+    # Per-auction log of broadcast bids (capped Redis stream) that reconnecting clients resume
+    # from; clients further behind than BID_EVENT_LOG_MAX_REPLAY events get a snapshot instead
+    BID_EVENT_LOG_ENABLED = os.getenv("BID_EVENT_LOG_ENABLED", "true").lower() == "true"
+    BID_EVENT_LOG_MAXLEN = 500
+    BID_EVENT_LOG_MAX_REPLAY = 100
+    BID_EVENT_LOG_TTL = 3 * 24 * 3600  # seconds after the auction's last bid
+
+    # Token-bucket limits on bid placement, checked in Redis before any database access:
+    # scope -> (tokens per second, burst)
+    BID_RATE_LIMIT_ENABLED = os.getenv("BID_RATE_LIMIT_ENABLED", "true").lower() == "true"
+    BID_RATE_LIMITS = {
+        "user": (2, 10),
+        "auction": (50, 200),
+        "ip": (5, 30),
+    }
+
+    # Auction search: 'text' (Mongo text index, relevance-ranked) or 'regex' (legacy icontains scan)
+    AUCTION_SEARCH_BACKEND = os.getenv("AUCTION_SEARCH_BACKEND", "text")
+
+    # Mixed into every ETag (src.utils.etags); change it on deploy so new templates/code aren't
+    # masked by 304s for pages whose data didn't change
+    ETAG_SALT = os.getenv("ETAG_SALT", "")
+
+    # Streamed listings (/auction/?stream=1): documents fetched per Mongo round trip
+    AUCTION_STREAM_BATCH_SIZE = 100
+
+    # Auction close scheduler (one leader per deployment via a Redis lease)
+    AUCTION_SCHEDULER_ENABLED = os.getenv("AUCTION_SCHEDULER_ENABLED", "true").lower() == "true"
+    AUCTION_SCHEDULER_HORIZON = 300  # seconds of upcoming end_times held in memory
+    AUCTION_SCHEDULER_BATCH_SIZE = 500
+    AUCTION_SCHEDULER_LEASE_TTL = 15  # seconds
+
+    # Auction read-through cache: Redis TTL (seconds) and the per-worker LRU in front of it
+    AUCTION_CACHE_TTL = int(os.getenv("AUCTION_CACHE_TTL", 60))
+    FEATURED_CACHE_TTL = int(os.getenv("FEATURED_CACHE_TTL", 30))
+    AUCTION_CACHE_LOCAL_SIZE = 1024
+    AUCTION_CACHE_LOCAL_TTL = 5  # bounds cross-worker staleness if an invalidation message is missed
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))  # request identity lookups
+    # Rendered fragments ({% cache %}, e.g. auction cards); keys carry versions, so the TTLs only
+    # bound how long unused fragments are kept
+    FRAGMENT_CACHE_TTL = int(os.getenv("FRAGMENT_CACHE_TTL", 300))
+    FRAGMENT_CACHE_LOCAL_SIZE = 512
+    FRAGMENT_CACHE_LOCAL_TTL = 60
 
     # MongoDB Configuration
     # Use Atlas URI if provided, otherwise fallback to local
@@ -49,6 +115,8 @@ class TestingConfig:
     TESTING = True
     SECRET_KEY = "test-secret"
     JWT_SECRET_KEY = "test-jwt-secret"
+    # mongomock has no $text support
+    AUCTION_SEARCH_BACKEND = "regex"
     MONGODB_SETTINGS = {
         "db": "mongoenginetest",
         "alias": "testdb",
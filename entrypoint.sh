@@ -7,7 +7,9 @@ echo "🚀 Starting Auction App..."
 # python app.py
 
 # Otherwise run gunicorn (production mode)
-exec gunicorn -k eventlet -w 1 -b 0.0.0.0:5000 wsgi:application \
+# Bid acceptance is atomic across processes with either BID_ENGINE, so GUNICORN_WORKERS
+# can be raised; Socket.IO then needs sticky sessions at the load balancer
+exec gunicorn -k eventlet -w "${GUNICORN_WORKERS:-1}" -b 0.0.0.0:5000 wsgi:application \
     --log-level=debug \
     --capture-output \
     --enable-stdio-inheritance
\ No newline at end of file
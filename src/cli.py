@@ -0,0 +1,64 @@
+"""
+Flask CLI commands (run with `flask --app wsgi <command>`)
+ - audit-indexes: explain() every repository query and fail on any COLLSCAN
+ - backfill-bid-stats: recompute denormalized bid stats on every auction from the bid collection
+ - backfill-description-teasers: set the card teaser on auctions created before description_teaser
+"""
+import logging
+import sys
+
+import click
+
+from src.repositories.auction_repository import AuctionRepository
+from src.repositories.bid_repository import BidRepository
+from src.repositories.user_repository import UserRepository
+from src.utils.index_audit import KNOWN_COLLSCANS, ensure_indexes, find_collscans, repository_queries
+
+logger = logging.getLogger(__name__)
+
+
+def register_cli_commands(app):
+    @app.cli.command('audit-indexes')
+    @click.option('--no-ensure', is_flag=True, help="Don't create the declared indexes before auditing.")
+    def audit_indexes(no_ensure):
+        """Explain each repository query and exit non-zero if any does a COLLSCAN."""
+        if not no_ensure:
+            ensure_indexes()
+
+        failures = []
+        for name, queryset in repository_queries():
+            collscans = find_collscans(queryset.explain())
+            if not collscans:
+                click.echo(f"OK        {name}")
+            elif name in KNOWN_COLLSCANS:
+                click.echo(f"KNOWN     {name} (COLLSCAN)")
+            else:
+                click.echo(f"COLLSCAN  {name}")
+                failures.append(name)
+
+        if failures:
+            click.echo(f"{len(failures)} query(ies) scan the whole collection: {', '.join(failures)}", err=True)
+            sys.exit(1)
+        click.echo("All repository queries are index-backed.")
+
+    @app.cli.command('backfill-bid-stats')
+    @click.option('--batch-size', default=1000, show_default=True, help="Auctions written per bulk_write.")
+    def backfill_bid_stats(batch_size):
+        """One-off: set bid_count, highest bidder and last_bid_at on auctions from existing bids."""
+        auctions = modified = 0
+        for stats in BidRepository.iter_bid_stats(batch_size=batch_size):
+            usernames = UserRepository.get_usernames({row['highest_bidder'] for row in stats})
+            modified += AuctionRepository.apply_bid_stats(stats, usernames)
+            auctions += len(stats)
+            click.echo(f"Processed {auctions} auctions with bids ({modified} updated)")
+        click.echo(f"Backfill complete: {auctions} auctions with bids, {modified} updated.")
+
+    @app.cli.command('backfill-description-teasers')
+    @click.option('--batch-size', default=1000, show_default=True, help="Auctions written per bulk_write.")
+    def backfill_description_teasers(batch_size):
+        """One-off: set description_teaser on auctions that have none."""
+        written = 0
+        for count in AuctionRepository.apply_description_teasers(batch_size=batch_size):
+            written += count
+            click.echo(f"Wrote {written} teasers")
+        click.echo(f"Backfill complete: {written} auctions updated.")
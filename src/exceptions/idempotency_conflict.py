@@ -0,0 +1,8 @@
+from src.exceptions.auction_app_error import AuctionAppError
+
+
+class IdempotencyConflict(AuctionAppError):
+    """Raised when an idempotency key is reused for a different request, or its first use is still running"""
+
+    def __init__(self, message="Idempotency key conflict"):
+        super().__init__(message, status_code=409)
@@ -0,0 +1,9 @@
+from src.exceptions.auction_app_error import AuctionAppError
+
+
+class RateLimited(AuctionAppError):
+    """Raised when a client exceeds a request rate limit"""
+
+    def __init__(self, message="Too many requests, please slow down", retry_after: float = 1.0):
+        super().__init__(message, status_code=429, payload={'retry_after': retry_after})
+        self.retry_after = retry_after
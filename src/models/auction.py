@@ -1,6 +1,8 @@
 from datetime import datetime
 
-from mongoengine import Document, StringField, DateTimeField, FloatField, ListField, ReferenceField
+from mongoengine import Document, StringField, DateTimeField, FloatField, IntField, ListField, ReferenceField
+
+from src.utils.batch_loader import reference_id
 
 
 class Auction(Document):
@@ -16,6 +18,13 @@ class Auction(Document):
     end_time = DateTimeField(required=True)
     category = StringField(choices=['Electronics', 'Fashion', 'Home', 'Collectibles', 'Other'])
     image_urls = ListField(StringField(), default=list)
+    # Denormalized card teaser (AuctionSummary), written together with item_description
+    description_teaser = StringField()
+    # Denormalized bid stats, updated in the same write that accepts a bid
+    bid_count = IntField(default=0)
+    highest_bidder = ReferenceField('User')
+    highest_bidder_name = StringField()
+    last_bid_at = DateTimeField()
 
     def to_dict(self):
         return {
@@ -25,16 +34,37 @@ class Auction(Document):
             'starting_bid': self.starting_bid,
             'current_bid': self.current_bid,
             'item_condition': self.item_condition,
-            'seller': str(self.seller.id),
+            'seller': str(reference_id(self, 'seller')),
             'status': self.status,
             'start_time': self.start_time.isoformat(),
             'end_time': self.end_time.isoformat(),
             'category': self.category,
-            'bid_count': len(self.bids),
+            'bid_count': self.bid_count,
+            'highest_bidder': self._highest_bidder_dict(),
+            'last_bid_at': self.last_bid_at.isoformat() if self.last_bid_at else None,
             'image_urls': self.image_urls
         }
 
-    meta = {'collection': 'auction'}
+    def _highest_bidder_dict(self):
+        bidder_id = reference_id(self, 'highest_bidder')
+        if bidder_id is None:
+            return None
+        return {'id': str(bidder_id), 'username': self.highest_bidder_name}
+
+    meta = {
+        'collection': 'auction',
+        'indexes': [
+            ('status', 'end_time'),  # auction close scheduler window + overdue sweep, active listing
+            ('status', '-start_time'),  # featured auctions
+            ('-start_time', '-id'),  # paginated listing/search (keyset cursor)
+            ('category', '-start_time', '-id'),  # paginated listing filtered by category
+            {  # relevance-ranked search (a collection can only have one text index)
+                'fields': ['$item_title', '$item_description'],
+                'default_language': 'english',
+                'weights': {'item_title': 10, 'item_description': 2}
+            },
+        ]
+    }
 
 
 
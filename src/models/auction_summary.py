@@ -0,0 +1,80 @@
+"""
+AuctionSummary: the read model behind auction cards (index, featured grid, list pages).
+Built straight from a projected raw document (as_pymongo) - no mongoengine Document is
+instantiated, and only FIELDS (with the first image) are ever read from Mongo.
+The card description is Auction.description_teaser, written alongside item_description,
+so the full description never leaves the database for a card.
+"""
+
+# Characters of item_description kept for the card teaser
+DESCRIPTION_LENGTH = 150
+
+
+def teaser(text: str) -> str:
+    if len(text) <= DESCRIPTION_LENGTH:
+        return text
+    cut = text[:DESCRIPTION_LENGTH - 3]
+    return (cut.rsplit(' ', 1)[0] if ' ' in cut else cut) + '...'
+
+
+class AuctionSummary:
+    # Projection for summary queries (image_urls is additionally $slice'd to its first entry)
+    FIELDS = ('item_title', 'description_teaser', 'current_bid', 'starting_bid', 'image_urls',
+              'seller', 'status', 'start_time', 'end_time', 'bid_count')
+
+    __slots__ = ('id', 'item_title', 'description', 'current_bid', 'starting_bid', 'image_url',
+                 'seller_id', 'seller_name', 'status', 'start_time', 'end_time', 'bid_count')
+
+    def __init__(self, id, item_title, description, current_bid, starting_bid, image_url,
+                 seller_id, status, start_time, end_time, bid_count=0, seller_name=None):
+        self.id = id
+        self.item_title = item_title
+        self.description = description
+        self.current_bid = current_bid
+        self.starting_bid = starting_bid
+        self.image_url = image_url
+        self.seller_id = seller_id
+        self.seller_name = seller_name
+        self.status = status
+        self.start_time = start_time
+        self.end_time = end_time
+        self.bid_count = bid_count
+
+    @classmethod
+    def from_mongo(cls, row: dict) -> 'AuctionSummary':
+        images = row.get('image_urls') or ()
+        return cls(
+            id=row['_id'],
+            item_title=row.get('item_title'),
+            description=row.get('description_teaser') or '',
+            current_bid=row.get('current_bid') or 0.0,
+            starting_bid=row.get('starting_bid'),
+            image_url=images[0] if images else None,
+            seller_id=row.get('seller'),
+            status=row.get('status', 'Active'),
+            start_time=row.get('start_time'),
+            end_time=row.get('end_time'),
+            bid_count=row.get('bid_count') or 0,
+        )
+
+    @property
+    def price(self) -> float:
+        return self.current_bid or self.starting_bid
+
+    def to_summary_dict(self) -> dict:
+        return {
+            'id': str(self.id),
+            'item_title': self.item_title,
+            'description': self.description,
+            'current_bid': self.current_bid,
+            'starting_bid': self.starting_bid,
+            'image_url': self.image_url,
+            'seller': str(self.seller_id) if self.seller_id else None,
+            'seller_name': self.seller_name,
+            'status': self.status,
+            'end_time': self.end_time.isoformat() if self.end_time else None,
+            'bid_count': self.bid_count,
+        }
+
+    def __repr__(self):
+        return f"AuctionSummary(id={self.id}, item_title={self.item_title!r})"
@@ -1,10 +1,18 @@
-from mongoengine import Document, FloatField, ReferenceField, DateTimeField
+from mongoengine import Document, FloatField, IntField, ReferenceField, DateTimeField, StringField
 from datetime import datetime
 
 class Bid(Document):
     auction_id = ReferenceField('Auction', required=True)
     bidder_id = ReferenceField('User', required=True)
+    bidder_name = StringField()  # denormalized for bid history pages (absent on older bids)
     bid_amount = FloatField(required=True)
     created_at = DateTimeField(default=datetime.utcnow)  # add timestamp
+    seq = IntField()  # per-auction acceptance order (Redis bid engine only)
 
-    meta = {'collection': 'bid'}
+    meta = {
+        'collection': 'bid',
+        'indexes': [
+            ('auction_id', '-bid_amount', '-id'),  # bid history (keyset pages) + highest bid per auction
+            ('bidder_id', '-created_at', '-id'),  # a user's bids (profile pages)
+        ]
+    }
@@ -0,0 +1,69 @@
+"""
+API views: msgspec Structs for the JSON (and msgpack) shapes of auctions and bids.
+ - Same fields as Auction.to_dict / BidService.history_to_dict
+ - Encoded straight to bytes by src.utils.serialization (no intermediate dict per field)
+ - datetimes are encoded as ISO 8601 strings by msgspec itself
+"""
+from datetime import datetime
+from typing import List, Optional
+
+import msgspec
+
+from src.utils.batch_loader import reference_id
+
+
+class HighestBidderView(msgspec.Struct):
+    id: str
+    username: Optional[str] = None
+
+
+class AuctionView(msgspec.Struct):
+    id: str
+    item_title: str
+    item_description: str
+    starting_bid: float
+    current_bid: float
+    item_condition: str
+    seller: str
+    status: str
+    start_time: datetime
+    end_time: datetime
+    category: Optional[str] = None
+    bid_count: int = 0
+    highest_bidder: Optional[HighestBidderView] = None
+    last_bid_at: Optional[datetime] = None
+    image_urls: List[str] = []
+
+    @classmethod
+    def from_document(cls, auction) -> 'AuctionView':
+        bidder_id = reference_id(auction, 'highest_bidder')
+        return cls(
+            id=str(auction.id),
+            item_title=auction.item_title,
+            item_description=auction.item_description,
+            starting_bid=auction.starting_bid,
+            current_bid=auction.current_bid,
+            item_condition=auction.item_condition,
+            seller=str(reference_id(auction, 'seller')),
+            status=auction.status,
+            start_time=auction.start_time,
+            end_time=auction.end_time,
+            category=auction.category,
+            bid_count=auction.bid_count or 0,
+            highest_bidder=HighestBidderView(str(bidder_id), auction.highest_bidder_name) if bidder_id else None,
+            last_bid_at=auction.last_bid_at,
+            image_urls=list(auction.image_urls),
+        )
+
+
+class BidView(msgspec.Struct):
+    bid_amount: float
+    bidder_id: str
+    bidder_name: Optional[str]
+    timestamp: datetime
+
+    @classmethod
+    def from_history(cls, bid: dict) -> 'BidView':
+        """From a BidService.get_bid_history row."""
+        return cls(bid['bid_amount'], bid['bidder_id'], bid['bidder_name'], bid['created_at'])
+
@@ -6,20 +6,48 @@ Responsibilities:
  - Save uploaded files (fallback) via cloudinary_service.upload_to_cloudinary
  - Delete remote images via cloudinary_service.delete_from_cloudinary
  - Return plain Python objects (Auction documents) for service layer use
+ - Read-through cache for get_auction_by_id / get_featured_auctions (see src.utils.snapshot_cache);
+   every write path below invalidates the affected entries and bumps their ETag versions
+   (see src.utils.etags)
+ - Card listings (featured grid, list pages) read projected AuctionSummary rows instead of
+   full documents
 """
 import logging
 from datetime import datetime
 
+import bson
 from bson import ObjectId
-from flask import current_app, url_for
+from bson.codec_options import CodecOptions
+from flask import current_app, has_app_context, url_for
 from mongoengine import Q
 from mongoengine.errors import DoesNotExist
+from pymongo import UpdateOne
 
 from src.models.auction import Auction
+from src.models.auction_summary import AuctionSummary, teaser
 from src.services.cloudinary_service import upload_to_cloudinary, delete_from_cloudinary
+from src.utils.etags import bump_auction_versions
+from src.utils.pagination import DEFAULT_PAGE_SIZE, decode_cursor, encode_cursor
+from src.utils.snapshot_cache import DocumentCache, SnapshotCache
 
 logger = logging.getLogger(__name__)
 
+# Auction snapshots keyed by id, plus the ids of the newest FEATURED_CACHE_SIZE Active auctions
+# (sliced for smaller limits). Featured pages are rebuilt from auction_cache, so a bid only
+# invalidates the one auction it touched.
+auction_cache = DocumentCache(Auction, 'auction', ttl=60)
+featured_cache = SnapshotCache('auction_featured', ttl=30)
+FEATURED_CACHE_SIZE = 50
+# Projected card rows (see AuctionSummary), keyed and invalidated like auction_cache
+summary_cache = SnapshotCache('auction_summary', ttl=60)
+
+_codec_options = CodecOptions(tz_aware=False)
+
+
+def _summary_rows(query):
+    """Raw card rows: only AuctionSummary.FIELDS, and just the first image."""
+    return query.only(*AuctionSummary.FIELDS).fields(slice__image_urls=1).as_pymongo()
+
 
 class AuctionRepository:
     @staticmethod
@@ -39,6 +67,7 @@ class AuctionRepository:
         auction = Auction(
             item_title=item_title,
             item_description=item_description,
+            description_teaser=teaser(item_description),
             starting_bid=float(starting_bid),
             current_bid=float(starting_bid),
             end_time=end_time,
@@ -63,15 +92,29 @@ class AuctionRepository:
                     logger.warning("No images saved from server-side upload fallback.")
 
         auction.save()
+        AuctionRepository._invalidate_featured()
+        bump_auction_versions()
         logger.info(f"Created auction (id={auction.id}) title={item_title} seller={seller}")
         return auction
 
+    @staticmethod
+    def _invalidate(auction_id, featured: bool = False):
+        auction_cache.invalidate(auction_id)
+        summary_cache.invalidate(auction_id)
+        bump_auction_versions(auction_id)
+        if featured:
+            AuctionRepository._invalidate_featured()
+
+    @staticmethod
+    def _invalidate_featured():
+        featured_cache.invalidate('top')
+
     @staticmethod
     def get_auction_by_id(auction_id):
         try:
             if isinstance(auction_id, str):
                 auction_id = ObjectId(auction_id)
-            return Auction.objects.get(id=auction_id)
+            return auction_cache.get_document(auction_id, lambda: Auction.objects.get(id=auction_id))
         except DoesNotExist:
             logger.debug(f"Auction not found with id={auction_id}")
             return None
@@ -85,9 +128,117 @@ class AuctionRepository:
         if auction:
             auction.current_bid = bid_amount
             auction.save()
+            AuctionRepository._invalidate(auction_id)
             return auction
         return None
 
+    @staticmethod
+    def accept_bid(auction_id, bid_amount: float, bidder_id=None, bidder_name=None, bid_time=None):
+        """
+        Atomically raise current_bid to bid_amount in a single conditional update.
+        The update only matches when the auction is Active, has not ended and
+        bid_amount beats the current bid, so concurrent bidders cannot both win.
+        The same write bumps bid_count and records the highest bidder and last bid time.
+        Returns the updated Auction, or None if the bid was rejected.
+        """
+        bid_time = bid_time or datetime.utcnow()
+        auction = Auction.objects(
+            id=auction_id,
+            status='Active',
+            end_time__gt=bid_time,
+            current_bid__lt=bid_amount
+        ).modify(
+            new=True,
+            set__current_bid=bid_amount,
+            inc__bid_count=1,
+            set__highest_bidder=bidder_id,
+            set__highest_bidder_name=bidder_name,
+            set__last_bid_at=bid_time
+        )
+        if auction is not None:
+            AuctionRepository._invalidate(auction.id)
+        return auction
+
+    @staticmethod
+    def get_bid_state(auction_id):
+        """status, end_time, current_bid and bid_count straight from Mongo (raw dict), or None."""
+        return Auction.objects(id=auction_id).only(
+            'status', 'end_time', 'current_bid', 'bid_count'
+        ).as_pymongo().first()
+
+    @staticmethod
+    def record_bid(auction_id, bid_amount: float, bidder_id=None, bidder_name=None, bid_time=None):
+        """
+        Persist a bid already accepted elsewhere (the Redis bid engine).
+        Accepted bids can land out of order, so the price and highest bidder only move up;
+        bid_count is always incremented. Usually one write, two if a higher bid got here first.
+        """
+        bid_time = bid_time or datetime.utcnow()
+        updated = Auction.objects(id=auction_id, current_bid__lt=bid_amount).update_one(
+            set__current_bid=bid_amount,
+            inc__bid_count=1,
+            set__highest_bidder=bidder_id,
+            set__highest_bidder_name=bidder_name,
+            max__last_bid_at=bid_time
+        )
+        if not updated:
+            Auction.objects(id=auction_id).update_one(inc__bid_count=1, max__last_bid_at=bid_time)
+        AuctionRepository._invalidate(auction_id)
+
+    @staticmethod
+    def apply_bid_stats(stats, usernames):
+        """
+        Bulk-write denormalized bid stats (see BidRepository.iter_bid_stats).
+        current_bid only ever moves up, so it is merged with $max.
+        Returns the number of auctions modified.
+        """
+        collection = Auction._get_collection()
+        operations = [
+            UpdateOne({'_id': row['_id']}, {
+                '$set': {
+                    'bid_count': row['bid_count'],
+                    'highest_bidder': row['highest_bidder'],
+                    'highest_bidder_name': usernames.get(row['highest_bidder']),
+                    'last_bid_at': row['last_bid_at'],
+                },
+                '$max': {'current_bid': row['highest_amount']},
+            })
+            for row in stats
+        ]
+        if not operations:
+            return 0
+        modified = collection.bulk_write(operations, ordered=False).modified_count
+        auction_cache.invalidate(*[row['_id'] for row in stats])
+        summary_cache.invalidate(*[row['_id'] for row in stats])
+        bump_auction_versions(*[row['_id'] for row in stats])
+        return modified
+
+    @staticmethod
+    def apply_description_teasers(batch_size=1000):
+        """
+        Set description_teaser on every auction that has none (auctions created before the field),
+        bulk-writing batch_size auctions at a time. Yields the number written after each batch.
+        """
+        collection = Auction._get_collection()
+        teasers = {}
+        for row in collection.find({'description_teaser': None}, {'item_description': 1}, batch_size=batch_size):
+            teasers[row['_id']] = teaser(row.get('item_description') or '')
+            if len(teasers) >= batch_size:
+                yield AuctionRepository._write_teasers(collection, teasers)
+                teasers = {}
+        if teasers:
+            yield AuctionRepository._write_teasers(collection, teasers)
+
+    @staticmethod
+    def _write_teasers(collection, teasers):
+        collection.bulk_write([
+            UpdateOne({'_id': auction_id}, {'$set': {'description_teaser': text}})
+            for auction_id, text in teasers.items()
+        ], ordered=False)
+        summary_cache.invalidate(*teasers)
+        bump_auction_versions(*teasers)
+        return len(teasers)
+
     @staticmethod
     def get_active_auctions():
         try:
@@ -98,33 +249,168 @@ class AuctionRepository:
 
     @staticmethod
     def get_featured_auctions(limit=6):
+        """
+        Newest Active auctions, as a list. Limits up to FEATURED_CACHE_SIZE are served from
+        the cached id list and auction snapshots; larger (or no) limits go to Mongo.
+        """
         try:
-            return Auction.objects.filter(status="Active").order_by("-start_time").limit(limit)
+            query = Auction.objects.filter(status="Active").order_by("-start_time")
+            if limit is None or limit > FEATURED_CACHE_SIZE:
+                return list(query.limit(limit) if limit else query)
+
+            snapshot = featured_cache.get('top')
+            if snapshot is not None:
+                ids = snapshot.decode().split(',')[:limit] if snapshot else []
+                return auction_cache.get_documents(ids, lambda missing: Auction.objects(id__in=missing))
+
+            featured_token, auction_token = featured_cache.begin_load(), auction_cache.begin_load()
+            auctions = list(query.limit(FEATURED_CACHE_SIZE))
+            featured_cache.fill('top', ','.join(str(a.id) for a in auctions).encode(), featured_token)
+            auction_cache.fill_many({str(a.id): auction_cache.dump(a) for a in auctions}, auction_token)
+            return auctions[:limit]
         except Exception as e:
             logger.error(f"Error fetching featured auctions: {e}")
             return []
 
     @staticmethod
-    def search_auctions(search_query=None, category=None, status=None):
+    def get_featured_summaries(limit=6):
         """
-        Search auctions by title/description and optional category/status.
-        Returns a queryset (call .all() for list).
+        get_featured_auctions as AuctionSummary objects: the same cached id list, resolved
+        through summary_cache, with misses loaded by one projected $in query.
         """
         try:
-            query = Auction.objects
-            if search_query:
+            query = Auction.objects.filter(status="Active").order_by("-start_time")
+            if limit is None or limit > FEATURED_CACHE_SIZE:
+                return [AuctionSummary.from_mongo(row) for row in _summary_rows(query.limit(limit) if limit else query)]
+
+            snapshot = featured_cache.get('top')
+            if snapshot is None:
+                featured_token, summary_token = featured_cache.begin_load(), summary_cache.begin_load()
+                top = list(_summary_rows(query.limit(FEATURED_CACHE_SIZE)))
+                featured_cache.fill('top', ','.join(str(row['_id']) for row in top).encode(), featured_token)
+                summary_cache.fill_many({str(row['_id']): bson.encode(row) for row in top}, summary_token)
+                return [AuctionSummary.from_mongo(row) for row in top[:limit]]
+            ids = snapshot.decode().split(',')[:limit] if snapshot else []
+
+            rows = {key: bson.decode(value, codec_options=_codec_options)
+                    for key, value in summary_cache.get_many(ids).items()}
+            missing = [ObjectId(key) for key in ids if key not in rows]
+            if missing:
+                token = summary_cache.begin_load()
+                loaded = {str(row['_id']): row for row in _summary_rows(Auction.objects(id__in=missing))}
+                summary_cache.fill_many({key: bson.encode(row) for key, row in loaded.items()}, token)
+                rows.update(loaded)
+            return [AuctionSummary.from_mongo(rows[key]) for key in ids if key in rows]
+        except Exception as e:
+            logger.error(f"Error fetching featured summaries: {e}")
+            return []
+
+    @staticmethod
+    def _search_backend():
+        """'text' (Mongo text index, relevance-ranked) or 'regex' (legacy icontains scan)."""
+        if has_app_context():
+            return current_app.config.get('AUCTION_SEARCH_BACKEND', 'text')
+        return 'text'
+
+    @staticmethod
+    def _search_query(search_query, category, status, backend):
+        """The filtered (unordered) queryset; backend is the caller's _search_backend()."""
+        query = Auction.objects
+        if search_query:
+            if backend == 'text':
+                query = query.search_text(search_query)
+            else:
                 query = query.filter(
                     Q(item_title__icontains=search_query) | Q(item_description__icontains=search_query)
                 )
-            if category:
-                query = query.filter(category=category)
-            if status:
-                query = query.filter(status=status)
+        if category:
+            query = query.filter(category=category)
+        if status:
+            query = query.filter(status=status)
+        return query
+
+    @staticmethod
+    def search_auctions(search_query=None, category=None, status=None):
+        """
+        Search auctions by title/description and optional category/status.
+        With the text backend, results are ordered by relevance.
+        Returns a queryset (call .all() for list).
+        """
+        try:
+            backend = AuctionRepository._search_backend()
+            query = AuctionRepository._search_query(search_query, category, status, backend)
+            if search_query and backend == 'text':
+                query = query.order_by('$text_score')
             return query.all()
         except Exception as e:
             logger.error(f"Error searching auctions: {e}")
             return []
 
+    @staticmethod
+    def search_auctions_page(search_query=None, category=None, status=None, limit=DEFAULT_PAGE_SIZE, after=None,
+                             summaries=False):
+        """
+        One page of search results plus the cursor for the next page.
+        With summaries=True the page is AuctionSummary objects from a projected query.
+        - Browsing (no search_query): newest first, keyset-paginated on (start_time, _id)
+        - Text search: most relevant first; relevance can't be used as a range filter,
+          so the cursor carries the rank offset instead
+        `after` is the next_cursor of the previous page.
+        Returns (list[Auction], next_cursor or None). Raises ValueError for a bad cursor.
+        """
+        backend = AuctionRepository._search_backend()
+        query = AuctionRepository._search_query(search_query, category, status, backend)
+
+        def fetch(page_query):
+            if summaries:
+                return [AuctionSummary.from_mongo(row) for row in _summary_rows(page_query)]
+            return list(page_query)
+
+        if search_query and backend == 'text':
+            offset = 0
+            if after:
+                kind, offset = decode_cursor(after)
+                if kind != 'rank' or not isinstance(offset, int) or offset < 0:
+                    raise ValueError("Invalid pagination cursor")
+            auctions = fetch(query.order_by('$text_score', '-id').skip(offset).limit(limit + 1))
+            next_cursor = encode_cursor('rank', offset + limit) if len(auctions) > limit else None
+            return auctions[:limit], next_cursor
+
+        if after:
+            start_time, last_id = decode_cursor(after)
+            if not isinstance(start_time, datetime) or not isinstance(last_id, ObjectId):
+                raise ValueError("Invalid pagination cursor")
+            query = query.filter(
+                Q(start_time__lt=start_time) | Q(start_time=start_time, id__lt=last_id)
+            )
+        # Fetch one extra row to know whether another page exists
+        auctions = fetch(query.order_by('-start_time', '-id').limit(limit + 1))
+        next_cursor = None
+        if len(auctions) > limit:
+            auctions = auctions[:limit]
+            last = auctions[-1]
+            next_cursor = encode_cursor(last.start_time, last.id)
+        return auctions, next_cursor
+
+    @staticmethod
+    def iter_search_results(search_query=None, category=None, status=None, summaries=False, batch_size=100):
+        """
+        Every search result, in search_auctions_page order, read lazily from a cursor that
+        fetches batch_size documents per round trip. The queryset doesn't cache results, so
+        memory stays bounded by one batch however many auctions match.
+        Yields Auction documents, or AuctionSummary objects with summaries=True.
+        """
+        backend = AuctionRepository._search_backend()
+        query = AuctionRepository._search_query(search_query, category, status, backend)
+        if search_query and backend == 'text':
+            query = query.order_by('$text_score', '-id')
+        else:
+            query = query.order_by('-start_time', '-id')
+        query = query.no_cache().batch_size(batch_size)
+        if summaries:
+            return (AuctionSummary.from_mongo(row) for row in _summary_rows(query))
+        return iter(query)
+
     @staticmethod
     def save_auction_images(image_files):
         """
@@ -192,8 +478,17 @@ class AuctionRepository:
                 logger.debug(f"Set {key} for auction {auction_id}")
             else:
                 logger.debug(f"Skipped update field {key} (not allowed)")
+        if 'item_description' in updated_fields:
+            auction.description_teaser = teaser(auction.item_description)
 
         auction.save()
+        if 'starting_bid' in updated_fields and 'current_bid' not in updated_fields:
+            # Until the first bid, current_bid is the price bids must beat; bid_count=0 in the filter
+            # keeps a bid that lands meanwhile from being overwritten
+            if Auction.objects(id=auction.id, bid_count=0).update_one(set__current_bid=auction.starting_bid):
+                auction.current_bid = auction.starting_bid
+        # status/start_time changes move the auction in or out of the featured list
+        AuctionRepository._invalidate(auction.id, featured='status' in updated_fields)
         logger.info(f"Auction updated (id={auction_id})")
         return auction
 
@@ -231,9 +526,54 @@ class AuctionRepository:
             AuctionRepository.delete_auction_images(auction.image_urls)
 
         auction.delete()
+        AuctionRepository._invalidate(auction.id, featured=True)
         logger.info(f"Auction deleted (id={auction_id})")
         return True
 
+    @staticmethod
+    def get_auctions_ending_between(after, until, limit: int, include_after: bool = False):
+        """
+        (id, end_time) pairs of Active auctions ending in (after, until], earliest first.
+        Served by the (status, end_time) index; returns raw dicts, not documents.
+        """
+        end_filter = {'end_time__lte': until}
+        if after is not None:
+            end_filter['end_time__gte' if include_after else 'end_time__gt'] = after
+        return list(
+            Auction.objects(status='Active', **end_filter)
+            .only('id', 'end_time')
+            .order_by('end_time')
+            .limit(limit)
+            .as_pymongo()
+        )
+
+    @staticmethod
+    def close_auctions(auction_ids, now=None):
+        """
+        Mark a batch of due auctions as Completed, one conditional update per auction.
+        Auctions whose end_time moved into the future are left untouched.
+        Returns the ids (as str) this call closed - only those whose update actually matched,
+        so auctions already Completed or extended meanwhile are left out and callers announce
+        each close once.
+        """
+        if not auction_ids:
+            return []
+        now = now or datetime.utcnow()
+        closed = []
+        # In the caller's order (the scheduler's earliest-first)
+        for object_id in dict.fromkeys(ObjectId(a) for a in auction_ids):
+            if Auction.objects(id=object_id, status='Active', end_time__lte=now).update_one(
+                    set__status='Completed'):
+                closed.append(str(object_id))
+        logger.info(f"Closed {len(closed)} auction(s) in batch of {len(auction_ids)}")
+        if not closed:
+            return []
+        auction_cache.invalidate(*closed)
+        summary_cache.invalidate(*closed)
+        bump_auction_versions(*closed)
+        AuctionRepository._invalidate_featured()
+        return closed
+
     @staticmethod
     def close_auction(auction_id):
         """
@@ -246,5 +586,6 @@ class AuctionRepository:
         if auction.status == 'Active':
             auction.status = 'Completed'
             auction.save()
+            AuctionRepository._invalidate(auction.id, featured=True)
             logger.info(f"Auction closed (id={auction_id})")
         return auction
\ No newline at end of file
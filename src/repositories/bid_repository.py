@@ -1,7 +1,18 @@
 import logging
 logger = logging.getLogger(__name__)
 
+from datetime import datetime
+
+from bson import ObjectId
+from mongoengine import Q
+from pymongo.errors import BulkWriteError
+
+from src.models.auction import Auction
 from src.models.bid import Bid
+from src.utils.etags import bump_auction_versions
+from src.utils.pagination import decode_cursor, encode_cursor
+
+DUPLICATE_KEY = 11000
 
 class BidRepository:
     @staticmethod
@@ -15,17 +26,80 @@ class BidRepository:
         return Bid.objects(auction_id=auction_id).order_by('-bid_amount')
 
     @staticmethod
-    def place_bid(auction_id, bidder_id, bid_amount):
-        logger.info(f"Placing bid: auction={auction_id}, bidder={bidder_id}, amount={bid_amount}")
+    def get_bid_history_page(auction_id, limit, before=None):
+        """
+        One page of an auction's bids, highest first, as plain dicts (_id, bid_amount, created_at,
+        bidder_id, bidder_name) - no Bid documents, no bidder dereferencing.
+        `before` is the next_cursor of the previous page: (bid_amount, _id) of its last bid.
+        Returns (rows, next_cursor or None). Raises ValueError for a bad cursor.
+        """
+        query = Bid.objects(auction_id=auction_id)
+        if before:
+            amount, last_id = decode_cursor(before)
+            if not isinstance(amount, (int, float)) or not isinstance(last_id, ObjectId):
+                raise ValueError("Invalid pagination cursor")
+            query = query.filter(Q(bid_amount__lt=amount) | Q(bid_amount=amount, id__lt=last_id))
+        # Fetch one extra row to know whether another page exists
+        rows = list(
+            query.order_by('-bid_amount', '-id')
+            .only('bid_amount', 'created_at', 'bidder_id', 'bidder_name')
+            .limit(limit + 1)
+            .as_pymongo()
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['bid_amount'], rows[-1]['_id'])
+        logger.debug(f"Bid history page for auction {auction_id}: {len(rows)} bid(s), more={next_cursor is not None}")
+        return rows, next_cursor
+
+    @staticmethod
+    def new_bid(auction_id, bidder_id, bid_amount, created_at=None, seq=None, bid_id=None, bidder_name=None):
+        """An unsaved Bid with its id already assigned."""
         bid = Bid(
+            id=bid_id or ObjectId(),
             auction_id=auction_id,
             bidder_id=bidder_id,
+            bidder_name=bidder_name,
             bid_amount=bid_amount
         )
-        bid.save()
+        if created_at:
+            bid.created_at = created_at
+        if seq is not None:
+            bid.seq = seq
+        return bid
+
+    @staticmethod
+    def place_bid(auction_id, bidder_id, bid_amount, created_at=None, seq=None, bidder_name=None):
+        logger.info(f"Placing bid: auction={auction_id}, bidder={bidder_id}, amount={bid_amount}")
+        bid = BidRepository.new_bid(auction_id, bidder_id, bid_amount, created_at=created_at, seq=seq,
+                                    bidder_name=bidder_name)
+        bid.save(force_insert=True)
+        # The auction's version was bumped when the bid was accepted; bump again now that the
+        # bid history shows it
+        bump_auction_versions(auction_id)
         logger.info(f"Bid saved: id={bid.id}")
         return bid
 
+    @staticmethod
+    def insert_many(documents):
+        """
+        Insert raw bid documents (with _id) in one round trip; documents that already exist
+        are skipped, so replaying a batch is safe. Returns the number inserted.
+        """
+        if not documents:
+            return 0
+        try:
+            return len(Bid._get_collection().insert_many(documents, ordered=False).inserted_ids)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if any(err.get('code') != DUPLICATE_KEY for err in errors):
+                raise
+            logger.info(f"Skipped {len(errors)} already-inserted bid(s)")
+            return e.details.get('nInserted', 0)
+        finally:
+            bump_auction_versions(*{doc['auction_id'] for doc in documents})
+
     @staticmethod
     def get_bid_id_by_bidder(bidder_id):
         logger.debug(f"Fetching bid by bidder id {bidder_id}")
@@ -41,4 +115,76 @@ class BidRepository:
     @staticmethod
     def get_user_bids(bidder_id):
         logger.debug(f"Fetching user bids for bidder {bidder_id}")
-        return Bid.objects(bidder_id=bidder_id).select_related()
\ No newline at end of file
+        return Bid.objects(bidder_id=bidder_id).order_by('-created_at')
+
+    @staticmethod
+    def get_user_bid_page(bidder_id, limit, before=None):
+        """
+        One page of a user's bids, newest first, in a single aggregation: each row carries the
+        auction's item_title/current_bid/status and a computed `winning` flag (the auction's
+        current bid is this bid). `before` is the next_cursor of the previous page.
+        Returns (rows, next_cursor or None). Raises ValueError for a bad cursor.
+        """
+        match = {'bidder_id': bidder_id}
+        if before:
+            created_at, last_id = decode_cursor(before)
+            if not isinstance(created_at, datetime) or not isinstance(last_id, ObjectId):
+                raise ValueError("Invalid pagination cursor")
+            match['$or'] = [
+                {'created_at': {'$lt': created_at}},
+                {'created_at': created_at, '_id': {'$lt': last_id}},
+            ]
+        pipeline = [
+            {'$match': match},
+            {'$sort': {'created_at': -1, '_id': -1}},
+            # One extra row to know whether another page exists
+            {'$limit': limit + 1},
+            {'$lookup': {
+                'from': Auction._get_collection_name(),
+                'localField': 'auction_id',
+                'foreignField': '_id',
+                'as': 'auction',
+            }},
+            {'$unwind': {'path': '$auction', 'preserveNullAndEmptyArrays': True}},
+            {'$project': {
+                'bid_amount': 1,
+                'created_at': 1,
+                'auction_id': 1,
+                'item_title': '$auction.item_title',
+                'current_bid': '$auction.current_bid',
+                'status': '$auction.status',
+                'winning': {'$eq': ['$auction.current_bid', '$bid_amount']},
+            }},
+        ]
+        rows = list(Bid.objects.aggregate(pipeline))
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]['created_at'], rows[-1]['_id'])
+        logger.debug(f"Bid page for bidder {bidder_id}: {len(rows)} bid(s), more={next_cursor is not None}")
+        return rows, next_cursor
+
+    @staticmethod
+    def iter_bid_stats(batch_size=1000):
+        """
+        Per-auction bid stats recomputed from the bid collection (used by the backfill command).
+        Yields lists of {_id, bid_count, highest_amount, highest_bidder, last_bid_at}.
+        """
+        pipeline = [
+            {'$sort': {'auction_id': 1, 'bid_amount': -1, 'created_at': 1}},
+            {'$group': {
+                '_id': '$auction_id',
+                'bid_count': {'$sum': 1},
+                'highest_amount': {'$first': '$bid_amount'},
+                'highest_bidder': {'$first': '$bidder_id'},
+                'last_bid_at': {'$max': '$created_at'},
+            }},
+        ]
+        batch = []
+        for row in Bid.objects.aggregate(pipeline, allowDiskUse=True):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
@@ -1,9 +1,14 @@
 from datetime import datetime
 import logging
+from mongoengine.errors import DoesNotExist
 from src.models.user import User
+from src.utils.snapshot_cache import DocumentCache
 from werkzeug.security import generate_password_hash, check_password_hash
 logger = logging.getLogger(__name__)
 
+# Short-lived snapshots (password excluded) for per-request identity lookups
+user_cache = DocumentCache(User, 'user', ttl=30)
+
 
 
 class UserRepository:
@@ -45,6 +50,27 @@ class UserRepository:
         logger.debug(f"Fetching user by id={user_id}")
         return User.objects.get(id=user_id)
 
+    @staticmethod
+    def get_cached_user(user_id):
+        """
+        Read-only User (without the password hash) from the user cache, or None.
+        Invalidated by update_user / update_user_status; don't save() the returned document.
+        """
+        def load():
+            try:
+                return User.objects.exclude('password').get(id=user_id)
+            except DoesNotExist:
+                return None
+        return user_cache.get_document(user_id, load)
+
+    @staticmethod
+    def get_usernames(user_ids):
+        """Map user id -> username for a batch of ids with a single $in query."""
+        if not user_ids:
+            return {}
+        users = User.objects(id__in=list(user_ids)).only('username').as_pymongo()
+        return {user['_id']: user['username'] for user in users}
+
     @staticmethod
     def get_active_users():
         return User.objects(is_active=True).all()
@@ -63,7 +89,9 @@ class UserRepository:
 
         if update_fields:
             update_fields["updated_at"] = datetime.utcnow()
-            return User.objects(id=user_id).update(**update_fields)
+            result = User.objects(id=user_id).update(**update_fields)
+            user_cache.invalidate(user_id)
+            return result
 
     @staticmethod
     def update_user_status(user_id, is_active):
@@ -72,5 +100,6 @@ class UserRepository:
             is_active=is_active,
             updated_at=datetime.utcnow()
         )
+        user_cache.invalidate(user_id)
         print(f"Update result: {result}")  # Should return 1 if successful
         return result
\ No newline at end of file
@@ -4,23 +4,35 @@ Router / Controller layer for auctions.
  - Keeps request parsing and response formatting responsibilities
  - Delegates business logic to AuctionService
  - Uses JWT for protected actions
+ - GET pages and JSON carry ETags from Redis version counters (src.utils.etags); a matching
+   If-None-Match gets its 304 before any Mongo query or render
 """
 import logging
 from datetime import datetime
 
-from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, current_app
+from flask import (Blueprint, Response, render_template, request, redirect, url_for, flash, jsonify, current_app,
+                   get_flashed_messages, stream_template, stream_with_context)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from bson import ObjectId
 
+from src.models.views import AuctionView, BidView
 from src.repositories.auction_repository import AuctionRepository
-from src.repositories.user_repository import UserRepository
 from src.services.auction_service import AuctionService
-from src.services.bid_service import BidService
+from src.services.bid_event_log import current_bid_seq
+from src.services.bid_service import BID_HISTORY_PAGE_SIZE, BidService
+from src.utils.etags import (auction_version, collection_generation, etag_for, not_modified, page_etag,
+                             with_etag)
+from src.utils.pagination import parse_limit
+from src.utils.request_identity import current_identity, current_user
+from src.utils.serialization import json_response
+from src.utils.streaming import coalesce, json_array_stream
 
 logger = logging.getLogger(__name__)
 
 auction_router = Blueprint('auction_router', __name__, url_prefix='/auction')
 
+LISTING_CATEGORIES = ['Electronics', 'Fashion', 'Home', 'Collectibles', 'Other']
+
 
 @auction_router.route('/create', methods=['GET', 'POST'])
 @jwt_required(optional=True)  # allow viewing form without auth, but require auth for POST processing
@@ -72,7 +84,7 @@ def create_auction():
 
         # If request is JSON, return JSON response
         if request.is_json:
-            return jsonify(auction.to_dict()), 201
+            return json_response(AuctionView.from_document(auction), status=201)
 
         # For form submission, redirect to the auction detail page
         flash('Auction created successfully!', 'success')
@@ -100,28 +112,83 @@ def create_auction():
 
 @auction_router.route('/')
 def list_auctions():
+    wants_json = request.accept_mimetypes['application/json'] >= request.accept_mimetypes['text/html']
+    # Any auction write bumps the generation; the query string selects the page
+    generation = collection_generation()
+    if wants_json:
+        etag = etag_for(generation, 'list', request.query_string)
+    else:
+        etag = page_etag(generation, current_identity(), 'list.html', request.query_string)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
     try:
         search_query = request.args.get('search', '').strip()
         category = request.args.get('category')
-        auctions = AuctionService.search_auctions(search_query=search_query, category=category)
+        if request.args.get('stream', '').lower() in ('1', 'true'):
+            return with_etag(_stream_auctions(wants_json, search_query, category), etag, private=not wants_json)
+        after = request.args.get('after') or None
+        try:
+            limit = parse_limit(request.args.get('limit'))
+            # The JSON API returns full auctions; HTML cards only need projected summaries
+            page = AuctionService.search_auctions_page if wants_json else AuctionService.search_summaries_page
+            auctions, next_cursor = page(search_query=search_query, category=category, limit=limit, after=after)
+        except ValueError as ve:
+            logger.warning(f"Bad pagination parameters: {ve}")
+            if wants_json:
+                return jsonify({'error': str(ve)}), 400
+            flash(str(ve), 'error')
+            return redirect(url_for('auction_router.list_auctions', search=search_query or None, category=category))
 
         # If API call (tests) → return JSON
         # Only return JSON if the client explicitly prefers JSON to HTML
-        if request.accept_mimetypes['application/json'] >= request.accept_mimetypes['text/html']:
-            return jsonify([auction.to_dict() for auction in auctions]), 200
-
-        # Render HTML page (legacy)
-        return render_template("auction.html",auctions=auctions, categories=['Electronics','Fashion','Home','Collectibles','Other'], selected_category=category, search_query=search_query)
+        if wants_json:
+            return with_etag(json_response({
+                'auctions': [AuctionView.from_document(auction) for auction in auctions],
+                'next_cursor': next_cursor
+            }), etag)
+
+        # Render HTML page (legacy); summaries already carry the seller names
+        page = render_template("auction.html", auctions=auctions, next_cursor=next_cursor, limit=limit,
+                               categories=LISTING_CATEGORIES, selected_category=category, search_query=search_query)
+        return with_etag(page, etag, private=True)
     except Exception as e:
         logger.exception(f"Error listing auctions as {e}")
         flash('Failed to load list auctions', 'error')
         return redirect(url_for('user_router.index'))
 
 
+def _stream_auctions(wants_json, search_query, category):
+    """
+    ?stream=1: every matching auction in one response, sent while it is read from a batched
+    cursor - JSON array elements one by one, HTML through stream_template - so time-to-first-byte
+    and worker memory don't grow with the number of matches.
+    """
+    if wants_json:
+        auctions = AuctionService.stream_auctions(search_query=search_query, category=category)
+        body = json_array_stream('auctions', (AuctionView.from_document(a) for a in auctions), next_cursor=None)
+        return Response(stream_with_context(coalesce(body)), mimetype='application/json')
+    # Pop flashed messages now: the session is saved before the streamed body is rendered
+    get_flashed_messages()
+    summaries = AuctionService.stream_summaries(search_query=search_query, category=category)
+    page = stream_template("auction.html", auctions=summaries, next_cursor=None, limit=None,
+                           categories=LISTING_CATEGORIES, selected_category=category, search_query=search_query)
+    return Response(coalesce(page), mimetype='text/html')
+
+
 @auction_router.route('/<auction_id>')
 def auction_detail(auction_id):
     try:
         print("Accessing auction detail")
+        etag = None
+        if ObjectId.is_valid(auction_id):
+            etag = page_etag(auction_version(auction_id), current_identity(), 'detail')
+        cached = not_modified(etag)
+        if cached is not None:
+            return cached
+        # Read before the auction and bids: the page reflects every bid event up to this seq,
+        # and the client resumes from it
+        event_seq = current_bid_seq(auction_id)
         auction = AuctionService.get_auction_by_id(auction_id)
         if not auction:
             flash('Auction not found', 'error')
@@ -129,20 +196,40 @@ def auction_detail(auction_id):
         # Get bids via BidService
         # Render detail template
         #But first is to resolve logged-in user JWT
-        identity = get_jwt_identity()
-        user = None
-        if identity and ObjectId.is_valid(identity):
-            user = UserRepository.get_user_by_id(ObjectId(identity))
+        user = current_user()
 
-        #fetch auction bids
-        bids = BidService.get_bids_for_auction(ObjectId(auction_id))
-        return render_template('auction/detail.html', auction=auction, bids=bids, current_time=datetime.utcnow(), current_user=user)
+        # Only the top bids are rendered; the rest load from auction_bids as the user scrolls
+        bids, bids_cursor = BidService.get_bid_history(auction.id)
+        page = render_template('auction/detail.html', auction=auction, bids=bids, bids_cursor=bids_cursor,
+                               current_time=datetime.utcnow(), current_user=user, event_seq=event_seq)
+        return with_etag(page, etag, private=True)
     except Exception as e:
         logger.exception(f"Error retrieving auction {auction_id}")
         flash('Error loading auction', 'error')
         return redirect(url_for('auction_router.list_auctions'))
 
 
+@auction_router.route('/<auction_id>/bids')
+def auction_bids(auction_id):
+    """Bid history pages (highest first) for infinite scroll: ?before=<next_cursor>&limit="""
+    if not ObjectId.is_valid(auction_id):
+        return jsonify({'error': 'Auction not found'}), 404
+    etag = etag_for(auction_version(auction_id), 'bids', request.query_string)
+    cached = not_modified(etag)
+    if cached is not None:
+        return cached
+    try:
+        limit = parse_limit(request.args.get('limit'), default=BID_HISTORY_PAGE_SIZE)
+        bids, next_cursor = BidService.get_bid_history(auction_id, limit=limit, before=request.args.get('before') or None)
+    except ValueError as ve:
+        logger.warning(f"Bad bid history parameters: {ve}")
+        return jsonify({'error': str(ve)}), 400
+    return with_etag(json_response({
+        'bids': [BidView.from_history(bid) for bid in bids],
+        'next_cursor': next_cursor
+    }), etag)
+
+
 @auction_router.route('/<auction_id>/delete', methods=['POST','DELETE'])
 @jwt_required()
 def delete_auction(auction_id):
@@ -1,13 +1,15 @@
 import logging
 from flask import Blueprint, request, redirect, url_for, flash, jsonify
-from flask_jwt_extended import get_jwt_identity
-from bson import ObjectId
 
-from src.services.auction_service import AuctionService
+from src.services.bid_broadcaster import broadcast_bid
 from src.services.bid_service import BidService
-from src.repositories.user_repository import UserRepository
-from src.repositories.auction_repository import AuctionRepository
+from src.utils.request_identity import current_identity, current_user
+from src.exceptions.auction_ended import AuctionEnded
+from src.exceptions.auction_not_found import AuctionNotFound
 from src.exceptions.bid_too_low import BidTooLow
+from src.exceptions.idempotency_conflict import IdempotencyConflict
+from src.exceptions.rate_limited import RateLimited
+from src.utils.rate_limit import get_bid_rate_limiter
 
 # Configure logger
 logger = logging.getLogger(__name__)
@@ -16,7 +18,7 @@ bid_router = Blueprint('bid_router', __name__, url_prefix="/bid")
 
 @bid_router.route("/place/<auction_id>", methods=["POST"])
 def place_bid(auction_id):
-    identity = get_jwt_identity()
+    identity = current_identity()
     try:
         logger.info(f"Received bid request for auction_id={auction_id}, identity={identity}")
 
@@ -28,7 +30,12 @@ def place_bid(auction_id):
             flash(msg, "error")
             return redirect(url_for("auth_router.login"))
 
-        user = UserRepository.get_user_by_id(ObjectId(identity))
+        # Token buckets per user, auction and client address, before anything touches the database
+        limiter = get_bid_rate_limiter()
+        if limiter is not None:
+            limiter.check(user=identity, auction=auction_id, ip=request.remote_addr)
+
+        user = current_user()
         if not user:
             msg = "User not found"
             logger.error(f"No user found with id={identity}")
@@ -37,45 +44,53 @@ def place_bid(auction_id):
             flash(msg, "error")
             return redirect(url_for("auction_router.list_auctions"))
 
-        auction = AuctionRepository.get_auction_by_id(ObjectId(auction_id))
-        if not auction:
-            msg = "Auction not found"
-            logger.error(f"No auction found with id={auction_id}")
-            if request.is_json:
-                return jsonify({"error": msg}), 404
-            flash(msg, "error")
-            return redirect(url_for("auction_router.list_auctions"))
-
-
         # Handle both form and JSON bid submissions
         if request.is_json:
             bid_amount = float(request.json.get("bid_amount"))
         else:
             bid_amount = float(request.form.get("bid_amount"))
 
-        logger.info(f"User {user.username} ({user.id}) placing bid: {bid_amount} on auction {auction.id}")
+        logger.info(f"User {user.username} ({user.id}) placing bid: {bid_amount} on auction {auction_id}")
 
-        BidService.place_bid(auction.id, user.id, bid_amount)
-        logger.info(f"User {user.username} ({user.id}) placed bid: {bid_amount} on auction {auction.id} successfully.")
-        # Update current bid on auction
-        updated_auction = AuctionService.update_current_bid(ObjectId(auction.id), bid_amount)
-        if updated_auction:
-            logger.info(f"Updated auction current bid: {updated_auction.current_bid}")
-        else:
-            logger.error(f"Failed to update current bid for auction={auction.id}")
+        # Retries carrying the same Idempotency-Key get the original outcome
+        idempotency_key = request.headers.get("Idempotency-Key") or (
+            request.json.get("idempotency_key") if request.is_json else request.form.get("idempotency_key")
+        )
+
+        # Single conditional update: accepts the bid and moves current_bid in one write
+        bid, replayed = BidService.place_bid_once(
+            idempotency_key, auction_id, user.id, bid_amount, bidder_name=user.username
+        )
+        logger.info(f"User {user.username} ({user.id}) placed bid: {bid_amount} on auction {auction_id} successfully.")
+        if not replayed:
+            broadcast_bid(auction_id, bid, user.id, user.username)
 
         msg = "Bid placed successfully!"
         if request.is_json:
             return jsonify({
                 "message": msg,
-                "auction_id": str(auction.id),
-                "new_current_bid": updated_auction.current_bid if updated_auction else bid_amount
+                "auction_id": auction_id,
+                "new_current_bid": bid.bid_amount
             }), 200
 
         flash(msg, "success")
 
-        return redirect(url_for("auction_router.auction_detail", auction_id=auction.id))
+        return redirect(url_for("auction_router.auction_detail", auction_id=auction_id))
 
+    except AuctionNotFound:
+        msg = "Auction not found"
+        logger.error(f"No auction found with id={auction_id}")
+        if request.is_json:
+            return jsonify({"error": msg}), 404
+        flash(msg, "error")
+        return redirect(url_for("auction_router.list_auctions"))
+    except AuctionEnded:
+        msg = "Auction has ended"
+        logger.warning(f"Bid on ended auction: auction={auction_id}, bidder={identity}")
+        if request.is_json:
+            return jsonify({"error": msg}), 400
+        flash(msg, "error")
+        return redirect(url_for("auction_router.auction_detail", auction_id=auction_id))
     except BidTooLow:
         msg = "Your bid must be higher than the current bid"
         logger.warning(f"Bid too low: auction={auction_id}, bidder={identity}")
@@ -83,10 +98,24 @@ def place_bid(auction_id):
             return jsonify({"error": msg}), 400
         flash(msg, "error")
         return redirect(url_for("auction_router.auction_detail", auction_id=auction_id))
+    except IdempotencyConflict as e:
+        logger.warning(f"Idempotency conflict: auction={auction_id}, bidder={identity}: {e.message}")
+        if request.is_json:
+            return jsonify({"error": e.message}), 409
+        flash(e.message, "error")
+        return redirect(url_for("auction_router.auction_detail", auction_id=auction_id))
+    except RateLimited as e:
+        logger.warning(f"Bid rate limited: auction={auction_id}, bidder={identity}, ip={request.remote_addr}")
+        if request.is_json:
+            response = jsonify({"error": e.message, "retry_after": e.retry_after})
+            response.headers["Retry-After"] = str(max(1, round(e.retry_after)))
+            return response, 429
+        flash(e.message, "error")
+        return redirect(url_for("auction_router.auction_detail", auction_id=auction_id))
     except Exception as e:
         msg = "Exception Error"
         logger.warning(f"Caught an exception: auction={auction_id}, bidder={identity} with {e}")
         if request.is_json:
-            return jsonify({"error": {e}}), 400
+            return jsonify({"error": str(e)}), 400
         flash(msg, "error")
         return redirect(url_for("auction_router.auction_detail", auction_id=auction_id))
@@ -1,73 +1,124 @@
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
-from flask_socketio import emit
-from src.models.user import User
-from src.services.auction_service import AuctionService
+import logging
+
+from bson import ObjectId
+from flask_socketio import emit, join_room, leave_room
+from src.exceptions.auction_app_error import AuctionAppError
+from src.exceptions.rate_limited import RateLimited
+from src.services.bid_broadcaster import broadcast_bid
+from src.services.bid_event_log import get_bid_event_log
 from src.services.bid_service import BidService
-from datetime import datetime
+from src.services.socket_auth import authenticate_connection, forget_socket, session_user
+from src.utils.rate_limit import get_bid_rate_limiter
+from src.utils.socket_rooms import TICKER_ROOM, auction_room
 from flask import request
 
+logger = logging.getLogger(__name__)
+
 def register_socketio_events(socketio):
     @socketio.on('connect')
     def handle_connect():
         print(f'Client connected: {request.sid}')
-        emit('connection_response', {'status': 'connected'})
+        # Authenticate once per connection; bid events reuse the Socket.IO session
+        session = authenticate_connection()
+        emit('connection_response', {'status': 'connected', 'authenticated': bool(session)})
 
     @socketio.on('disconnect')
     def handle_disconnect():
         print(f'Client disconnected: {request.sid}')
+        forget_socket(request.sid)
+
+    # Detail pages watch a single auction; bid events are only sent to that room
+    @socketio.on('join_auction')
+    def handle_join_auction(data):
+        auction_id = (data or {}).get('auction_id')
+        if not auction_id or not ObjectId.is_valid(auction_id):
+            emit('room_error', {'message': 'Invalid auction id'})
+            return
+        join_room(auction_room(auction_id))
+
+    # Detail pages (re)join with the last bid event seq they have seen: missed events are
+    # replayed from the auction's event log, or a snapshot is sent if the log can't cover the gap
+    @socketio.on('resume')
+    def handle_resume(data):
+        data = data or {}
+        auction_id = data.get('auction_id')
+        if not auction_id or not ObjectId.is_valid(auction_id):
+            emit('room_error', {'message': 'Invalid auction id'})
+            return
+        # Join first so nothing published while we read the log is lost (the client drops duplicates)
+        join_room(auction_room(auction_id))
+
+        events = None
+        last_seq = data.get('last_seq')
+        log = get_bid_event_log()
+        if log is not None and isinstance(last_seq, int) and last_seq >= 0:
+            try:
+                events = log.since(auction_id, last_seq)
+            except Exception as e:
+                logger.warning(f"Bid event log unavailable for resume: {e}")
+        if events is not None:
+            emit('bid_replay', {'auction_id': auction_id, 'events': events})
+            return
+        try:
+            emit('bid_snapshot', BidService.get_bid_snapshot(auction_id))
+        except AuctionAppError as e:
+            emit('room_error', {'message': e.message})
+
+    @socketio.on('leave_auction')
+    def handle_leave_auction(data):
+        auction_id = (data or {}).get('auction_id')
+        if auction_id:
+            leave_room(auction_room(auction_id))
+
+    # List pages may opt in to price-only updates for every auction
+    @socketio.on('join_ticker')
+    def handle_join_ticker(data=None):
+        join_room(TICKER_ROOM)
+
+    @socketio.on('leave_ticker')
+    def handle_leave_ticker(data=None):
+        leave_room(TICKER_ROOM)
 
     @socketio.on('place_bid')
     def handle_place_bid(data):
         print("Received bid:", data)
         try:
-            # Verify JWT and get user identity
-            try:
-                verify_jwt_in_request()
-                user_id = get_jwt_identity()
-                if not user_id:
-                    emit('bid_error', {'message': 'Authentication required'})
-                    return
-                user = User.objects.get(id=user_id)
-            except Exception as e:
-                emit('bid_error', {'message': 'Authentication failed'})
+            # Identity from the connection (token re-checked only after it expires)
+            user = session_user(token=data.get('token'))
+            if not user:
+                emit('bid_error', {'message': 'Authentication required'})
                 return
+            user_id, username = ObjectId(user['user_id']), user['username']
 
             auction_id = data['auction_id']
             bid_amount = float(data['bid_amount'])
 
-            # Validate bid
-            auction = AuctionService.get_auction_by_id(auction_id)
-            if datetime.utcnow() > auction.end_time:
-                emit('bid_error', {'message': 'Auction has ended'})
-                return
+            # Token buckets per user, auction and client address, before anything touches the database
+            limiter = get_bid_rate_limiter()
+            if limiter is not None:
+                try:
+                    limiter.check(user=user['user_id'], auction=auction_id, ip=request.remote_addr)
+                except RateLimited as e:
+                    emit('rate_limited', {'message': e.message, 'retry_after': e.retry_after})
+                    return
 
-            highest_bid = BidService.get_highest_bid(auction_id)
-            if highest_bid and bid_amount <= highest_bid.bid_amount:
-                emit('bid_error', {
-                    'message': f'Bid must be higher than current bid (${highest_bid.bid_amount})'
-                })
+            # Accept or reject with one conditional update (status, end_time, current_bid)
+            try:
+                bid, replayed = BidService.place_bid_once(
+                    data.get('idempotency_key'),
+                    auction_id=auction_id,
+                    bidder_id=user_id,
+                    bid_amount=bid_amount,
+                    bidder_name=username
+                )
+            except AuctionAppError as e:
+                emit('bid_error', {'message': e.message})
                 return
 
-            # Place bid
-            bid = BidService.place_bid(
-                auction_id=auction_id,
-                bidder_id=user.id,
-                bid_amount=bid_amount
-            )
-
-            # Broadcast updates
-            emit('new_bid', {
-                'auction_id': auction_id,
-                'bid_amount': bid_amount,
-                'bidder_id': str(user.id),
-                'bidder_name': user.username,
-                'timestamp': bid.created_at.isoformat()
-            }, broadcast=True)
-
-            emit('update_price', {
-                'auction_id': auction_id,
-                'current_price': bid_amount
-            }, broadcast=True)
+            # Coalesced bid_update to the auction's watchers (and a price tick for list pages);
+            # a replayed retry was already broadcast by the original attempt
+            if not replayed:
+                broadcast_bid(auction_id, bid, user_id, username)
 
         except Exception as e:
             emit('bid_error', {'message': str(e)})
\ No newline at end of file
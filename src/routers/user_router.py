@@ -12,6 +12,7 @@ from src.services.auction_service import AuctionService
 from src.services.bid_service import BidService
 from src.services.contact_service import ContactMessageService
 from src.services.user_service import UserService
+from src.utils.request_identity import current_user
 import logging
 logger = logging.getLogger(__name__)
 
@@ -25,7 +26,8 @@ def protected():
 
 @user_router.route('/')
 def index():
-    featured_auctions = AuctionService.get_featured_auctions()
+    # Every active auction
+    featured_auctions = AuctionService.get_featured_summaries(limit=None)
     return render_template("index.html", featured_auctions=featured_auctions)
 
 @user_router.route('/about')
@@ -59,13 +61,20 @@ def profile():
     try:
         logger.info(f"Fetching profile")
         print(f"got {type(user_id)} {user_id}")
-        gotten_user = UserService.get_user_by_id(ObjectId(user_id))
+        gotten_user = current_user()
+        if not gotten_user:
+            raise UserDoesNotExist("User not found")
         print(f"{gotten_user.username} {gotten_user.email} {gotten_user.first_name} {gotten_user.last_name}")
 
-        user_bids = BidService.get_user_bids(ObjectId(gotten_user.id))
-        print(f"User {gotten_user.username} has {len(user_bids)} bids")
-        logger.info(f"User {gotten_user.username} has {len(user_bids)}")
-        return render_template('profile.html', user=gotten_user, bids=user_bids)
+        # One aggregation per page: bids + auction title/price + winning flag
+        try:
+            user_bids, next_cursor = BidService.get_user_bid_page(gotten_user.id, before=request.args.get('before') or None)
+        except ValueError as ve:
+            logger.warning(f"Bad profile pagination cursor: {ve}")
+            flash(str(ve), "error")
+            return redirect(url_for('user_router.profile'))
+        logger.info(f"User {gotten_user.username}: showing {len(user_bids)} bids")
+        return render_template('profile.html', user=gotten_user, bids=user_bids, next_cursor=next_cursor)
     except UserDoesNotExist as e:
         logger.warning(f"User profile not found: {user_id}")
         flash("User does not exist.", "error")
@@ -105,10 +114,6 @@ def edit_profile():
             logger.info(f"User edited {first_name} {last_name}")
             flash(f"Profile updated successfully!", "success")
 
-            user_bids = BidService.get_user_bids(ObjectId(gotten_user.id))
-
-            logger.info(f"User {gotten_user.username} has {len(user_bids)}")
-
             return redirect(url_for('user_router.profile'))
     except UserDoesNotExist as e:
         logger.warning("Delete user attempted for user not found")
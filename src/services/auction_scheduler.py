@@ -0,0 +1,223 @@
+"""
+AuctionCloseScheduler (background job)
+ - Keeps a min-heap of upcoming end_times, loaded incrementally from the (status, end_time)
+   index: only auctions ending within AUCTION_SCHEDULER_HORIZON seconds are held in memory
+ - Closes due auctions in batches (update_many) and emits 'auction_ended' to their watchers
+ - One leader across all workers/hosts, elected through a Redis lease; other workers idle
+ - Auctions created or rescheduled inside the loaded window are handed to the leader through
+   a Redis sorted set (schedule_auction_close); an index-backed sweep of overdue auctions
+   covers anything missed while no leader was running
+"""
+import calendar
+import heapq
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+
+from src.repositories.auction_repository import AuctionRepository
+from src.utils.socket_rooms import TICKER_ROOM, auction_room
+
+logger = logging.getLogger(__name__)
+
+LEASE_KEY = 'auction:scheduler:lease'
+PENDING_KEY = 'auction:scheduler:pending'
+
+# Renew the lease only if we still hold it
+_RENEW_LEASE = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Atomically take pending (auction_id, end_ts) entries that fall inside the loaded window
+_TAKE_PENDING = """
+local items = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'WITHSCORES', 'LIMIT', 0, ARGV[2])
+for i = 1, #items, 2 do
+    redis.call('ZREM', KEYS[1], items[i])
+end
+return items
+"""
+
+
+def _to_ts(dt: datetime) -> float:
+    return calendar.timegm(dt.utctimetuple()) + dt.microsecond / 1e6
+
+
+def _to_naive_utc(dt: datetime) -> datetime:
+    # Mongo hands back naive UTC datetimes, so compare everything in that form
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+class AuctionCloseScheduler:
+    def __init__(self, app, socketio, redis_client, horizon: int = 300, batch_size: int = 500,
+                 lease_ttl: int = 15, tick: float = 0.25, refresh_interval: int = 30):
+        self._app = app
+        self._socketio = socketio
+        self._redis = redis_client
+        self._horizon = timedelta(seconds=horizon)
+        self._batch_size = batch_size
+        self._lease_ttl_ms = int(lease_ttl * 1000)
+        self._tick = tick
+        self._refresh_interval = timedelta(seconds=refresh_interval)
+        self._worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._renew_lease = redis_client.register_script(_RENEW_LEASE)
+        self._take_pending = redis_client.register_script(_TAKE_PENDING)
+        self._running = False
+        self._reset()
+
+    def _reset(self):
+        self._is_leader = False
+        self._heap = []          # (end_time, auction_id)
+        self._scheduled = {}     # auction_id -> end_time currently in the heap
+        self._loaded_until = None
+        self._next_refresh = datetime.min
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._socketio.start_background_task(self._run)
+        logger.info(f"Auction close scheduler started (worker={self._worker_id})")
+
+    def stop(self):
+        self._running = False
+
+    def _run(self):
+        while self._running:
+            try:
+                with self._app.app_context():
+                    if self._hold_lease():
+                        self._step()
+            except Exception as e:
+                logger.exception(f"Auction close scheduler iteration failed: {e}")
+            self._socketio.sleep(self._sleep_for())
+
+    # ----------------------------
+    # Leader election
+    # ----------------------------
+    def _hold_lease(self) -> bool:
+        try:
+            if self._is_leader and self._renew_lease(keys=[LEASE_KEY], args=[self._worker_id, self._lease_ttl_ms]):
+                return True
+            acquired = bool(self._redis.set(LEASE_KEY, self._worker_id, nx=True, px=self._lease_ttl_ms))
+        except Exception as e:
+            logger.warning(f"Scheduler lease check failed: {e}")
+            acquired = False
+
+        if acquired and not self._is_leader:
+            logger.info(f"Scheduler lease acquired by {self._worker_id}")
+            self._reset()
+            self._is_leader = True
+        elif not acquired and self._is_leader:
+            logger.info(f"Scheduler lease lost by {self._worker_id}")
+            self._reset()
+        return self._is_leader
+
+    # ----------------------------
+    # Scheduling
+    # ----------------------------
+    def _step(self):
+        now = datetime.utcnow()
+        if now >= self._next_refresh:
+            self._sweep_overdue(now)
+            complete = self._load_window(now)
+            self._next_refresh = now + self._refresh_interval
+            if not complete:
+                # Window only partly loaded: fetch the next batch once we reach the watermark
+                self._next_refresh = min(self._next_refresh, self._loaded_until)
+        self._take_handoffs()
+        self._close_due(datetime.utcnow())
+
+    def _push(self, auction_id: str, end_time: datetime):
+        if self._scheduled.get(auction_id) == end_time:
+            return
+        self._scheduled[auction_id] = end_time
+        heapq.heappush(self._heap, (end_time, auction_id))
+
+    def _load_window(self, now: datetime) -> bool:
+        """
+        Load auctions ending between the watermark and now + horizon, one batch at a time.
+        Returns False if a batch of identical end_times stopped the load early.
+        """
+        until = now + self._horizon
+        while True:
+            rows = AuctionRepository.get_auctions_ending_between(
+                self._loaded_until, until, self._batch_size, include_after=True
+            )
+            for row in rows:
+                self._push(str(row['_id']), row['end_time'])
+            if len(rows) < self._batch_size:
+                self._loaded_until = until
+                return True
+            last = rows[-1]['end_time']
+            if last == self._loaded_until:
+                # A whole batch shares one end_time; closing it drains the index range
+                return False
+            self._loaded_until = last
+
+    def _sweep_overdue(self, now: datetime):
+        """Close Active auctions whose end_time passed while no leader was running."""
+        while True:
+            rows = AuctionRepository.get_auctions_ending_between(None, now, self._batch_size)
+            if not rows:
+                return
+            self._close([str(row['_id']) for row in rows], now)
+            if len(rows) < self._batch_size:
+                return
+
+    def _take_handoffs(self):
+        if self._loaded_until is None:
+            return
+        items = self._take_pending(keys=[PENDING_KEY], args=[_to_ts(self._loaded_until), self._batch_size])
+        for member, score in zip(items[::2], items[1::2]):
+            auction_id = member.decode() if isinstance(member, bytes) else member
+            self._push(auction_id, datetime.utcfromtimestamp(float(score)))
+
+    def _close_due(self, now: datetime):
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self._batch_size:
+            end_time, auction_id = heapq.heappop(self._heap)
+            if self._scheduled.get(auction_id) != end_time:
+                continue  # superseded by a reschedule
+            del self._scheduled[auction_id]
+            due.append(auction_id)
+        if due:
+            self._close(due, now)
+
+    def _close(self, auction_ids, now: datetime):
+        for auction_id in AuctionRepository.close_auctions(auction_ids, now):
+            event = {'auction_id': auction_id}
+            self._socketio.emit('auction_ended', event, to=[auction_room(auction_id), TICKER_ROOM])
+
+    def _sleep_for(self) -> float:
+        if not self._is_leader:
+            return self._lease_ttl_ms / 3000.0
+        if self._heap:
+            until_next = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+            return max(0.0, min(self._tick, until_next))
+        return self._tick
+
+
+def schedule_auction_close(auction_id, end_time: datetime):
+    """
+    Hand a new or changed end_time to the scheduler leader. Auctions ending beyond the
+    horizon are skipped: the leader will load them from Mongo when its window reaches them.
+    """
+    redis_client = current_app.extensions.get('redis')
+    if redis_client is None or end_time is None:
+        return
+    end_time = _to_naive_utc(end_time)
+    horizon = current_app.config.get('AUCTION_SCHEDULER_HORIZON', 300)
+    if end_time > datetime.utcnow() + timedelta(seconds=horizon):
+        return
+    try:
+        redis_client.zadd(PENDING_KEY, {str(auction_id): _to_ts(end_time)})
+    except Exception as e:
+        logger.warning(f"Failed to hand auction {auction_id} to the close scheduler: {e}")
@@ -10,6 +10,12 @@ from bson import ObjectId
 from flask import current_app
 
 from src.repositories.auction_repository import AuctionRepository
+from src.repositories.user_repository import UserRepository
+from src.services.auction_scheduler import schedule_auction_close
+from src.services.bid_engine import forget_bid_state
+from src.services.bid_event_log import forget_bid_events
+from src.utils.pagination import DEFAULT_PAGE_SIZE
+from src.utils.streaming import batched
 
 logger = logging.getLogger(__name__)
 
@@ -101,6 +107,7 @@ class AuctionService:
         )
 
         logger.info(f"AuctionService created auction id={auction.id} by seller={seller_id}")
+        schedule_auction_close(auction.id, end_time)
         return auction
 
     @staticmethod
@@ -124,11 +131,64 @@ class AuctionService:
         logger.debug("AuctionService.search_auctions called")
         return AuctionRepository.search_auctions(search_query=search_query, category=category, status=status)
 
+    @staticmethod
+    def search_auctions_page(search_query=None, category=None, status=None, limit=None, after=None):
+        """Returns (auctions, next_cursor); raises ValueError for an invalid cursor."""
+        logger.debug(f"AuctionService.search_auctions_page called (limit={limit}, after={after})")
+        return AuctionRepository.search_auctions_page(
+            search_query=search_query, category=category, status=status,
+            limit=limit or DEFAULT_PAGE_SIZE, after=after
+        )
+
+    @staticmethod
+    def search_summaries_page(search_query=None, category=None, status=None, limit=None, after=None):
+        """search_auctions_page for auction cards: (AuctionSummary list with seller names, next_cursor)."""
+        summaries, next_cursor = AuctionRepository.search_auctions_page(
+            search_query=search_query, category=category, status=status,
+            limit=limit or DEFAULT_PAGE_SIZE, after=after, summaries=True
+        )
+        return AuctionService._with_seller_names(summaries), next_cursor
+
+    @staticmethod
+    def stream_auctions(search_query=None, category=None, status=None):
+        """Every matching Auction as a lazy iterator (streamed listings; no pagination)."""
+        return AuctionRepository.iter_search_results(
+            search_query=search_query, category=category, status=status,
+            batch_size=AuctionService._stream_batch_size()
+        )
+
+    @staticmethod
+    def stream_summaries(search_query=None, category=None, status=None):
+        """stream_auctions for auction cards: AuctionSummary objects, seller names filled per batch."""
+        batch_size = AuctionService._stream_batch_size()
+        summaries = AuctionRepository.iter_search_results(
+            search_query=search_query, category=category, status=status, summaries=True, batch_size=batch_size
+        )
+        for batch in batched(summaries, batch_size):
+            yield from AuctionService._with_seller_names(batch)
+
+    @staticmethod
+    def _stream_batch_size():
+        return current_app.config.get('AUCTION_STREAM_BATCH_SIZE', 100)
+
     @staticmethod
     def get_featured_auctions(limit=None):
         auctions = AuctionRepository.get_featured_auctions(limit=limit)
         return auctions
 
+    @staticmethod
+    def get_featured_summaries(limit=6):
+        """Featured auctions as AuctionSummary objects, seller names included."""
+        return AuctionService._with_seller_names(AuctionRepository.get_featured_summaries(limit=limit))
+
+    @staticmethod
+    def _with_seller_names(summaries):
+        """Fill seller_name on every summary with one batched user lookup."""
+        usernames = UserRepository.get_usernames({s.seller_id for s in summaries if s.seller_id})
+        for summary in summaries:
+            summary.seller_name = usernames.get(summary.seller_id)
+        return summaries
+
     @staticmethod
     def update_auction(auction_id, updated_data, current_user_id=None):
         """
@@ -168,7 +228,10 @@ class AuctionService:
 
         # Delegate update to repository
         updated = AuctionRepository.update_auction(auction_id, **updated_data)
+        forget_bid_state(auction_id)
         logger.info(f"Auction {auction_id} updated by {current_user_id}")
+        if updated and 'end_time' in updated_data:
+            schedule_auction_close(auction_id, updated_data['end_time'])
         return updated
 
     @staticmethod
@@ -187,9 +250,13 @@ class AuctionService:
             raise PermissionError("You are not authorized to delete this auction")
 
         result = AuctionRepository.delete_auction(auction_id)
+        forget_bid_state(auction_id)
+        forget_bid_events(auction_id)
         logger.info(f"Auction {auction_id} deleted by {current_user_id}")
         return result
 
     @staticmethod
     def close_auction(auction_id):
-        return AuctionRepository.close_auction(auction_id)
+        auction = AuctionRepository.close_auction(auction_id)
+        forget_bid_state(auction_id)
+        return auction
@@ -0,0 +1,100 @@
+"""
+BidBroadcaster (real-time fan-out)
+ - Merges new_bid + update_price into a single 'bid_update' event per accepted bid
+ - Caps emits per auction at BID_BROADCAST_MAX_RATE per second
+ - Latest value wins: bids arriving inside the window replace the pending payload
+   and are reported as 'skipped_bids' on the next emit
+ - The ticker room receives the same (already coalesced) price updates
+ - Each bid is first appended to the auction's BidEventLog; its seq rides along in bid_update
+   so reconnecting clients can resume from the last event they saw
+ - Seqs are assigned after the bid is committed, so concurrent bids may be numbered out of
+   acceptance order; clients never lower the displayed price for a later seq
+"""
+import logging
+import threading
+import time
+
+from flask import current_app
+
+from src.services.bid_event_log import record_bid_event
+from src.utils.socket_rooms import TICKER_ROOM, auction_room
+
+logger = logging.getLogger(__name__)
+
+
+class BidBroadcaster:
+    # Drop per-auction emit timestamps once this many auctions have been seen
+    _PRUNE_THRESHOLD = 10000
+
+    def __init__(self, socketio, max_rate: float = 4.0):
+        self._socketio = socketio
+        self._interval = 1.0 / max_rate if max_rate and max_rate > 0 else 0.0
+        self._lock = threading.Lock()
+        self._pending = {}    # auction_id -> {'payload': dict, 'skipped': int}
+        self._last_emit = {}  # auction_id -> time.monotonic() of last emit
+
+    def publish(self, auction_id: str, payload: dict):
+        """Queue a bid update; emits immediately if the auction's window is open."""
+        now = time.monotonic()
+        with self._lock:
+            pending = self._pending.get(auction_id)
+            if pending is not None:
+                # A flush is already scheduled for this auction: keep only the latest bid
+                pending['payload'] = payload
+                pending['skipped'] += 1
+                return
+
+            wait = self._last_emit.get(auction_id, 0.0) + self._interval - now
+            if wait <= 0:
+                self._last_emit[auction_id] = now
+                self._prune(now)
+            else:
+                self._pending[auction_id] = {'payload': payload, 'skipped': 0}
+
+        if wait <= 0:
+            self._emit(auction_id, payload, skipped=0)
+        else:
+            self._socketio.start_background_task(self._flush_later, auction_id, wait)
+
+    def _flush_later(self, auction_id: str, delay: float):
+        self._socketio.sleep(delay)
+        with self._lock:
+            pending = self._pending.pop(auction_id, None)
+            self._last_emit[auction_id] = time.monotonic()
+        if pending:
+            self._emit(auction_id, pending['payload'], skipped=pending['skipped'])
+
+    def _emit(self, auction_id: str, payload: dict, skipped: int):
+        event = dict(payload, skipped_bids=skipped)
+        logger.debug(f"Emitting bid_update for auction {auction_id} (skipped={skipped})")
+        self._socketio.emit('bid_update', event, to=auction_room(auction_id))
+        self._socketio.emit('update_price', {
+            'auction_id': auction_id,
+            'current_price': event['current_price']
+        }, to=TICKER_ROOM)
+
+    def _prune(self, now: float):
+        if len(self._last_emit) < self._PRUNE_THRESHOLD:
+            return
+        cutoff = now - self._interval
+        self._last_emit = {k: t for k, t in self._last_emit.items() if t >= cutoff}
+
+
+def broadcast_bid(auction_id, bid, bidder_id, bidder_name):
+    """Publish an accepted bid through the app's BidBroadcaster (no-op if not configured)."""
+    auction_id = str(auction_id)
+    payload = {
+        'auction_id': auction_id,
+        'bid_amount': bid.bid_amount,
+        'current_price': bid.bid_amount,
+        'bidder_id': str(bidder_id),
+        'bidder_name': bidder_name,
+        'timestamp': bid.created_at.isoformat()
+    }
+    payload['seq'] = record_bid_event(auction_id, payload)
+
+    broadcaster = current_app.extensions.get('bid_broadcaster')
+    if broadcaster is None:
+        logger.debug("No bid broadcaster registered; skipping bid_update")
+        return
+    broadcaster.publish(auction_id, payload)
@@ -0,0 +1,118 @@
+"""
+RedisBidEngine (optional, BID_ENGINE = 'redis')
+ - Keeps each auction's bid state (status, end_time, current_bid, seq) in a Redis hash
+ - Accepts or rejects a bid with one atomic Lua script, so any number of workers/hosts
+   agree on a strict per-auction order; every accepted bid gets the next seq
+ - The hash is primed from Mongo on first use and expires after the auction ends;
+   forget_bid_state() drops it whenever the auction is edited, closed or deleted
+Persisting the accepted bid stays with BidService (AuctionRepository + BidRepository).
+"""
+import calendar
+import logging
+from datetime import datetime, timedelta
+
+from flask import current_app, has_app_context
+
+from src.exceptions.auction_ended import AuctionEnded
+from src.exceptions.auction_not_found import AuctionNotFound
+from src.exceptions.bid_too_low import BidTooLow
+from src.repositories.auction_repository import AuctionRepository
+
+logger = logging.getLogger(__name__)
+
+# Keep the state around a little after end_time so late bids are still rejected from Redis
+STATE_GRACE = timedelta(hours=1)
+
+# KEYS[1]: auction bid state; ARGV: amount, now (epoch s), bidder_id
+_ACCEPT_BID = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {'miss'}
+end
+local state = redis.call('HMGET', KEYS[1], 'status', 'end_time', 'current_bid')
+if state[1] ~= 'Active' or tonumber(ARGV[2]) >= tonumber(state[2]) then
+    return {'ended'}
+end
+if tonumber(ARGV[1]) <= tonumber(state[3]) then
+    return {'low', state[3]}
+end
+redis.call('HSET', KEYS[1], 'current_bid', ARGV[1], 'highest_bidder', ARGV[3])
+return {'ok', tostring(redis.call('HINCRBY', KEYS[1], 'seq', 1))}
+"""
+
+# KEYS[1]: auction bid state; ARGV: status, end_time, current_bid, seq, expire_at (epoch s)
+_PRIME_STATE = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('HSET', KEYS[1], 'status', ARGV[1], 'end_time', ARGV[2], 'current_bid', ARGV[3], 'seq', ARGV[4])
+redis.call('EXPIREAT', KEYS[1], ARGV[5])
+return 1
+"""
+
+
+def _to_ts(dt: datetime) -> float:
+    return calendar.timegm(dt.utctimetuple()) + dt.microsecond / 1e6
+
+
+def state_key(auction_id) -> str:
+    return f"auction:{auction_id}:bid_state"
+
+
+class RedisBidEngine:
+    def __init__(self, redis_client):
+        self._redis = redis_client
+        self._accept = redis_client.register_script(_ACCEPT_BID)
+        self._prime = redis_client.register_script(_PRIME_STATE)
+
+    def accept(self, auction_id, bid_amount: float, bidder_id, bid_time: datetime) -> int:
+        """
+        Atomically accept the bid and return its per-auction sequence number.
+        Raises AuctionNotFound, AuctionEnded or BidTooLow.
+        """
+        key = state_key(auction_id)
+        args = [repr(float(bid_amount)), _to_ts(bid_time), str(bidder_id)]
+        result = self._accept(keys=[key], args=args)
+        if result[0] == b'miss':
+            self._prime_state(auction_id, key)
+            result = self._accept(keys=[key], args=args)
+
+        outcome = result[0].decode()
+        if outcome == 'ok':
+            return int(result[1])
+        if outcome == 'ended':
+            raise AuctionEnded()
+        if outcome == 'low':
+            raise BidTooLow(f"Bid must be higher than current bid (${float(result[1])})")
+        raise AuctionNotFound()
+
+    def _prime_state(self, auction_id, key):
+        state = AuctionRepository.get_bid_state(auction_id)
+        if state is None:
+            raise AuctionNotFound()
+        expire_at = int(_to_ts(max(state['end_time'], datetime.utcnow()) + STATE_GRACE))
+        self._prime(keys=[key], args=[
+            state['status'], _to_ts(state['end_time']), repr(float(state['current_bid'])),
+            state.get('bid_count', 0), expire_at
+        ])
+        logger.debug(f"Primed bid state for auction {auction_id}")
+
+    def forget(self, auction_id):
+        self._redis.delete(state_key(auction_id))
+
+
+def get_bid_engine():
+    """The app's RedisBidEngine, or None when bids go straight to Mongo (BID_ENGINE = 'mongo')."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('bid_engine')
+
+
+def forget_bid_state(auction_id):
+    """Drop the engine's copy of an auction after it was edited, closed or deleted."""
+    engine = get_bid_engine()
+    if engine is None:
+        return
+    try:
+        engine.forget(auction_id)
+    except Exception as e:
+        logger.error(f"Failed to drop bid state for auction {auction_id}: {e}")
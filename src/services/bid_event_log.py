@@ -0,0 +1,115 @@
+"""
+BidEventLog (missed-bid catch-up for Socket.IO clients)
+ - Every broadcast bid is appended to a capped per-auction Redis stream together with the
+   next value of a per-auction counter, in one Lua script; the stream entry id is <seq>-0
+ - bid_update events carry that seq, so a client always knows the last event it has seen
+ - After a reconnect the client sends 'resume' with its last seq and gets back only the
+   events it missed, or None (-> full snapshot) when they were trimmed from the stream or
+   the gap is larger than BID_EVENT_LOG_MAX_REPLAY
+ - Both keys expire BID_EVENT_LOG_TTL seconds after the auction's last bid
+"""
+import json
+import logging
+
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+# KEYS: seq counter, stream; ARGV: event (JSON), maxlen, ttl (s)
+_APPEND_EVENT = """
+local seq = redis.call('INCR', KEYS[1])
+redis.call('XADD', KEYS[2], 'MAXLEN', ARGV[2], seq .. '-0', 'event', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return seq
+"""
+
+
+def seq_key(auction_id) -> str:
+    return f"auction:{auction_id}:events:seq"
+
+
+def stream_key(auction_id) -> str:
+    return f"auction:{auction_id}:events"
+
+
+class BidEventLog:
+    def __init__(self, redis_client, maxlen: int = 500, max_replay: int = 100, ttl: int = 3 * 24 * 3600):
+        self._redis = redis_client
+        self._maxlen = maxlen
+        self._max_replay = min(max_replay, maxlen)
+        self._ttl = ttl
+        self._append = redis_client.register_script(_APPEND_EVENT)
+
+    def append(self, auction_id, event: dict) -> int:
+        """Store the event under the auction's next seq and return that seq."""
+        key = str(auction_id)
+        return int(self._append(keys=[seq_key(key), stream_key(key)],
+                                args=[json.dumps(event), self._maxlen, self._ttl]))
+
+    def current_seq(self, auction_id) -> int:
+        return int(self._redis.get(seq_key(auction_id)) or 0)
+
+    def since(self, auction_id, last_seq: int):
+        """
+        The events after last_seq, oldest first, or None when the log can't fill the gap
+        (trimmed, expired, reset, or more than max_replay events behind).
+        """
+        current = self.current_seq(auction_id)
+        if last_seq > current:
+            return None
+        if last_seq == current:
+            return []
+        if current - last_seq > self._max_replay:
+            return None
+        entries = self._redis.xrange(stream_key(auction_id), min=f"{last_seq + 1}-0", max='+',
+                                     count=self._max_replay)
+        events = [dict(json.loads(fields[b'event']), seq=int(entry_id.split(b'-')[0]))
+                  for entry_id, fields in entries]
+        if not events or events[0]['seq'] != last_seq + 1:
+            return None
+        return events
+
+    def forget(self, auction_id):
+        self._redis.delete(seq_key(auction_id), stream_key(auction_id))
+
+
+def get_bid_event_log():
+    """The app's BidEventLog, or None when BID_EVENT_LOG_ENABLED is off."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('bid_event_log')
+
+
+def record_bid_event(auction_id, event: dict):
+    """Append a bid event to the auction's log; returns its seq, or None if it couldn't be logged."""
+    log = get_bid_event_log()
+    if log is None:
+        return None
+    try:
+        return log.append(auction_id, event)
+    except Exception as e:
+        logger.error(f"Failed to log bid event for auction {auction_id}: {e}")
+        return None
+
+
+def current_bid_seq(auction_id):
+    """The auction's latest event seq, or None when there is no log to resume from."""
+    log = get_bid_event_log()
+    if log is None:
+        return None
+    try:
+        return log.current_seq(auction_id)
+    except Exception as e:
+        logger.error(f"Failed to read bid event seq for auction {auction_id}: {e}")
+        return None
+
+
+def forget_bid_events(auction_id):
+    log = get_bid_event_log()
+    if log is None:
+        return
+    try:
+        log.forget(auction_id)
+    except Exception as e:
+        logger.error(f"Failed to drop bid events for auction {auction_id}: {e}")
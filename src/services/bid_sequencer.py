@@ -0,0 +1,135 @@
+"""
+BidSequencer (optional, BID_SEQUENCER_ENABLED = True)
+Group commit for contested auctions:
+ - Bids are queued per auction; one consumer greenlet per auction wakes every
+   BID_SEQUENCER_WINDOW seconds and takes everything queued so far
+ - The highest bid in the batch (earliest on ties) is committed with a single write;
+   every other bid in the batch is rejected at once without touching the database
+ - If the winner itself is rejected (outbid elsewhere, auction ended) the whole batch
+   gets the same error, since every other bid in it is no higher
+The consumer exits when its queue drains, so idle auctions cost nothing.
+ - If a batch fails unexpectedly every bid still waiting on it gets a DatabaseError; if the
+   consumer itself dies its queue is dropped (and failed) so the next submit starts a new one
+ - submit() waits at most BID_SEQUENCER_TIMEOUT seconds for its batch
+"""
+import copy
+import logging
+import threading
+
+from flask import current_app, has_app_context
+
+from src.exceptions.bid_too_low import BidTooLow
+from src.exceptions.database_error import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+UNPROCESSED_MESSAGE = "Bid could not be processed, please try again"
+
+
+class _PendingBid:
+    __slots__ = ('bidder_id', 'bid_amount', 'bidder_name', 'done', 'result', 'error')
+
+    def __init__(self, bidder_id, bid_amount, bidder_name):
+        self.bidder_id = bidder_id
+        self.bid_amount = bid_amount
+        self.bidder_name = bidder_name
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class BidSequencer:
+    def __init__(self, app, socketio, commit, window: float = 0.02, timeout: float = 5.0):
+        """
+        commit(auction_id, bidder_id, bid_amount, bidder_name) performs the single write for
+        a batch winner and returns the Bid (or raises an AuctionAppError).
+        """
+        self._app = app
+        self._socketio = socketio
+        self._commit = commit
+        self._window = window
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._queues = {}  # auction_id -> [_PendingBid], present while a consumer is running
+
+    def submit(self, auction_id, bidder_id, bid_amount: float, bidder_name=None):
+        """Queue a bid and wait for its batch to be decided. Returns the Bid or raises."""
+        key = str(auction_id)
+        pending = _PendingBid(bidder_id, bid_amount, bidder_name)
+        with self._lock:
+            queue = self._queues.get(key)
+            start_consumer = queue is None
+            if start_consumer:
+                queue = self._queues[key] = []
+            queue.append(pending)
+        if start_consumer:
+            self._socketio.start_background_task(self._consume, key)
+
+        if not pending.done.wait(self._timeout):
+            with self._lock:
+                queue = self._queues.get(key)
+                if queue is not None and pending in queue:
+                    # Never taken into a batch, so it can be dropped without a decision
+                    queue.remove(pending)
+                    raise DatabaseError(UNPROCESSED_MESSAGE)
+            # Its batch is being decided right now; give the commit one more bounded wait
+            if not pending.done.wait(self._timeout):
+                logger.error(f"Timed out waiting for bid batch on auction {key}")
+                raise DatabaseError(UNPROCESSED_MESSAGE)
+        if pending.error is not None:
+            raise pending.error
+        return pending.result
+
+    def _consume(self, auction_id: str):
+        try:
+            while True:
+                self._socketio.sleep(self._window)
+                with self._lock:
+                    batch = self._queues.get(auction_id) or []
+                    if not batch:
+                        self._queues.pop(auction_id, None)
+                        return
+                    self._queues[auction_id] = []
+                try:
+                    with self._app.app_context():
+                        self._decide(auction_id, batch)
+                finally:
+                    self._fail_unresolved(batch)
+        except BaseException:
+            logger.exception(f"Bid sequencer consumer for auction {auction_id} died")
+            # Drop the queue so the next submit starts a fresh consumer
+            with self._lock:
+                queued = self._queues.pop(auction_id, None) or []
+            self._fail_unresolved(queued)
+            raise
+
+    @staticmethod
+    def _fail_unresolved(pendings):
+        for pending in pendings:
+            if not pending.done.is_set():
+                pending.error = DatabaseError(UNPROCESSED_MESSAGE)
+                pending.done.set()
+
+    def _decide(self, auction_id: str, batch):
+        # max() keeps the first of equal amounts, i.e. the earliest arrival wins ties
+        winner = max(batch, key=lambda p: p.bid_amount)
+        try:
+            winner.result = self._commit(auction_id, winner.bidder_id, winner.bid_amount, winner.bidder_name)
+            loser_error = BidTooLow(f"Bid must be higher than current bid (${winner.bid_amount})")
+        except Exception as e:
+            winner.error = loser_error = e
+        winner.done.set()
+
+        for pending in batch:
+            if pending is not winner:
+                pending.error = copy.copy(loser_error)
+                pending.done.set()
+        logger.debug(f"Sequenced {len(batch)} bid(s) on auction {auction_id}: "
+                     f"winner={winner.bid_amount} committed={winner.error is None}")
+
+
+def get_bid_sequencer():
+    """The app's BidSequencer, or None when every bid commits on its own."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('bid_sequencer')
@@ -1,12 +1,29 @@
 import logging
+from datetime import datetime
+
+from bson import ObjectId
+
+from src.exceptions.auction_ended import AuctionEnded
+from src.exceptions.auction_not_found import AuctionNotFound
 from src.exceptions.bid_too_low import BidTooLow
 from src.exceptions.invalid_bid import InvalidBid
-from src.models.auction import Auction
 from src.repositories.auction_repository import AuctionRepository
 from src.repositories.bid_repository import BidRepository
+from src.repositories.user_repository import UserRepository
+from src.services.bid_engine import get_bid_engine
+from src.services.bid_event_log import current_bid_seq
+from src.services.bid_sequencer import get_bid_sequencer
+from src.services.bid_writer import get_bid_writer
+from src.utils.idempotency import is_valid_key, run_once
 
 logger = logging.getLogger(__name__)
 
+# Bids rendered on the detail page / per history page, and sent to a client that resyncs from a snapshot
+BID_HISTORY_PAGE_SIZE = 20
+SNAPSHOT_BIDS = BID_HISTORY_PAGE_SIZE
+# Bids per page of the profile's bid history
+PROFILE_BIDS_PAGE_SIZE = 25
+
 class BidService:
     @staticmethod
     def get_bids_for_auction(auction_id):
@@ -14,26 +31,154 @@ class BidService:
         return BidRepository.get_bids_for_auction(auction_id)
 
     @staticmethod
-    def place_bid(auction_id, bidder_id, bid_amount):
+    def place_bid(auction_id, bidder_id, bid_amount, bidder_name=None):
+        """
+        Accept or reject a bid with one conditional update on the Auction document
+        (which also records bid_count, highest bidder and last bid time), then record the Bid.
+        With BID_ENGINE = 'redis' the Redis bid engine accepts the bid instead, and with
+        BID_SEQUENCER_ENABLED concurrent bids on one auction are group-committed.
+        Raises InvalidBid, AuctionNotFound, AuctionEnded or BidTooLow.
+        """
         logger.info(f"Attempting to place bid: auction={auction_id}, bidder={bidder_id}, amount={bid_amount}")
 
-        highest_bid = BidRepository.get_highest_bid(auction_id)
-        highest_bid_amount = 0
-        if highest_bid:
-            highest_bid_amount = highest_bid.bid_amount
-            logger.debug(f"Highest bid returned from repo: {highest_bid_amount}")
+        if not ObjectId.is_valid(str(auction_id)):
+            raise AuctionNotFound()
+        if bid_amount is None or bid_amount <= 0:
+            raise InvalidBid()
+
+        sequencer = get_bid_sequencer()
+        if sequencer is not None:
+            return sequencer.submit(auction_id, bidder_id, bid_amount, bidder_name)
+        return BidService.commit_bid(auction_id, bidder_id, bid_amount, bidder_name)
+
+    @staticmethod
+    def place_bid_once(idempotency_key, auction_id, bidder_id, bid_amount, bidder_name=None):
+        """
+        place_bid at most once per (bidder, idempotency_key); retries get the original outcome
+        (the same Bid, or the same error) without touching Mongo.
+        Returns (bid, replayed) - replayed bids were already broadcast by the first call.
+        """
+        if not idempotency_key:
+            return BidService.place_bid(auction_id, bidder_id, bid_amount, bidder_name), False
+        if not is_valid_key(idempotency_key):
+            raise InvalidBid("Invalid idempotency key")
+
+        placed = []
+
+        def place():
+            bid = BidService.place_bid(auction_id, bidder_id, bid_amount, bidder_name)
+            placed.append(bid)
+            return {'id': str(bid.id), 'bid_amount': bid.bid_amount, 'created_at': bid.created_at.isoformat()}
+
+        outcome, replayed = run_once(
+            f"bid:{bidder_id}:{idempotency_key}", fingerprint=f"{auction_id}:{float(bid_amount)}", action=place
+        )
+        if not replayed:
+            return placed[0], False
+        return BidRepository.new_bid(
+            ObjectId(auction_id), bidder_id, outcome['bid_amount'],
+            created_at=datetime.fromisoformat(outcome['created_at']), bid_id=ObjectId(outcome['id'])
+        ), True
 
-        if highest_bid is None:
-            auction = AuctionRepository.get_auction_by_id(auction_id)
-            highest_bid_amount = auction.starting_bid
-            logger.debug(f"No bids found, using auction starting_bid={highest_bid}")
+    @staticmethod
+    def commit_bid(auction_id, bidder_id, bid_amount, bidder_name=None):
+        """The accept-and-record write for one validated bid (BidSequencer calls this for batch winners)."""
+        bid_time = datetime.utcnow()
+        engine = get_bid_engine()
+        if engine is not None:
+            return BidService._place_bid_with_engine(engine, auction_id, bidder_id, bid_amount, bidder_name, bid_time)
 
-        if bid_amount <= highest_bid_amount:
-            logger.warning(f"Bid too low: amount={bid_amount}, required > {highest_bid}")
-            raise BidTooLow()
+        auction = AuctionRepository.accept_bid(auction_id, bid_amount, bidder_id, bidder_name, bid_time)
+        if auction is None:
+            BidService._raise_rejection(auction_id, bid_amount)
 
         logger.info(f"Bid accepted, saving to repo: auction={auction_id}, bidder={bidder_id}, amount={bid_amount}")
-        return BidRepository.place_bid(auction_id, bidder_id, bid_amount)
+        return BidService._record_bid(auction.id, bidder_id, bid_amount, bid_time, bidder_name=bidder_name)
+
+    @staticmethod
+    def _place_bid_with_engine(engine, auction_id, bidder_id, bid_amount, bidder_name, bid_time):
+        """BID_ENGINE = 'redis': Redis decides (atomically, across workers), Mongo records."""
+        seq = engine.accept(auction_id, bid_amount, bidder_id, bid_time)
+        logger.info(f"Bid accepted by engine (seq={seq}), saving to repo: auction={auction_id}, amount={bid_amount}")
+        AuctionRepository.record_bid(auction_id, bid_amount, bidder_id, bidder_name, bid_time)
+        return BidService._record_bid(ObjectId(auction_id), bidder_id, bid_amount, bid_time, seq=seq,
+                                      bidder_name=bidder_name)
+
+    @staticmethod
+    def _record_bid(auction_id, bidder_id, bid_amount, bid_time, seq=None, bidder_name=None):
+        """Insert the accepted Bid now, or queue it for the write-behind flusher (BID_WRITE_BEHIND)."""
+        writer = get_bid_writer()
+        if writer is None:
+            return BidRepository.place_bid(auction_id, bidder_id, bid_amount, created_at=bid_time, seq=seq,
+                                           bidder_name=bidder_name)
+        bid = BidRepository.new_bid(auction_id, bidder_id, bid_amount, created_at=bid_time, seq=seq,
+                                    bidder_name=bidder_name)
+        writer.append(bid)
+        return bid
+
+    @staticmethod
+    def _raise_rejection(auction_id, bid_amount):
+        """Work out why the conditional update matched nothing (rejection path only)."""
+        auction = AuctionRepository.get_auction_by_id(auction_id)
+        if not auction:
+            raise AuctionNotFound()
+        if auction.status != 'Active' or auction.end_time <= datetime.utcnow():
+            logger.warning(f"Bid on ended auction: auction={auction_id}, amount={bid_amount}")
+            raise AuctionEnded()
+        logger.warning(f"Bid too low: amount={bid_amount}, required > {auction.current_bid}")
+        raise BidTooLow(f"Bid must be higher than current bid (${auction.current_bid})")
+
+    @staticmethod
+    def get_bid_history(auction_id, limit=BID_HISTORY_PAGE_SIZE, before=None):
+        """
+        One page of bid history (highest first) as dicts with bid_amount, created_at, bidder_id
+        and bidder_name, plus the cursor for the next page. Bids stored before bidder_name was
+        denormalized get their names from one batched user lookup.
+        Raises ValueError for a bad cursor.
+        """
+        rows, next_cursor = BidRepository.get_bid_history_page(ObjectId(auction_id), limit, before=before)
+        missing = {row['bidder_id'] for row in rows if not row.get('bidder_name')}
+        usernames = UserRepository.get_usernames(missing) if missing else {}
+        history = [{
+            'bid_amount': row['bid_amount'],
+            'created_at': row['created_at'],
+            'bidder_id': str(row['bidder_id']),
+            'bidder_name': row.get('bidder_name') or usernames.get(row['bidder_id']),
+        } for row in rows]
+        return history, next_cursor
+
+    @staticmethod
+    def history_to_dict(bid):
+        """JSON shape of a bid history row (same fields as a bid_update event)."""
+        return {
+            'bid_amount': bid['bid_amount'],
+            'bidder_id': bid['bidder_id'],
+            'bidder_name': bid['bidder_name'],
+            'timestamp': bid['created_at'].isoformat()
+        }
+
+    @staticmethod
+    def get_bid_snapshot(auction_id, limit=SNAPSHOT_BIDS):
+        """
+        Current price/status and the top bids of an auction, for clients that fell too far
+        behind the bid event log. seq is read first: every event up to it is reflected in
+        the snapshot, later ones arrive as bid_update events.
+        """
+        seq = current_bid_seq(auction_id)
+        auction = AuctionRepository.get_auction_by_id(auction_id)
+        if not auction:
+            raise AuctionNotFound()
+        bids, next_cursor = BidService.get_bid_history(auction.id, limit=limit)
+        return {
+            'auction_id': str(auction.id),
+            'seq': seq,
+            'current_price': auction.current_bid,
+            'bid_count': auction.bid_count or 0,
+            'status': auction.status,
+            'highest_bidder_name': auction.highest_bidder_name,
+            'bids': [BidService.history_to_dict(bid) for bid in bids],
+            'next_cursor': next_cursor
+        }
 
     @staticmethod
     def get_highest_bid(auction_id):
@@ -41,6 +186,12 @@ class BidService:
         logger.debug(f"Highest bid for auction {auction_id}: {highest}")
         return highest
 
+    @staticmethod
+    def get_user_bid_page(bidder_id, limit=PROFILE_BIDS_PAGE_SIZE, before=None):
+        """(rows, next_cursor): a page of the user's bids with auction title and winning flag."""
+        logger.debug(f"Fetching bid page for bidder {bidder_id} (before={before})")
+        return BidRepository.get_user_bid_page(ObjectId(bidder_id), limit, before=before)
+
     @staticmethod
     def get_user_bids(bidder_id):
         logger.debug(f"Fetching user bids for bidder {bidder_id}")
@@ -0,0 +1,156 @@
+"""
+BidWriteBehind (optional, BID_WRITE_BEHIND = True)
+ - Accepted bids are appended to a Redis stream and acknowledged straight away
+ - A background greenlet per worker drains the stream through a consumer group and
+   writes Bid documents with insert_many, in batches of up to BID_FLUSH_BATCH_SIZE or
+   whatever arrived within BID_FLUSH_INTERVAL seconds of the first bid in the batch
+ - Entries are XACKed only after the insert, so a crash loses nothing: on start (and
+   periodically) entries left pending by dead consumers are claimed and replayed
+ - Bids carry their _id from the moment they are accepted, so a replay of an entry that
+   was already inserted is a harmless duplicate-key no-op
+ - Metrics: bid_writer.flushed / flush_errors / replayed counters, lag_seconds and
+   pending gauges
+"""
+import logging
+import os
+import socket
+import time
+
+import bson
+from bson.codec_options import CodecOptions
+from flask import current_app, has_app_context
+
+from src.repositories.bid_repository import BidRepository
+from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+STREAM_KEY = 'bids:pending'
+GROUP = 'bid-writers'
+
+_codec_options = CodecOptions(tz_aware=False)
+
+
+def _entry_age(entry_id: bytes, now: float) -> float:
+    """Seconds since the stream entry was added (ids start with a millisecond timestamp)."""
+    return max(0.0, now - int(entry_id.split(b'-')[0]) / 1000)
+
+
+class BidWriteBehind:
+    def __init__(self, app, socketio, redis_client, batch_size: int = 500, interval: float = 0.2,
+                 claim_idle: float = 30.0, claim_every: float = 10.0, consumer: str = None):
+        self._app = app
+        self._socketio = socketio
+        self._redis = redis_client
+        self._batch_size = batch_size
+        self._interval = interval
+        self._claim_idle_ms = int(claim_idle * 1000)
+        self._claim_every = claim_every
+        self._consumer = consumer or f"{socket.gethostname()}:{os.getpid()}"
+        self._running = False
+        self._group_ready = False
+
+    def append(self, bid):
+        """Queue an accepted Bid (with its id already assigned) for insertion."""
+        self._redis.xadd(STREAM_KEY, {'doc': bson.encode(bid.to_mongo())})
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self._socketio.start_background_task(self._run)
+        logger.info(f"Bid write-behind started (consumer={self._consumer})")
+
+    def stop(self):
+        self._running = False
+
+    def _run(self):
+        next_claim = 0.0
+        while self._running:
+            try:
+                with self._app.app_context():
+                    if time.monotonic() >= next_claim:
+                        self.replay()
+                        next_claim = time.monotonic() + self._claim_every
+                    self.flush_once()
+            except Exception as e:
+                metrics.incr('bid_writer.flush_errors')
+                logger.exception(f"Bid write-behind flush failed: {e}")
+                self._socketio.sleep(1)
+
+    def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            self._redis.xgroup_create(STREAM_KEY, GROUP, id='0', mkstream=True)
+        except Exception as e:
+            if 'BUSYGROUP' not in str(e):
+                raise
+        self._group_ready = True
+
+    def flush_once(self) -> int:
+        """Read one batch (waiting up to the flush interval) and write it. Returns bids written."""
+        self._ensure_group()
+        batch, deadline = [], None
+        while len(batch) < self._batch_size:
+            timeout = self._interval if deadline is None else deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            response = self._redis.xreadgroup(
+                GROUP, self._consumer, {STREAM_KEY: '>'},
+                count=self._batch_size - len(batch), block=max(1, int(timeout * 1000))
+            )
+            entries = response[0][1] if response else []
+            if not entries:
+                break
+            batch.extend(entries)
+            deadline = deadline or time.monotonic() + self._interval
+        return self._write(batch)
+
+    def replay(self) -> int:
+        """Write entries this consumer read but never acked, then those abandoned by dead consumers."""
+        self._ensure_group()
+        written = 0
+        response = self._redis.xreadgroup(GROUP, self._consumer, {STREAM_KEY: '0'}, count=self._batch_size)
+        own = response[0][1] if response else []
+        written += self._write([e for e in own if e[1]])
+
+        start = '0-0'
+        while True:
+            start, claimed, *_ = self._redis.xautoclaim(
+                STREAM_KEY, GROUP, self._consumer, min_idle_time=self._claim_idle_ms,
+                start_id=start, count=self._batch_size
+            )
+            written += self._write([e for e in claimed if e and e[1]])
+            if not claimed or start in (b'0-0', '0-0'):
+                break
+        if written:
+            metrics.incr('bid_writer.replayed', written)
+            logger.warning(f"Replayed {written} unflushed bid(s)")
+        return written
+
+    def _write(self, entries) -> int:
+        if not entries:
+            return 0
+        now = time.time()
+        docs = [bson.decode(fields[b'doc'], codec_options=_codec_options) for _, fields in entries]
+        inserted = BidRepository.insert_many(docs)
+        ids = [entry_id for entry_id, _ in entries]
+        pipe = self._redis.pipeline(transaction=False)
+        pipe.xack(STREAM_KEY, GROUP, *ids)
+        pipe.xdel(STREAM_KEY, *ids)
+        pipe.xlen(STREAM_KEY)
+        pending = pipe.execute()[-1]
+
+        metrics.incr('bid_writer.flushed', inserted)
+        metrics.set_gauge('bid_writer.lag_seconds', round(max(_entry_age(i, now) for i in ids), 3))
+        metrics.set_gauge('bid_writer.pending', pending)
+        logger.debug(f"Flushed {inserted} bid(s) of {len(entries)} ({pending} pending)")
+        return inserted
+
+
+def get_bid_writer():
+    """The app's BidWriteBehind, or None when bids are inserted synchronously."""
+    if not has_app_context():
+        return None
+    return current_app.extensions.get('bid_writer')
@@ -0,0 +1,125 @@
+"""
+Socket.IO connection-level authentication
+ - authenticate_connection(): run once in 'connect'; verifies the handshake JWT and stores
+   user_id, username and the token's exp in the Socket.IO session (Flask-SocketIO keeps a
+   per-connection copy of flask.session, so nothing is written back to the HTTP session)
+ - session_user(): the stored identity for event handlers; the token is only re-checked
+   (from the handshake cookie/header or a 'token' sent with the event) once exp has passed
+ - publish_user_deactivated() / listen_for_deactivations(): Redis pub/sub so every worker
+   disconnects the sockets of a deactivated user
+"""
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app, request, session
+from flask_jwt_extended import decode_token, get_jwt, get_jwt_identity, verify_jwt_in_request
+
+from src.utils.request_identity import user_for_identity
+
+logger = logging.getLogger(__name__)
+
+DEACTIVATION_CHANNEL = 'socket:user_deactivated'
+SESSION_KEY = 'socket_user'
+
+# Sockets connected to this worker, by user id (only used to find sockets to drop)
+_lock = threading.Lock()
+_sids_by_user = defaultdict(set)
+_user_by_sid = {}
+
+
+def _active_user(user_id):
+    # Shares the JWT user lookup loader's per-context lookup, so verifying a token loads the user once
+    user = user_for_identity(user_id)
+    return user if user and user.is_active else None
+
+
+def _store_session(user, exp):
+    data = {'user_id': str(user.id), 'username': user.username, 'exp': exp} if user else {}
+    session[SESSION_KEY] = data
+    with _lock:
+        if user:
+            _sids_by_user[data['user_id']].add(request.sid)
+            _user_by_sid[request.sid] = data['user_id']
+    return data
+
+
+def authenticate_connection() -> dict:
+    """Verify the handshake token once; anonymous sockets get an empty session (watch-only)."""
+    user, exp = None, None
+    try:
+        verify_jwt_in_request(optional=True)
+        user = _active_user(get_jwt_identity())
+        exp = get_jwt().get('exp') if user else None
+    except Exception as e:
+        logger.info(f"Socket {request.sid} connected without a valid token: {e}")
+    return _store_session(user, exp)
+
+
+def session_user(token=None) -> dict:
+    """
+    {'user_id', 'username', 'exp'} for the current socket, or {} if not authenticated.
+    No JWT decode or user lookup happens until the stored token has expired.
+    """
+    stored = session.get(SESSION_KEY) or {}
+    if not stored.get('user_id'):
+        return {}
+    exp = stored.get('exp')
+    if exp is None or exp > time.time():
+        return stored
+
+    # Expired: accept a fresh token sent with the event, else the handshake token (if renewed)
+    forget_socket(request.sid)
+    user, exp = None, None
+    try:
+        if token:
+            claims = decode_token(token)
+        else:
+            verify_jwt_in_request()
+            claims = get_jwt()
+        if str(claims.get('sub')) == stored['user_id']:
+            user = _active_user(claims['sub'])
+            exp = claims.get('exp')
+    except Exception as e:
+        logger.info(f"Socket {request.sid} token expired and could not be renewed: {e}")
+    return _store_session(user, exp)
+
+
+def forget_socket(sid):
+    with _lock:
+        user_id = _user_by_sid.pop(sid, None)
+        if user_id is not None:
+            _sids_by_user[user_id].discard(sid)
+            if not _sids_by_user[user_id]:
+                del _sids_by_user[user_id]
+
+
+def publish_user_deactivated(user_id):
+    """Tell every worker to drop the user's sockets (best-effort)."""
+    redis_client = current_app.extensions.get('redis')
+    if redis_client is None:
+        return
+    try:
+        redis_client.publish(DEACTIVATION_CHANNEL, str(user_id))
+    except Exception as e:
+        logger.warning(f"Failed to publish deactivation of user {user_id}: {e}")
+
+
+def disconnect_user(socketio, user_id):
+    with _lock:
+        sids = _sids_by_user.pop(str(user_id), set())
+        for sid in sids:
+            _user_by_sid.pop(sid, None)
+    for sid in sids:
+        logger.info(f"Disconnecting socket {sid} of deactivated user {user_id}")
+        socketio.server.disconnect(sid, namespace='/', ignore_queue=True)
+
+
+def listen_for_deactivations(socketio, redis_client):
+    """Drop local sockets of users deactivated on any worker. Runs forever; start as a background task."""
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(DEACTIVATION_CHANNEL)
+    for message in pubsub.listen():
+        data = message['data']
+        disconnect_user(socketio, data.decode() if isinstance(data, bytes) else data)
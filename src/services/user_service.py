@@ -4,6 +4,7 @@ from src.exceptions.user_does_not_exists import UserDoesNotExist
 from src.repositories.user_repository import UserRepository
 from src.exceptions.user_already_exists import UserAlreadyExists
 from src.exceptions.invalid_credentials import InvalidCredentials
+from src.services.socket_auth import publish_user_deactivated
 logger = logging.getLogger(__name__)
 
 
@@ -37,6 +38,7 @@ class UserService:
             logger.warning(f"User not found for delete: {user_id}")
             raise UnauthorizedAccess("User is not authorized to perform this action.")
         UserRepository.update_user_status(user_id, is_active=False)
+        publish_user_deactivated(user_id)
 
     @staticmethod
     def edit_profile(user_id, first_name, last_name):
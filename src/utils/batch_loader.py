@@ -0,0 +1,12 @@
+"""
+Reference helpers for ReferenceFields.
+reference_id reads the id a ReferenceField points at straight from the raw document data,
+so callers that only need the id (to_dict, views, cache keys) never dereference it.
+"""
+from mongoengine import Document
+
+
+def reference_id(document: Document, field_name: str):
+    """The referenced document's id, without dereferencing it."""
+    value = document._data.get(field_name)
+    return getattr(value, 'id', value)
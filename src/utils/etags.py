@@ -0,0 +1,128 @@
+"""
+Resource versions and ETags for conditional GETs
+ - Redis counters: auction:<id>:version per auction and auctions:generation for the whole
+   collection; every write to an auction or its bids bumps both (bump_auction_versions)
+ - Missing counters are seeded from the clock rather than 0, so an expired or flushed counter
+   never repeats a value a client may still hold an ETag for
+ - Routes read the counter BEFORE building the response: a write racing the render only
+   makes the next request miss, it can't pin stale content to a new ETag
+ - not_modified(etag) is the 304 for a matching If-None-Match, checked before any Mongo query
+   or template render
+ - Without Redis (or on a Redis error) no ETag is issued and responses are built as usual
+"""
+import hashlib
+import logging
+import time
+from typing import Optional
+
+from flask import Response, current_app, has_app_context, make_response, request, session
+
+from src.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'auctions:generation'
+# Per-auction counters expire after this long without a write (they are reseeded on read)
+VERSION_TTL = 7 * 24 * 3600
+
+
+def _version_key(auction_id) -> str:
+    return f"auction:{auction_id}:version"
+
+
+def _redis():
+    return current_app.extensions.get('redis') if has_app_context() else None
+
+
+def bump_auction_versions(*auction_ids):
+    """Bump the version of each auction and the collection generation (no ids: generation only)."""
+    redis_client = _redis()
+    if redis_client is None:
+        return
+    seed = time.time_ns()
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for auction_id in auction_ids:
+            key = _version_key(auction_id)
+            pipe.set(key, seed, nx=True)
+            pipe.incr(key)
+            pipe.expire(key, VERSION_TTL)
+        pipe.set(GENERATION_KEY, seed, nx=True)
+        pipe.incr(GENERATION_KEY)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not bump versions for {auction_ids}: {e}")
+        metrics.incr('etag.error')
+
+
+def _read_counters(keys, ttl: int = None) -> Optional[list]:
+    """Current value of each counter (seeding missing ones) in one round trip; None without Redis."""
+    redis_client = _redis()
+    if redis_client is None:
+        return None
+    seed = time.time_ns()
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for key in keys:
+            pipe.set(key, seed, nx=True, ex=ttl)
+            pipe.get(key)
+        return [int(value) for value in pipe.execute()[1::2]]
+    except Exception as e:
+        logger.warning(f"Could not read version counters {keys}: {e}")
+        metrics.incr('etag.error')
+        return None
+
+
+def _read_counter(key: str, ttl: int = None) -> Optional[int]:
+    values = _read_counters([key], ttl=ttl)
+    return values[0] if values else None
+
+
+def auction_version(auction_id) -> Optional[int]:
+    return _read_counter(_version_key(auction_id), ttl=VERSION_TTL)
+
+
+def auction_versions(auction_ids) -> dict:
+    """auction id -> version for many auctions in one round trip (empty without Redis)."""
+    auction_ids = list(auction_ids)
+    values = _read_counters([_version_key(a) for a in auction_ids], ttl=VERSION_TTL) if auction_ids else None
+    return dict(zip(auction_ids, values)) if values else {}
+
+
+def collection_generation() -> Optional[int]:
+    return _read_counter(GENERATION_KEY)
+
+
+def etag_for(counter: Optional[int], *variant) -> Optional[str]:
+    """A strong ETag for one representation (variant: endpoint, query string, ...) of a counter value."""
+    if counter is None:
+        return None
+    salt = current_app.config.get('ETAG_SALT', '')
+    raw = '|'.join(str(part) for part in (salt, counter, *variant))
+    return hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()
+
+
+def page_etag(counter: Optional[int], identity, *variant) -> Optional[str]:
+    """etag_for a rendered page: varies by user, and none while flashed messages wait to be shown."""
+    if session.get('_flashes'):
+        return None
+    return etag_for(counter, identity or '', *variant)
+
+
+def not_modified(etag: Optional[str]) -> Optional[Response]:
+    """The 304 to return when the request's If-None-Match matches etag, else None."""
+    if etag is None or not request.if_none_match.contains_weak(etag):
+        return None
+    metrics.incr('etag.not_modified')
+    return with_etag(Response(status=304), etag)
+
+
+def with_etag(response, etag: Optional[str], private: bool = False):
+    """Attach etag (if any) to a view's return value; caches must revalidate before reuse."""
+    response = make_response(response)
+    if etag is not None:
+        response.set_etag(etag)
+        response.cache_control.no_cache = True
+        if private:
+            response.cache_control.private = True
+    return response
@@ -0,0 +1,74 @@
+"""
+Rendered template fragment cache
+ - {% cache 'card', auction.id, versions[auction.id] %}...{% endcache %} (FragmentCacheExtension)
+   stores the block's HTML in fragment_cache, a SnapshotCache (Redis + per-worker LRU)
+ - Keys carry the data's version (src.utils.etags counters), so a bid, edit or close renders
+   new fragments instead of invalidating old ones; stale entries just age out
+ - Keys are built from the data the block renders, not from counters read before loading it:
+   briefly stale data then lands under a key fresh data never asks for (fragment_digest)
+ - A None key part (no Redis, so no version) renders the block uncached
+ - Fragments must not depend on the current user
+"""
+import hashlib
+import logging
+
+from flask import current_app, has_app_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from src.utils.etags import auction_versions
+from src.utils.snapshot_cache import SnapshotCache
+
+logger = logging.getLogger(__name__)
+
+fragment_cache = SnapshotCache('fragment', ttl=300)
+
+
+def _fragment_key(parts) -> str:
+    # The deploy salt keeps fragments rendered by older templates from being served after a release
+    salt = current_app.config.get('ETAG_SALT', '') if has_app_context() else ''
+    return ':'.join(str(part) for part in (salt, *parts))
+
+
+def fragment_digest(auctions, versions):
+    """
+    Key part for a fragment rendering these AuctionSummary objects: each one's version and every
+    field a card shows. None (render uncached) when any version is unknown.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for auction in auctions:
+        version = versions.get(auction.id)
+        if version is None:
+            return None
+        digest.update(repr((version, sorted(auction.to_summary_dict().items()))).encode())
+    return digest.hexdigest()
+
+
+class FragmentCacheExtension(Extension):
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        # Version lookups for cache keys: one round trip for a whole grid of cards
+        environment.globals.update(auction_versions=auction_versions, fragment_digest=fragment_digest)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        parts = [parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            parts.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        call = self.call_method('_render_cached', [nodes.List(parts)])
+        return nodes.CallBlock(call, [], [], body).set_lineno(lineno)
+
+    def _render_cached(self, parts, caller):
+        if any(part is None for part in parts):
+            return caller()
+        key = _fragment_key(parts)
+        cached = fragment_cache.get(key)
+        if cached is not None:
+            return Markup(cached.decode('utf-8'))
+        html = caller()
+        fragment_cache.set(key, html.encode('utf-8'))
+        return html
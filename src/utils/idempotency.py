@@ -0,0 +1,99 @@
+"""
+Idempotency keys backed by Redis
+ - run_once(key, fingerprint, action): the first caller claims the key with SET NX and
+   runs action(); its outcome (a JSON-able dict, or the AuctionAppError it raised) is stored
+   under the key (for ttl) and handed to every retry without running action() again
+ - The claim itself only lives for pending_ttl: if its worker dies before storing an outcome,
+   the key frees up within seconds instead of blocking retries for the whole ttl
+ - Retries that arrive while the first call is still running wait for its outcome
+ - A key reused with a different fingerprint (e.g. another amount) raises IdempotencyConflict
+ - Unexpected errors release the key so the client can retry; without Redis, action() just runs
+"""
+import json
+import logging
+import time
+
+from flask import current_app
+
+from src.exceptions.auction_app_error import AuctionAppError
+from src.exceptions.idempotency_conflict import IdempotencyConflict
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'idempotency:'
+DEFAULT_TTL = 24 * 3600
+# Lifetime of an in-progress claim: comfortably longer than a bid takes to place
+PENDING_TTL = 30
+MAX_KEY_LENGTH = 128
+
+
+def is_valid_key(key) -> bool:
+    return isinstance(key, str) and 0 < len(key) <= MAX_KEY_LENGTH and key.isprintable()
+
+
+def _error_classes():
+    classes, stack = {}, [AuctionAppError]
+    while stack:
+        cls = stack.pop()
+        classes[cls.__name__] = cls
+        stack.extend(cls.__subclasses__())
+    return classes
+
+
+def _replay(record):
+    outcome = record['outcome']
+    if 'error' in outcome:
+        cls = _error_classes().get(outcome['error'], AuctionAppError)
+        raise cls(outcome['message'])
+    return outcome
+
+
+def run_once(key: str, fingerprint: str, action, ttl: int = DEFAULT_TTL, wait: float = 5.0, poll: float = 0.05,
+             pending_ttl: int = PENDING_TTL):
+    """Returns (outcome, replayed). Raises what action() raised (also on replay) or IdempotencyConflict."""
+    redis_client = current_app.extensions.get('redis')
+    if redis_client is None:
+        return action(), False
+
+    record_key = KEY_PREFIX + key
+    deadline = time.monotonic() + wait
+    while True:
+        try:
+            pending = json.dumps({'state': 'pending', 'fp': fingerprint})
+            claimed = redis_client.set(record_key, pending, nx=True, ex=pending_ttl)
+            raw = None if claimed else redis_client.get(record_key)
+        except Exception as e:
+            logger.warning(f"Idempotency store unavailable, running without it: {e}")
+            return action(), False
+
+        if claimed:
+            return _run_and_store(redis_client, record_key, fingerprint, action, ttl), False
+        if raw is None:
+            continue  # the first attempt failed and released the key; claim it ourselves
+
+        record = json.loads(raw)
+        if record['fp'] != fingerprint:
+            raise IdempotencyConflict("Idempotency key was already used for a different request")
+        if record['state'] == 'done':
+            logger.info(f"Replaying stored outcome for idempotency key {key}")
+            return _replay(record), True
+        if time.monotonic() >= deadline:
+            raise IdempotencyConflict("A request with this idempotency key is still being processed")
+        time.sleep(poll)
+
+
+def _run_and_store(redis_client, record_key, fingerprint, action, ttl):
+    try:
+        outcome = action()
+    except AuctionAppError as e:
+        _store(redis_client, record_key, fingerprint, {'error': type(e).__name__, 'message': e.message}, ttl)
+        raise
+    except Exception:
+        redis_client.delete(record_key)
+        raise
+    _store(redis_client, record_key, fingerprint, outcome, ttl)
+    return outcome
+
+
+def _store(redis_client, record_key, fingerprint, outcome, ttl):
+    redis_client.set(record_key, json.dumps({'state': 'done', 'fp': fingerprint, 'outcome': outcome}), ex=ttl)
@@ -0,0 +1,120 @@
+"""
+Index audit helpers
+ - repository_queries(): the filter/sort shape of every hot repository query, with sample values
+ - UNAUDITED_QUERIES: repository methods that query Mongo but have no explainable queryset
+ - find_collscans(explain): COLLSCAN stages in an explain() winning plan
+Every public repository method that queries Mongo needs an entry in one of the two;
+tests/test_index_audit.py fails when a method is added or renamed without one.
+"""
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from src.models.auction import Auction
+from src.models.bid import Bid
+from src.models.contact_message import ContactMessage
+from src.models.user import User
+from src.repositories.auction_repository import FEATURED_CACHE_SIZE
+
+# Repository methods left out of repository_queries(), and why
+UNAUDITED_QUERIES = {
+    'AuctionRepository.apply_bid_stats': "bulk UpdateOne by _id (backfill-bid-stats)",
+    'AuctionRepository.apply_description_teasers': "scans auctions without a teaser (one-off backfill-description-teasers)",
+    'BidRepository.insert_many': "inserts only",
+    'BidRepository.iter_bid_stats': "aggregates the whole bid collection (one-off backfill-bid-stats)",
+}
+
+# Queries that are known to scan; reported but not treated as failures
+KNOWN_COLLSCANS = {
+    # Legacy AUCTION_SEARCH_BACKEND='regex': an unanchored case-insensitive regex cannot use an index
+    'AuctionRepository.search_auctions(search_query, regex)',
+    # Nearly every user is active, so an is_active index would select almost the whole collection
+    'UserRepository.get_active_users',
+    # Admin listing of the whole (small) contact collection, unfiltered and in natural order
+    'ContactMessageRepository.get_all_contact_messages',
+}
+
+
+def repository_queries():
+    """(name, queryset) pairs mirroring the queries issued by the repositories."""
+    sample_id = ObjectId()
+    now = datetime.utcnow()
+    return [
+        # AuctionRepository
+        ('AuctionRepository.get_auction_by_id', Auction.objects(id=sample_id)),
+        ('AuctionRepository.update_current_bid', Auction.objects(id=sample_id)),
+        ('AuctionRepository.update_auction', Auction.objects(id=sample_id, bid_count=0)),
+        ('AuctionRepository.accept_bid', Auction.objects(
+            id=sample_id, status='Active', end_time__gt=now, current_bid__lt=1.0)),
+        ('AuctionRepository.get_bid_state', Auction.objects(id=sample_id)),
+        ('AuctionRepository.record_bid', Auction.objects(id=sample_id, current_bid__lt=1.0)),
+        ('AuctionRepository.get_active_auctions', Auction.objects(status='Active')),
+        ('AuctionRepository.get_featured_auctions',
+         Auction.objects(status='Active').order_by('-start_time').limit(6)),
+        ('AuctionRepository.get_featured_summaries',
+         Auction.objects(status='Active').order_by('-start_time').limit(FEATURED_CACHE_SIZE)),
+        ('AuctionRepository.get_featured_summaries(missing)', Auction.objects(id__in=[sample_id])),
+        ('AuctionRepository.search_auctions_page',
+         Auction.objects(start_time__lt=now).order_by('-start_time', '-id').limit(25)),
+        ('AuctionRepository.search_auctions_page(category)',
+         Auction.objects(category='Electronics').order_by('-start_time', '-id').limit(25)),
+        ('AuctionRepository.search_auctions(search_query, text)',
+         Auction.objects.search_text('sample').filter(category='Electronics').order_by('$text_score')),
+        ('AuctionRepository.search_auctions(search_query, regex)',
+         Auction.objects(item_title__icontains='sample')),
+        ('AuctionRepository.iter_search_results', Auction.objects.order_by('-start_time', '-id')),
+        ('AuctionRepository.get_auctions_ending_between', Auction.objects(
+            status='Active', end_time__gt=now, end_time__lte=now + timedelta(minutes=5)).order_by('end_time')),
+        ('AuctionRepository.close_auctions', Auction.objects(
+            id=sample_id, status='Active', end_time__lte=now)),
+        # BidRepository
+        ('BidRepository.get_bids_for_auction', Bid.objects(auction_id=sample_id).order_by('-bid_amount')),
+        ('BidRepository.get_bid_history_page', Bid.objects(auction_id=sample_id, bid_amount__lt=1.0)
+         .order_by('-bid_amount', '-id').only('bid_amount', 'created_at', 'bidder_id', 'bidder_name').limit(21)),
+        ('BidRepository.get_highest_bid', Bid.objects(auction_id=sample_id).order_by('-bid_amount').limit(1)),
+        ('BidRepository.get_bid_amount', Bid.objects(auction_id=sample_id)),
+        ('BidRepository.get_bid_id_by_bidder', Bid.objects(bidder_id=sample_id)),
+        ('BidRepository.get_user_bids', Bid.objects(bidder_id=sample_id).order_by('-created_at')),
+        # $match/$sort stage of the get_user_bid_page aggregation
+        ('BidRepository.get_user_bid_page', Bid.objects(bidder_id=sample_id, created_at__lt=now)
+         .order_by('-created_at', '-id').limit(21)),
+        # UserRepository
+        ('UserRepository.get_user_by_id', User.objects(id=sample_id)),
+        ('UserRepository.get_cached_user', User.objects(id=sample_id).exclude('password')),
+        ('UserRepository.get_usernames', User.objects(id__in=[sample_id]).only('username')),
+        ('UserRepository.update_user', User.objects(id=sample_id)),
+        ('UserRepository.update_user_status', User.objects(id=sample_id)),
+        ('UserRepository.find_by_username', User.objects(username='sample')),
+        ('UserRepository.find_by_email', User.objects(email='sample@example.com')),
+        ('UserRepository.get_active_users', User.objects(is_active=True)),
+        ('UserRepository.get_active_user_by_id', User.objects(id=sample_id, is_active=True)),
+        # ContactMessageRepository
+        ('ContactMessageRepository.get_all_contact_messages', ContactMessage.objects().all()),
+        ('ContactMessageRepository.get_contact_message_by_id', ContactMessage.objects(id=sample_id)),
+        ('ContactMessageRepository.delete_contact_message', ContactMessage.objects(id=sample_id)),
+    ]
+
+
+def find_collscans(explain: dict):
+    """Return every COLLSCAN stage found in the explain output's winning plan."""
+    planner = explain.get('queryPlanner', explain)
+    found = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            if node.get('stage') == 'COLLSCAN':
+                found.append(node)
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+
+    walk(planner.get('winningPlan', planner))
+    return found
+
+
+def ensure_indexes():
+    """Create every index declared in the models' meta."""
+    for model in (Auction, Bid, User, ContactMessage):
+        model.ensure_indexes()
@@ -0,0 +1,25 @@
+"""
+In-process counters and gauges, exposed as JSON at /metrics.
+Values are per worker process; aggregate across workers in the scraper.
+"""
+import threading
+from collections import defaultdict
+
+_lock = threading.Lock()
+_counters = defaultdict(int)
+_gauges = {}
+
+
+def incr(name: str, amount: int = 1):
+    with _lock:
+        _counters[name] += amount
+
+
+def set_gauge(name: str, value):
+    with _lock:
+        _gauges[name] = value
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {'counters': dict(_counters), 'gauges': dict(_gauges)}
@@ -0,0 +1,39 @@
+"""
+Keyset (cursor) pagination helpers.
+A cursor is the sort key of the last item on a page, e.g. (start_time, _id), serialized with
+bson's extended JSON and base64url-encoded so it survives a query string.
+"""
+import base64
+import binascii
+import json
+
+from bson import json_util
+
+DEFAULT_PAGE_SIZE = 24
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(*values) -> str:
+    raw = json_util.dumps(list(values)).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> list:
+    """Raises ValueError for anything that is not a cursor we issued."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json_util.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, TypeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(values, list):
+        raise ValueError("Invalid pagination cursor")
+    return values
+
+
+def parse_limit(raw, default: int = DEFAULT_PAGE_SIZE, maximum: int = MAX_PAGE_SIZE) -> int:
+    """Clamp a user-supplied page size to [1, maximum]."""
+    try:
+        limit = int(raw) if raw not in (None, '') else default
+    except (TypeError, ValueError):
+        raise ValueError("limit must be an integer")
+    return max(1, min(limit, maximum))
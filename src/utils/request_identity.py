@@ -0,0 +1,66 @@
+"""
+Request-scoped identity
+ - load_identity(): before_request hook; verifies/decodes the JWT once and stores the identity on flask.g
+ - current_identity(): the user id (str) of the request, or None
+ - current_user(): the User for that id, loaded at most once per request (via the user cache)
+ - user_for_identity(): the same memoized lookup by identity (Socket.IO handlers pass theirs)
+Static file requests are skipped entirely.
+"""
+import logging
+
+from bson import ObjectId
+from flask import g, request
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from src.repositories.user_repository import UserRepository
+
+logger = logging.getLogger(__name__)
+
+_UNSET = object()
+
+
+def _is_static_request() -> bool:
+    return request.endpoint == 'static' or request.path.startswith('/static/')
+
+
+def load_identity():
+    """Decode the request's JWT (if any) exactly once and keep the identity on g."""
+    if _is_static_request():
+        g.identity = None
+        return
+    try:
+        verify_jwt_in_request(optional=True)
+        g.identity = get_jwt_identity()
+    except Exception as e:
+        logger.error(f"JWT verification failed: {e}")
+        g.identity = None
+    logger.debug(f"JWT Identity: {g.identity}")
+
+
+def current_identity():
+    identity = g.get('identity', _UNSET)
+    if identity is _UNSET:
+        load_identity()
+        identity = g.identity
+    return identity
+
+
+def user_for_identity(identity):
+    """
+    The User (password excluded) for a JWT identity, or None, memoized on g.
+    The JWT user lookup loader calls this while verify_jwt_in_request is still running, before
+    load_identity() has set g.identity, so it must not go through current_identity().
+    """
+    users = g.setdefault('users_by_identity', {})
+    key = str(identity) if identity else None
+    if key not in users:
+        user = None
+        if key and ObjectId.is_valid(key):
+            user = UserRepository.get_cached_user(ObjectId(key))
+        users[key] = user
+    return users[key]
+
+
+def current_user():
+    """The authenticated User (password excluded), or None. Loaded lazily, once per request."""
+    return user_for_identity(current_identity())
@@ -0,0 +1,78 @@
+"""
+msgspec-backed serialization for HTTP responses and Socket.IO packets.
+ - json_response: encodes dicts / view Structs (src.models.views) straight to response bytes
+ - encode_json: the same encoding for one value (streamed responses encode element by element)
+ - MsgspecJSON: drop-in `json` module for Socket.IO / Engine.IO packets (SOCKETIO_SERIALIZER = 'json')
+ - MsgspecMsgPackPacket: msgpack Socket.IO packets (SOCKETIO_SERIALIZER = 'msgpack'); the
+   browser must then load socket.io-msgpack-parser (base.html does)
+"""
+import logging
+
+import msgspec
+from bson import ObjectId
+from flask import Response
+from socketio import packet
+
+logger = logging.getLogger(__name__)
+
+
+def _enc_hook(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise NotImplementedError(f"Cannot serialize {type(obj).__name__}")
+
+
+_json_encoder = msgspec.json.Encoder(enc_hook=_enc_hook)
+_json_decoder = msgspec.json.Decoder()
+_msgpack_encoder = msgspec.msgpack.Encoder(enc_hook=_enc_hook)
+_msgpack_decoder = msgspec.msgpack.Decoder()
+
+
+def encode_json(obj) -> bytes:
+    return _json_encoder.encode(obj)
+
+
+def json_response(obj, status: int = 200) -> Response:
+    """A JSON Response encoded in one pass (what jsonify(...), status would return)."""
+    return Response(_json_encoder.encode(obj), status=status, mimetype='application/json')
+
+
+class MsgspecJSON:
+    """The dumps/loads pair python-socketio and python-engineio accept as their `json` module."""
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        # kwargs (separators=...) are stdlib options; msgspec output is already compact
+        return _json_encoder.encode(obj).decode('utf-8')
+
+    @staticmethod
+    def loads(data, **kwargs):
+        try:
+            return _json_decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # Callers expect json.loads' ValueError on malformed packets
+            raise ValueError(str(e)) from e
+
+
+class MsgspecMsgPackPacket(packet.Packet):
+    """socketio.msgpack_packet.MsgPackPacket on msgspec (no separate msgpack dependency)."""
+    uses_binary_events = False
+
+    def encode(self):
+        return _msgpack_encoder.encode(self._to_dict())
+
+    def decode(self, encoded_packet):
+        decoded = _msgpack_decoder.decode(encoded_packet)
+        self.packet_type = decoded['type']
+        self.data = decoded.get('data')
+        self.id = decoded.get('id')
+        self.namespace = decoded['nsp']
+
+
+def socketio_serializer_options(serializer: str) -> dict:
+    """SocketIO(...) keyword arguments for SOCKETIO_SERIALIZER ('json' or 'msgpack')."""
+    if serializer == 'msgpack':
+        return {'serializer': MsgspecMsgPackPacket}
+    if serializer != 'json':
+        logger.warning(f"Unknown SOCKETIO_SERIALIZER {serializer!r}, using json")
+    return {'json': MsgspecJSON}
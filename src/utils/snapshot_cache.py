@@ -0,0 +1,238 @@
+"""
+Two-tier read-through cache of serialized snapshots.
+ - Tier 1: bounded in-process LRU with a short TTL (per worker)
+ - Tier 2: Redis, one key per entry with its own TTL (shared by all workers)
+ - invalidate() deletes from both tiers and publishes the keys on a Redis channel so every
+   worker evicts its LRU copy (see listen_for_invalidations)
+ - Read-through fills (begin_load() before the loader, fill_many() after) skip keys invalidated
+   while the loader ran: locally by invalidation sequence, in Redis by a short-lived tombstone
+   that invalidate() leaves behind, so a write racing a load can't leave the pre-write value
+   cached for the whole TTL
+ - Snapshots are stored as bytes and decoded on every read, so callers never share a
+   mutable object through the cache
+ - Redis errors degrade to a cache miss; hits/misses/errors are counted in src.utils.metrics
+"""
+import itertools
+import logging
+
+import bson
+from bson.codec_options import CodecOptions
+
+from src.utils import metrics
+from src.utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = 'cache:invalidate'
+_KEY_SEPARATOR = '\x1f'
+# Seconds a key stays unfillable in Redis after an invalidation; longer than any loader should run
+INVALIDATION_GRACE = 5
+
+# KEYS: value keys, then their tombstone keys; ARGV: ttl (s), values (same order as the value keys)
+_FILL_UNLESS_INVALIDATED = """
+local n = #ARGV - 1
+local written = 0
+for i = 1, n do
+    if redis.call('EXISTS', KEYS[n + i]) == 0 then
+        redis.call('SET', KEYS[i], ARGV[i + 1], 'EX', ARGV[1])
+        written = written + 1
+    end
+end
+return written
+"""
+
+# name -> SnapshotCache, so invalidation messages can be routed to the right LRU
+_registry = {}
+
+
+class SnapshotCache:
+    def __init__(self, name: str, ttl: int = 60, local_size: int = 1024, local_ttl: float = 5):
+        self.name = name
+        self.ttl = ttl
+        self._local = LRUCache(maxsize=local_size, ttl=local_ttl)
+        self._redis = None
+        self._fill_script = None
+        # Local invalidation sequence: key -> sequence number of its last invalidation
+        self._sequence = itertools.count(1)
+        self._invalidated = LRUCache(maxsize=16 * local_size, ttl=INVALIDATION_GRACE)
+        _registry[name] = self
+
+    def configure(self, redis_client=None, ttl: int = None, local_size: int = None, local_ttl: float = None):
+        if redis_client is not None:
+            self._redis = redis_client
+            self._fill_script = redis_client.register_script(_FILL_UNLESS_INVALIDATED)
+        if ttl is not None:
+            self.ttl = ttl
+        if local_size is not None or local_ttl is not None:
+            self._local = LRUCache(maxsize=local_size or self._local.maxsize,
+                                   ttl=self._local.ttl if local_ttl is None else local_ttl)
+
+    def _redis_key(self, key) -> str:
+        return f"{self.name}:{key}"
+
+    def _tombstone_key(self, key) -> str:
+        return f"{self.name}:{key}:invalidated"
+
+    def get_many(self, keys) -> dict:
+        """key -> snapshot bytes for every key found in either tier."""
+        found = {}
+        remote = []
+        for key in keys:
+            value = self._local.get(key)
+            if value is not None:
+                found[key] = value
+            else:
+                remote.append(key)
+        metrics.incr(f"cache.{self.name}.local_hit", len(found))
+
+        if remote and self._redis is not None:
+            try:
+                values = self._redis.mget([self._redis_key(k) for k in remote])
+            except Exception as e:
+                logger.debug(f"Cache {self.name} Redis read failed: {e}")
+                metrics.incr(f"cache.{self.name}.error")
+                values = [None] * len(remote)
+            hits = 0
+            for key, value in zip(remote, values):
+                if value is not None:
+                    found[key] = value
+                    self._local.set(key, value)
+                    hits += 1
+            metrics.incr(f"cache.{self.name}.redis_hit", hits)
+        metrics.incr(f"cache.{self.name}.miss", len(keys) - len(found))
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items: dict, ttl: int = None):
+        ttl = ttl or self.ttl
+        for key, value in items.items():
+            self._local.set(key, value)
+        if not items or self._redis is None:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.set(self._redis_key(key), value, ex=ttl)
+            pipe.execute()
+        except Exception as e:
+            logger.debug(f"Cache {self.name} Redis write failed: {e}")
+            metrics.incr(f"cache.{self.name}.error")
+
+    def set(self, key, value: bytes, ttl: int = None):
+        self.set_many({key: value}, ttl=ttl)
+
+    def _invalidated_since(self, key, token: int) -> bool:
+        return (self._invalidated.get(key) or 0) > token
+
+    def begin_load(self) -> int:
+        """Token to pass to fill_many() for values about to be read from the source of truth."""
+        return next(self._sequence)
+
+    def fill_many(self, items: dict, token: int, ttl: int = None):
+        """
+        set_many for read-through results loaded after begin_load() returned token: keys
+        invalidated since then (by this worker, or by any worker in Redis) are not written.
+        """
+        items = {key: value for key, value in items.items() if not self._invalidated_since(key, token)}
+        for key, value in items.items():
+            self._local.set(key, value)
+            if self._invalidated_since(key, token):
+                # Invalidated between the check and the write
+                self._local.delete(key)
+        if not items or self._redis is None:
+            return
+        keys = list(items)
+        try:
+            self._fill_script(keys=[self._redis_key(k) for k in keys] + [self._tombstone_key(k) for k in keys],
+                              args=[ttl or self.ttl, *items.values()])
+        except Exception as e:
+            logger.debug(f"Cache {self.name} Redis fill failed: {e}")
+            metrics.incr(f"cache.{self.name}.error")
+
+    def fill(self, key, value: bytes, token: int, ttl: int = None):
+        self.fill_many({key: value}, token, ttl=ttl)
+
+    def invalidate(self, *keys):
+        keys = [str(k) for k in keys if k is not None]
+        if not keys:
+            return
+        self.evict_local(*keys)
+        metrics.incr(f"cache.{self.name}.invalidation", len(keys))
+        if self._redis is None:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            pipe.delete(*[self._redis_key(k) for k in keys])
+            for key in keys:
+                pipe.set(self._tombstone_key(key), 1, ex=INVALIDATION_GRACE)
+            pipe.publish(INVALIDATION_CHANNEL, _KEY_SEPARATOR.join([self.name, *keys]))
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"Cache {self.name} invalidation failed for {keys}: {e}")
+            metrics.incr(f"cache.{self.name}.error")
+
+    def evict_local(self, *keys):
+        sequence = next(self._sequence)
+        for key in keys:
+            self._invalidated.set(key, sequence)
+            self._local.delete(key)
+
+
+class DocumentCache(SnapshotCache):
+    """SnapshotCache of mongoengine documents, keyed by str(id) and stored as BSON."""
+    _codec_options = CodecOptions(tz_aware=False)
+
+    def __init__(self, model, name: str, **kwargs):
+        super().__init__(name, **kwargs)
+        self.model = model
+
+    def dump(self, document) -> bytes:
+        return bson.encode(document.to_mongo())
+
+    def load(self, snapshot: bytes):
+        return self.model._from_son(bson.decode(snapshot, codec_options=self._codec_options))
+
+    def get_document(self, document_id, loader):
+        """Cached document, or loader() on a miss (None results are not cached)."""
+        key = str(document_id)
+        snapshot = self.get(key)
+        if snapshot is not None:
+            return self.load(snapshot)
+        token = self.begin_load()
+        document = loader()
+        if document is not None:
+            self.fill(key, self.dump(document), token)
+        return document
+
+    def get_documents(self, document_ids, loader_many) -> list:
+        """
+        Documents in the order of document_ids; misses are loaded together with
+        loader_many(missing_ids) -> iterable of documents. Missing documents are skipped.
+        """
+        keys = [str(i) for i in document_ids]
+        snapshots = self.get_many(keys)
+        documents = {key: self.load(snapshot) for key, snapshot in snapshots.items()}
+        missing = [key for key in keys if key not in documents]
+        if missing:
+            token = self.begin_load()
+            loaded = {str(doc.id): doc for doc in loader_many(missing)}
+            self.fill_many({key: self.dump(doc) for key, doc in loaded.items()}, token)
+            documents.update(loaded)
+        return [documents[key] for key in keys if key in documents]
+
+
+def listen_for_invalidations(redis_client):
+    """Evict local LRU entries invalidated by any worker. Runs forever; start as a background task."""
+    pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(INVALIDATION_CHANNEL)
+    for message in pubsub.listen():
+        try:
+            data = message['data']
+            name, *keys = (data.decode() if isinstance(data, bytes) else data).split(_KEY_SEPARATOR)
+            cache = _registry.get(name)
+            if cache is not None:
+                cache.evict_local(*keys)
+        except Exception as e:
+            logger.warning(f"Bad cache invalidation message {message}: {e}")
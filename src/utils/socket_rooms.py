@@ -0,0 +1,11 @@
+"""
+Socket.IO room names shared by the socket handlers and anything that broadcasts bid events.
+ - auction_room(auction_id): watchers of one auction detail page
+ - TICKER_ROOM: list pages that only want lightweight price updates
+"""
+
+TICKER_ROOM = 'auction_ticker'
+
+
+def auction_room(auction_id):
+    return f"auction:{auction_id}"
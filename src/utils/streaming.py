@@ -0,0 +1,44 @@
+"""
+Helpers for streamed (chunked) responses.
+ - batched: groups an iterator into lists without materializing it
+ - coalesce: joins many small chunks (Jinja's stream_template yields one per tag) into
+   writes of about STREAM_CHUNK_SIZE bytes
+ - json_array_stream: a JSON object whose list field is encoded one element at a time
+"""
+from itertools import islice
+from typing import Iterable, Iterator
+
+from src.utils.serialization import encode_json
+
+STREAM_CHUNK_SIZE = 16 * 1024
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def coalesce(chunks: Iterable, size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+        if len(buffer) >= size:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def json_array_stream(key: str, items: Iterable, **fields) -> Iterator[bytes]:
+    """
+    '{"<key>": [...], <fields>}' with the array encoded as items are produced; the opening
+    bracket is sent before the first item is read, so time-to-first-byte doesn't depend on it.
+    """
+    yield b'{' + encode_json(key) + b':['
+    for index, item in enumerate(items):
+        yield (b',' if index else b'') + encode_json(item)
+    yield b']'
+    for name, value in fields.items():
+        yield b',' + encode_json(name) + b':' + encode_json(value)
+    yield b'}'
@@ -73,12 +73,119 @@ document.addEventListener('DOMContentLoaded', function() {
 
 
     const auctionIdInput = document.getElementById('auction-id');
-    const auctionId = auctionIdInput ? auctionIdInput.value : null;
+    const detailContainer = document.querySelector('.auction-detail-container');
+    const auctionId = auctionIdInput ? auctionIdInput.value
+        : (detailContainer ? detailContainer.dataset.auctionId : null);
+
+    // ========== Bid history infinite scroll ==========
+    // The detail page renders only the top bids; lower ones are fetched a page at a time
+    const bidHistoryMore = document.querySelector('.bid-history-more');
+    if (bidHistoryList && bidHistoryMore && 'IntersectionObserver' in window) {
+        let loadingBids = false;
+        const observer = new IntersectionObserver(entries => {
+            if (!entries.some(entry => entry.isIntersecting) || loadingBids) return;
+            const cursor = bidHistoryMore.dataset.nextCursor;
+            if (!cursor) return;
+            loadingBids = true;
+            fetch(`${bidHistoryMore.dataset.bidsUrl}?before=${encodeURIComponent(cursor)}`, {
+                headers: { 'Accept': 'application/json' }
+            })
+                .then(response => response.json())
+                .then(data => {
+                    data.bids.forEach(bid => {
+                        const bidItem = document.createElement('div');
+                        bidItem.className = 'bid-item';
+                        bidItem.innerHTML = `
+                            <span class="bidder"></span>
+                            <span class="amount">$${bid.bid_amount.toFixed(2)}</span>
+                            <span class="time">${new Date(bid.timestamp).toLocaleString()}</span>
+                        `;
+                        bidItem.querySelector('.bidder').textContent =
+                            (typeof currentUserId !== 'undefined' && currentUserId && bid.bidder_id === currentUserId)
+                                ? 'You' : bid.bidder_name;
+                        bidHistoryList.appendChild(bidItem);
+                    });
+                    if (data.next_cursor) {
+                        bidHistoryMore.dataset.nextCursor = data.next_cursor;
+                    } else {
+                        observer.disconnect();
+                        bidHistoryMore.remove();
+                    }
+                })
+                .catch(error => console.error("[ERROR] Loading bid history failed:", error))
+                .finally(() => { loadingBids = false; });
+        });
+        observer.observe(bidHistoryMore);
+    }
+
+    // ========== Socket.IO rooms ==========
+    // Bid events are only sent to watchers of an auction, so join its room on the detail page.
+    // List pages with auction cards join the lightweight price ticker instead.
+    // Rooms are lost when the socket drops, so (re)join on every connect.
+    const tickerPrices = document.querySelectorAll('[data-ticker-auction-id]');
+
+    // Last bid event applied on the detail page (seq from the auction's bid event log on the server).
+    // While a resume is in flight, live bid_updates are held back and applied after the catch-up.
+    let lastSeq = (detailContainer && detailContainer.dataset.eventSeq)
+        ? parseInt(detailContainer.dataset.eventSeq, 10) : null;
+    let resuming = false;
+    let heldEvents = [];
+
+    function joinRooms() {
+        if (auctionId) {
+            // Joins the auction room and replays any bids missed since render / the last disconnect
+            resuming = true;
+            socket.emit('resume', { auction_id: auctionId, last_seq: lastSeq });
+        } else if (tickerPrices.length > 0) {
+            socket.emit('join_ticker');
+        }
+    }
+    socket.on('connect', joinRooms);
+    if (socket.connected) joinRooms();
+
+    window.addEventListener('beforeunload', () => {
+        if (auctionId) socket.emit('leave_auction', { auction_id: auctionId });
+    });
+
+    // Sent by the auction close scheduler when end_time is reached
+    socket.on('auction_ended', function(data) {
+        console.log("[SOCKET:auction_ended] Received:", data);
+        if (auctionId && data.auction_id === auctionId) {
+            const statusBadge = document.querySelector('.status-badge');
+            if (statusBadge) {
+                statusBadge.textContent = 'Completed';
+                statusBadge.className = 'status-badge completed';
+            }
+            const form = document.getElementById('bid-form');
+            if (form) form.style.display = 'none';
+        }
+        document.querySelectorAll(`[data-ticker-auction-id="${data.auction_id}"]`).forEach(el => {
+            el.closest('.auction-item')?.classList.add('auction-ended');
+        });
+    });
+
+    if (!auctionId && tickerPrices.length > 0) {
+        socket.on('update_price', function(data) {
+            document.querySelectorAll(`[data-ticker-auction-id="${data.auction_id}"]`).forEach(el => {
+                // Updates may arrive out of acceptance order: never lower the price
+                const shown = parseFloat(el.textContent.replace(/[^0-9.]/g, ''));
+                if (isNaN(shown) || data.current_price >= shown) el.textContent = `$${data.current_price}`;
+            });
+        });
+    }
 
     // Only run bidding logic if on auction detail page
     if (bidForm) {
         console.log("[INIT] Bid form found, attaching event listeners...");
 
+        // One idempotency key per intended bid: resubmitting the same amount (double click,
+        // retry after a dropped connection) can't place it twice
+        let pendingBid = null;
+        function newIdempotencyKey() {
+            return (window.crypto && crypto.randomUUID) ? crypto.randomUUID()
+                : Date.now().toString(36) + Math.random().toString(36).slice(2);
+        }
+
         // Handle bid form submission
         bidForm.addEventListener('submit', function(e) {
             e.preventDefault();
@@ -97,68 +204,136 @@ document.addEventListener('DOMContentLoaded', function() {
 
             console.log("[EMIT] Placing bid:", { auction_id: auctionId, bid_amount: bidAmount });
 
+            if (!pendingBid || pendingBid.amount !== bidAmount) {
+                pendingBid = { amount: bidAmount, key: newIdempotencyKey() };
+            }
+
             // Emit the bid to the server
             socket.emit('place_bid', {
                 auction_id: auctionId,
-                bid_amount: bidAmount
+                bid_amount: bidAmount,
+                idempotency_key: pendingBid.key
             });
         });
 
-        // Handle new bid event from server
-        socket.on('new_bid', function(data) {
-            console.log("[SOCKET:new_bid] Received:", data);
-
-            if (data.auction_id === auctionId) {
-                console.log("[UPDATE] Updating UI with new bid...");
-
-                // Update current price display
-                currentPriceElement.textContent = data.bid_amount.toFixed(2);
-
-                // Add bid to history
-                const bidItem = document.createElement('div');
-                bidItem.className = 'bid-item';
-                bidItem.innerHTML = `
-                    <span class="bidder">${data.bidder_name}</span>
-                    <span class="amount">$${data.bid_amount.toFixed(2)}</span>
-                    <span class="time">${new Date(data.timestamp).toLocaleTimeString()}</span>
-                `;
-
-                // Highlight if it's the current user's bid
-                if (currentUserId && data.bidder_id === currentUserId) {
-                    // Remove highlight from all previous bids
-                    document.querySelectorAll('.highest-bid').forEach(el => {
-                        el.classList.remove('highest-bid');
-                    });
+        // Handle coalesced bid updates from server (latest bid wins, skipped_bids were merged)
+        socket.on('bid_update', function(data) {
+            console.log("[SOCKET:bid_update] Received:", data);
+            if (data.auction_id !== auctionId) return;
+            if (resuming) {
+                heldEvents.push(data);
+                return;
+            }
+            applyBidEvent(data);
+        });
 
+        function applyBidEvent(data) {
+            // Events up to lastSeq are already on the page (replays and resume races)
+            if (data.seq != null && lastSeq != null && data.seq <= lastSeq) return;
+            // With seqs the gap is exact; otherwise count the bids coalesced into this update
+            const accepted = (data.seq != null && lastSeq != null) ? data.seq - lastSeq : 1 + (data.skipped_bids || 0);
+            if (data.seq != null) lastSeq = data.seq;
 
-                    // Add highlight to the new highest bid
-                    bidItem.classList.add('highest-bid');
-                    console.log("[INFO] Current user placed this bid.");
-                }
+            console.log("[UPDATE] Updating UI with new bid...");
 
-                // ✅ Changed from prepend() to insert at top of list safely
-                if (bidHistoryList) {
-                    bidHistoryList.insertBefore(bidItem, bidHistoryList.firstChild);
-                }  //bidHistoryList.prepend(bidItem);
+            // Seqs are assigned after the bid is committed, so two concurrent bids can arrive in the
+            // opposite order to their acceptance: the price shown never goes down
+            const shownPrice = parseFloat(currentPriceElement.textContent);
+            const outbid = !isNaN(shownPrice) && data.current_price < shownPrice;
+            const currentPrice = outbid ? shownPrice : data.current_price;
 
-                // Update minimum bid amount
-                bidAmountInput.min = (data.bid_amount + 0.01).toFixed(2);
+            // Update current price display
+            currentPriceElement.textContent = currentPrice.toFixed(2);
 
-                // Reset bid input field after successful bid
-                bidAmountInput.value = "";
-                console.log("[INFO] Bid input reset.");
+            // Every accepted bid counts, including the ones coalesced into this update
+            const bidCountElement = document.getElementById('bid-count');
+            if (bidCountElement) {
+                bidCountElement.textContent = (parseInt(bidCountElement.textContent, 10) || 0) + accepted;
             }
-        });
 
-        // Handle price updates
-        socket.on('update_price', function(data) {
-            console.log("[SOCKET:update_price] Received:", data);
+            // Add bid to history
+            const bidItem = document.createElement('div');
+            bidItem.className = 'bid-item';
+            bidItem.innerHTML = `
+                <span class="bidder"></span>
+                <span class="amount">$${data.bid_amount.toFixed(2)}</span>
+                <span class="time">${new Date(data.timestamp).toLocaleTimeString()}</span>
+            `;
+            bidItem.querySelector('.bidder').textContent = data.bidder_name;
+            if (data.skipped_bids > 0) {
+                console.log(`[INFO] ${data.skipped_bids} intermediate bid(s) coalesced into this update`);
+            }
+
+            // Highlight if it's the current user's bid
+            if (currentUserId && data.bidder_id === currentUserId && !outbid) {
+                // Remove highlight from all previous bids
+                document.querySelectorAll('.highest-bid').forEach(el => {
+                    el.classList.remove('highest-bid');
+                });
 
-            if (data.auction_id === auctionId) {
-                currentPriceElement.textContent = data.current_price.toFixed(2);
-                bidAmountInput.min = (data.current_price + 0.01).toFixed(2);
-                console.log("[UPDATE] Price updated in UI");
+
+                // Add highlight to the new highest bid
+                bidItem.classList.add('highest-bid');
+                console.log("[INFO] Current user placed this bid.");
             }
+
+            // ✅ Changed from prepend() to insert at top of list safely
+            if (bidHistoryList) {
+                bidHistoryList.insertBefore(bidItem, bidHistoryList.firstChild);
+            }  //bidHistoryList.prepend(bidItem);
+
+            // Update minimum bid amount
+            bidAmountInput.min = (currentPrice + 0.01).toFixed(2);
+
+            // Reset bid input field after successful bid
+            bidAmountInput.value = "";
+            console.log("[INFO] Bid input reset.");
+        }
+
+        function finishResume() {
+            resuming = false;
+            const held = heldEvents;
+            heldEvents = [];
+            held.forEach(applyBidEvent);
+        }
+
+        // Bids missed while disconnected, oldest first
+        socket.on('bid_replay', function(data) {
+            console.log("[SOCKET:bid_replay] Received:", data.events.length, "event(s)");
+            if (data.auction_id !== auctionId) return;
+            data.events.forEach(applyBidEvent);
+            finishResume();
+        });
+
+        // Too far behind for a replay: the server sends the current state instead
+        socket.on('bid_snapshot', function(data) {
+            console.log("[SOCKET:bid_snapshot] Received:", data);
+            if (data.auction_id !== auctionId) return;
+            lastSeq = data.seq;
+            currentPriceElement.textContent = data.current_price.toFixed(2);
+            bidAmountInput.min = (data.current_price + 0.01).toFixed(2);
+            const bidCountElement = document.getElementById('bid-count');
+            if (bidCountElement) bidCountElement.textContent = data.bid_count;
+            if (bidHistoryList) {
+                bidHistoryList.innerHTML = '';
+                data.bids.forEach((bid, index) => {
+                    const bidItem = document.createElement('div');
+                    bidItem.className = index === 0 ? 'bid-item highest-bid' : 'bid-item';
+                    bidItem.innerHTML = `
+                        <span class="bidder"></span>
+                        <span class="amount">$${bid.bid_amount.toFixed(2)}</span>
+                        <span class="time">${new Date(bid.timestamp).toLocaleTimeString()}</span>
+                    `;
+                    // Usernames are user input: never parse them as HTML
+                    bidItem.querySelector('.bidder').textContent =
+                        (currentUserId && bid.bidder_id === currentUserId) ? 'You' : bid.bidder_name;
+                    bidHistoryList.appendChild(bidItem);
+                });
+            }
+            // The list now holds the top bids again; infinite scroll continues below them
+            if (bidHistoryMore) bidHistoryMore.dataset.nextCursor = data.next_cursor || '';
+            if (data.status !== 'Active') bidForm.style.display = 'none';
+            finishResume();
         });
 
         // Handle bid errors
@@ -166,6 +341,12 @@ document.addEventListener('DOMContentLoaded', function() {
             console.error("[SOCKET:bid_error] Received:", data);
             alert(data.message);
         });
+
+        // Too many bids in a short time; the server drops them until the bucket refills
+        socket.on('rate_limited', function(data) {
+            console.warn("[SOCKET:rate_limited] Received:", data);
+            alert(data.message + " (try again in " + data.retry_after + "s)");
+        });
     }
 
     // Countdown timer for auction end
@@ -42,4 +42,624 @@ def test_create_and_list_auctions(client):
     assert res.status_code == 200
     data = res.get_json()
     print("Auction list response:", data)
-    assert any(auction["item_title"] == "Test Auction" for auction in data)
\ No newline at end of file
+    assert any(auction["item_title"] == "Test Auction" for auction in data["auctions"])
+    assert data["next_cursor"] is None
+
+
+def test_list_auctions_cursor_pagination(client):
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+
+    seller = UserRepository.create_user("pager", "pager@example.com", "pass123")
+    base = datetime.utcnow()
+    for i in range(5):
+        auction = AuctionRepository.create_auction(
+            item_title=f"Paged Auction {i}",
+            item_description="Pagination test",
+            starting_bid=10.0,
+            end_time=base + timedelta(days=1),
+            item_condition="New",
+            seller=seller,
+            images=["http://example.com/page.png"]
+        )
+        auction.start_time = base - timedelta(minutes=i)
+        auction.save()
+
+    titles, cursor = [], None
+    while True:
+        query = "/auction/?limit=2" + (f"&after={cursor}" if cursor else "")
+        res = client.get(query, headers={"Accept": "application/json"})
+        assert res.status_code == 200
+        page = res.get_json()
+        assert len(page["auctions"]) <= 2
+        titles.extend(auction["item_title"] for auction in page["auctions"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    # Newest first, every auction exactly once
+    assert titles == [f"Paged Auction {i}" for i in range(5)]
+
+    res = client.get("/auction/?after=not-a-cursor", headers={"Accept": "application/json"})
+    assert res.status_code == 400
+
+
+def test_text_search_pages_by_relevance_rank(app):
+    from unittest import mock
+
+    import pytest
+    from mongoengine.queryset import QuerySet
+
+    from src.models.auction import Auction
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.utils.pagination import decode_cursor, encode_cursor
+
+    seller = UserRepository.create_user("searcher", "searcher@example.com", "pass123")
+    auctions = [AuctionRepository.create_auction(
+        item_title=f"Vintage Lamp {i}" if i < 5 else f"Modern Chair {i}",
+        item_description="Text search test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/search.png"]
+    ) for i in range(6)]
+    # mongomock has no $text: bid_count stands in for the relevance score
+    relevance = [3, 5, 1, 4, 2, 9]
+    for auction, score in zip(auctions, relevance):
+        Auction.objects(id=auction.id).update(set__bid_count=score)
+
+    searches, orderings = [], []
+    real_order_by = QuerySet.order_by
+
+    def search_text(self, text, language=None):
+        searches.append(text)
+        return self.filter(item_title__icontains=text)
+
+    def order_by(self, *keys, **kwargs):
+        if keys and keys[0] == '$text_score':
+            orderings.append(keys)
+            keys = ('-bid_count',) + keys[1:]
+        return real_order_by(self, *keys, **kwargs)
+
+    original_backend = app.config.get("AUCTION_SEARCH_BACKEND")
+    app.config["AUCTION_SEARCH_BACKEND"] = "text"
+    try:
+        with app.app_context(), mock.patch.object(QuerySet, "search_text", search_text), \
+                mock.patch.object(QuerySet, "order_by", order_by):
+            first, cursor = AuctionRepository.search_auctions_page(search_query="lamp", limit=3)
+            assert decode_cursor(cursor) == ["rank", 3]
+            second, last_cursor = AuctionRepository.search_auctions_page(search_query="lamp", limit=3, after=cursor)
+            assert last_cursor is None
+            # A browsing (start_time, id) cursor is not a rank cursor
+            browse_cursor = encode_cursor(datetime.utcnow(), auctions[0].id)
+            with pytest.raises(ValueError):
+                AuctionRepository.search_auctions_page(search_query="lamp", after=browse_cursor)
+    finally:
+        app.config["AUCTION_SEARCH_BACKEND"] = original_backend
+
+    assert searches == ["lamp"] * 3
+    assert orderings == [("$text_score", "-id")] * 2
+    # Most relevant first, ranks continuing across pages; the non-matching auction never shows up
+    assert [a.id for a in first + second] == [auctions[i].id for i in (1, 3, 0, 4, 2)]
+
+
+def test_auction_cache_invalidated_on_writes(app):
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.utils import metrics
+
+    seller = UserRepository.create_user("cached", "cached@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Cached Auction",
+        item_description="Cache test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/cache.png"]
+    )
+
+    AuctionRepository.get_auction_by_id(auction.id)
+    hits = metrics.snapshot()["counters"].get("cache.auction.local_hit", 0)
+    cached = AuctionRepository.get_auction_by_id(auction.id)
+    assert metrics.snapshot()["counters"]["cache.auction.local_hit"] == hits + 1
+    assert cached.item_title == "Cached Auction"
+
+    # Bid acceptance and edits are visible on the next read
+    assert AuctionRepository.accept_bid(auction.id, 25.0) is not None
+    assert AuctionRepository.get_auction_by_id(auction.id).current_bid == 25.0
+    AuctionRepository.update_auction(auction.id, item_title="Renamed")
+    assert AuctionRepository.get_auction_by_id(auction.id).item_title == "Renamed"
+
+    assert [a.id for a in AuctionRepository.get_featured_auctions()] == [auction.id]
+    AuctionRepository.close_auction(auction.id)
+    assert AuctionRepository.get_auction_by_id(auction.id).status == "Completed"
+    assert AuctionRepository.get_featured_auctions() == []
+
+    AuctionRepository.delete_auction(auction.id)
+    assert AuctionRepository.get_auction_by_id(auction.id) is None
+
+
+def test_cache_fill_skips_keys_invalidated_during_load(app):
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from src.models.auction import Auction
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.utils.snapshot_cache import DocumentCache
+
+    seller = UserRepository.create_user("racing", "racing@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Racing Auction",
+        item_description="Read-through race",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/race.png"]
+    )
+    key = str(auction.id)
+
+    # Two workers sharing one Redis
+    redis_client = fakeredis.FakeRedis()
+    worker, other_worker = DocumentCache(Auction, "race"), DocumentCache(Auction, "race")
+    worker.configure(redis_client)
+    other_worker.configure(redis_client)
+
+    def load_then_bid(invalidating_cache):
+        # Read before the bid, which commits and invalidates before the loader returns
+        stale = Auction.objects.get(id=auction.id)
+        Auction.objects(id=auction.id).update(set__current_bid=50.0)
+        invalidating_cache.invalidate(key)
+        return stale
+
+    # Bid on this worker: neither tier keeps the pre-bid snapshot
+    assert worker.get_document(key, lambda: load_then_bid(worker)).current_bid == 10.0
+    assert worker.get(key) is None
+    assert redis_client.get(f"race:{key}") is None
+
+    # Bid on another worker: its tombstone keeps the pre-bid snapshot out of Redis
+    Auction.objects(id=auction.id).update(set__current_bid=10.0)
+    worker.get_documents([key], lambda missing: [load_then_bid(other_worker)])
+    assert redis_client.get(f"race:{key}") is None
+    assert other_worker.get(key) is None
+
+    # Loads that don't race a write fill both tiers as before
+    redis_client.delete(f"race:{key}:invalidated")
+    assert other_worker.get_document(key, lambda: Auction.objects.get(id=auction.id)).current_bid == 50.0
+    assert worker.load(redis_client.get(f"race:{key}")).current_bid == 50.0
+
+
+def test_bid_history_keyset_pages(client):
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.bid_repository import BidRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.bid_service import BidService
+
+    seller = UserRepository.create_user("history_seller", "history_seller@example.com", "pass123")
+    alice = UserRepository.create_user("history_alice", "history_alice@example.com", "pass123")
+    bob = UserRepository.create_user("history_bob", "history_bob@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="History Auction",
+        item_description="Bid history test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/history.png"]
+    )
+    # A bid stored before bidder_name was denormalized
+    BidRepository.place_bid(auction.id, bob.id, 11.0)
+    for amount, bidder in ((20, alice), (30, bob), (40, alice), (50, bob)):
+        BidService.place_bid(str(auction.id), bidder.id, amount, bidder_name=bidder.username)
+
+    pages, cursor = [], None
+    while True:
+        res = client.get(f"/auction/{auction.id}/bids", query_string={"limit": 2, "before": cursor or ""})
+        assert res.status_code == 200
+        data = res.get_json()
+        pages.append([(bid["bid_amount"], bid["bidder_name"]) for bid in data["bids"]])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    assert pages == [
+        [(50.0, "history_bob"), (40.0, "history_alice")],
+        [(30.0, "history_bob"), (20.0, "history_alice")],
+        [(11.0, "history_bob")],
+    ]
+    assert set(client.get(f"/auction/{auction.id}/bids").get_json()["bids"][0]) == {
+        "bid_amount", "bidder_id", "bidder_name", "timestamp"
+    }
+
+    assert client.get(f"/auction/{auction.id}/bids", query_string={"before": "not-a-cursor"}).status_code == 400
+    assert client.get("/auction/not-an-id/bids").status_code == 404
+
+
+def test_auction_summaries_are_projected_and_kept_fresh(client):
+    from src.models.auction import Auction
+    from src.models.auction_summary import AuctionSummary
+    from src.repositories.user_repository import UserRepository
+    from src.repositories.auction_repository import AuctionRepository
+    from src.services.auction_service import AuctionService
+    from src.services.bid_service import BidService
+
+    seller = UserRepository.create_user("summary_seller", "summary_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("summary_bidder", "summary_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Summary Auction",
+        item_description="word " * 100,
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/first.png", "http://example.com/second.png"]
+    )
+
+    [summary] = AuctionService.get_featured_summaries(limit=6)
+    assert isinstance(summary, AuctionSummary)
+    assert not hasattr(summary, "__dict__")
+    assert summary.image_url == "http://example.com/first.png"
+    assert summary.seller_name == "summary_seller"
+    assert len(summary.description) <= 150 and summary.description.endswith("...")
+    assert "item_description" not in AuctionSummary.FIELDS
+
+    # A bid invalidates the cached summary
+    BidService.place_bid(str(auction.id), bidder.id, 25.0)
+    [summary] = AuctionService.get_featured_summaries(limit=6)
+    assert summary.price == 25.0
+    assert summary.to_summary_dict()["current_bid"] == 25.0
+
+    page, next_cursor = AuctionService.search_summaries_page(limit=10)
+    assert [s.item_title for s in page] == ["Summary Auction"] and next_cursor is None
+    assert page[0].to_summary_dict() == summary.to_summary_dict()
+
+    # The teaser is rewritten with the description, and backfilled for auctions that predate it
+    AuctionRepository.update_auction(auction.id, item_description="Short and sweet")
+    [summary] = AuctionService.get_featured_summaries(limit=6)
+    assert summary.description == "Short and sweet"
+
+    Auction.objects(id=auction.id).update_one(unset__description_teaser=True)
+    result = client.application.test_cli_runner().invoke(args=["backfill-description-teasers"])
+    assert result.exit_code == 0, result.output
+    assert "1 auctions updated" in result.output
+    assert Auction.objects.get(id=auction.id).description_teaser == "Short and sweet"
+
+
+def test_msgspec_views_match_to_dict(client):
+    import json
+    from socketio.packet import EVENT
+    from src.models.views import AuctionView
+    from src.repositories.user_repository import UserRepository
+    from src.repositories.auction_repository import AuctionRepository
+    from src.services.bid_service import BidService
+    from src.utils.serialization import MsgspecJSON, MsgspecMsgPackPacket, json_response
+
+    seller = UserRepository.create_user("view_seller", "view_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("view_bidder", "view_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="View Auction",
+        item_description="Encoded by msgspec",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/view.png"]
+    )
+    BidService.place_bid(str(auction.id), bidder.id, 15.0, bidder_name="view_bidder")
+    auction = AuctionRepository.get_auction_by_id(auction.id)
+
+    # Same JSON as the to_dict the views replace
+    with client.application.app_context():
+        assert json.loads(json_response(AuctionView.from_document(auction)).get_data()) == auction.to_dict()
+
+    response = client.get("/auction/", headers={"Accept": "application/json"})
+    assert response.status_code == 200 and response.mimetype == "application/json"
+    [listed] = response.get_json()["auctions"]
+    assert listed == auction.to_dict()
+    assert listed["highest_bidder"] == {"id": str(bidder.id), "username": "view_bidder"}
+
+    bids = client.get(f"/auction/{auction.id}/bids").get_json()["bids"]
+    assert bids[0]["bidder_name"] == "view_bidder" and bids[0]["bid_amount"] == 15.0
+
+    # Socket.IO serializers round-trip bid payloads
+    payload = {"auction_id": str(auction.id), "current_price": 15.0, "bidder_id": bidder.id}
+    assert MsgspecJSON.loads(MsgspecJSON.dumps(payload))["bidder_id"] == str(bidder.id)
+    packet = MsgspecMsgPackPacket(EVENT, data=["update_price", payload], namespace="/")
+    decoded = MsgspecMsgPackPacket(encoded_packet=packet.encode())
+    assert decoded.data == ["update_price", dict(payload, bidder_id=str(bidder.id))]
+
+
+def test_streamed_listing_sends_every_auction(client):
+    from src.repositories.user_repository import UserRepository
+    from src.repositories.auction_repository import AuctionRepository
+
+    seller = UserRepository.create_user("stream_seller", "stream_seller@example.com", "pass123")
+    for i in range(5):
+        AuctionRepository.create_auction(
+            item_title=f"Streamed Auction {i}",
+            item_description="Sent in batches",
+            starting_bid=10.0,
+            end_time=datetime.utcnow() + timedelta(days=1),
+            item_condition="New",
+            seller=seller,
+            images=["http://example.com/stream.png"]
+        )
+    client.application.config["AUCTION_STREAM_BATCH_SIZE"] = 2
+
+    response = client.get("/auction/", query_string={"stream": "1"}, headers={"Accept": "application/json"})
+    assert response.status_code == 200 and response.is_streamed
+    body = response.get_json()
+    # Newest first, like the paginated listing, with no cursor: everything is in one response
+    assert [a["item_title"] for a in body["auctions"]] == [f"Streamed Auction {i}" for i in reversed(range(5))]
+    assert body["next_cursor"] is None
+    assert body["auctions"][0]["seller"] == str(seller.id)
+
+    empty = client.get("/auction/", query_string={"stream": "1", "search": "no such thing"},
+                       headers={"Accept": "application/json"})
+    assert empty.get_json() == {"auctions": [], "next_cursor": None}
+
+
+def test_conditional_get_answers_304_before_querying_mongo(app):
+    from unittest import mock
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.auction_service import AuctionService
+    from src.services.bid_service import BidService
+
+    original_redis = app.extensions.get("redis")
+    app.extensions["redis"] = fakeredis.FakeRedis()
+    try:
+        client = app.test_client()
+        json_headers = {"Accept": "application/json"}
+        seller = UserRepository.create_user("etag_seller", "etag_seller@example.com", "pass123")
+        bidder = UserRepository.create_user("etag_bidder", "etag_bidder@example.com", "pass123")
+        with app.app_context():
+            auction = AuctionRepository.create_auction(
+                item_title="ETag Auction",
+                item_description="Conditional GET",
+                starting_bid=10.0,
+                end_time=datetime.utcnow() + timedelta(days=1),
+                item_condition="New",
+                seller=seller,
+                images=["http://example.com/etag.png"]
+            )
+
+        listing = client.get("/auction/", headers=json_headers)
+        bids = client.get(f"/auction/{auction.id}/bids")
+        assert listing.status_code == 200 and listing.headers["ETag"]
+        assert bids.status_code == 200 and bids.headers["ETag"]
+        assert "no-cache" in listing.headers["Cache-Control"]
+
+        # Matching If-None-Match: 304 without a Mongo query
+        with mock.patch.object(AuctionService, "search_auctions_page", side_effect=AssertionError("queried")), \
+                mock.patch.object(BidService, "get_bid_history", side_effect=AssertionError("queried")):
+            cached = client.get("/auction/", headers=dict(json_headers, **{"If-None-Match": listing.headers["ETag"]}))
+            assert cached.status_code == 304 and cached.data == b""
+            assert cached.headers["ETag"] == listing.headers["ETag"]
+            cached = client.get(f"/auction/{auction.id}/bids", headers={"If-None-Match": bids.headers["ETag"]})
+            assert cached.status_code == 304
+        # Each page of a query has its own ETag
+        assert client.get("/auction/", query_string={"limit": 5}, headers=dict(
+            json_headers, **{"If-None-Match": listing.headers["ETag"]})).status_code == 200
+
+        # An accepted bid bumps the auction's version and the collection generation
+        with app.app_context():
+            BidService.place_bid(str(auction.id), bidder.id, 15.0, bidder_name="etag_bidder")
+        fresh_bids = client.get(f"/auction/{auction.id}/bids", headers={"If-None-Match": bids.headers["ETag"]})
+        assert fresh_bids.status_code == 200 and fresh_bids.headers["ETag"] != bids.headers["ETag"]
+        assert fresh_bids.get_json()["bids"][0]["bid_amount"] == 15.0
+        fresh_listing = client.get("/auction/", headers=dict(json_headers, **{"If-None-Match": listing.headers["ETag"]}))
+        assert fresh_listing.status_code == 200
+        assert fresh_listing.get_json()["auctions"][0]["current_bid"] == 15.0
+    finally:
+        app.extensions["redis"] = original_redis
+
+
+def test_featured_grid_and_cards_are_fragment_cached(app):
+    from unittest import mock
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from flask import render_template
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.auction_service import AuctionService
+    from src.services.bid_service import BidService
+    from src.utils import metrics
+    from src.utils.fragment_cache import FragmentCacheExtension
+
+    original_redis = app.extensions.get("redis")
+    app.extensions["redis"] = fakeredis.FakeRedis()
+    try:
+        client = app.test_client()
+        seller = UserRepository.create_user("fragment_seller", "fragment_seller@example.com", "pass123")
+        bidder = UserRepository.create_user("fragment_bidder", "fragment_bidder@example.com", "pass123")
+        with app.app_context():
+            auctions = [AuctionRepository.create_auction(
+                item_title=f"Fragment Auction {i}",
+                item_description="Rendered once",
+                starting_bid=10.0,
+                end_time=datetime.utcnow() + timedelta(days=1),
+                item_condition="New",
+                seller=seller,
+                images=["http://example.com/fragment.png"]
+            ) for i in range(2)]
+
+        first = client.get("/user/").data.decode()
+        assert "Fragment Auction 0" in first and "Fragment Auction 1" in first
+
+        # A grid hit renders no cards
+        hits_before = metrics.snapshot()["counters"].get("cache.fragment.local_hit", 0)
+        with mock.patch("src.utils.fragment_cache.FragmentCacheExtension._render_cached",
+                        autospec=True, side_effect=FragmentCacheExtension._render_cached) as render_cached:
+            cached = client.get("/user/").data.decode()
+        assert "Fragment Auction 0" in cached and "Fragment Auction 1" in cached
+        assert render_cached.call_count == 1
+        assert metrics.snapshot()["counters"].get("cache.fragment.local_hit", 0) == hits_before + 1
+
+        # A bid changes the generation (grid miss) and that auction's version; the other card is reused
+        with app.app_context():
+            BidService.place_bid(str(auctions[0].id), bidder.id, 42.0, bidder_name="fragment_bidder")
+        hits_before = metrics.snapshot()["counters"].get("cache.fragment.local_hit", 0)
+        after_bid = client.get("/user/").data.decode()
+        assert "$42.0" in after_bid and "Fragment Auction 1" in after_bid
+        assert metrics.snapshot()["counters"].get("cache.fragment.local_hit", 0) == hits_before + 1
+
+        # Summaries loaded before a bid but rendered after it (a racing request, or a briefly stale
+        # summary cache) can't pin the old price to the grid or card /user/ reads after the bid
+        with app.app_context():
+            stale = AuctionService.get_featured_summaries(limit=None)
+            BidService.place_bid(str(auctions[1].id), bidder.id, 55.0, bidder_name="fragment_bidder")
+        with app.test_request_context("/user/"):
+            assert "$55.0" not in render_template("index.html", featured_auctions=stale)
+        with mock.patch.object(AuctionService, "get_featured_summaries", return_value=stale):
+            assert "$55.0" not in client.get("/user/").data.decode()
+        fresh = client.get("/user/").data.decode()
+        assert "$55.0" in fresh and "$42.0" in fresh
+    finally:
+        app.extensions["redis"] = original_redis
+
+
+def test_user_index_lists_every_active_auction(app):
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+
+    seller = UserRepository.create_user("index_seller", "index_seller@example.com", "pass123")
+    with app.app_context():
+        for i in range(8):
+            AuctionRepository.create_auction(
+                item_title=f"Index Auction {i}",
+                item_description="Listed on /user/",
+                starting_bid=10.0,
+                end_time=datetime.utcnow() + timedelta(days=1),
+                item_condition="New",
+                seller=seller,
+                images=["http://example.com/index.png"]
+            )
+        # A capped call fills the cached id list; an unlimited one still returns every auction
+        assert len(AuctionRepository.get_featured_summaries(limit=6)) == 6
+        assert len(AuctionRepository.get_featured_summaries(limit=None)) == 8
+
+    page = app.test_client().get("/user/").data.decode()
+    assert all(f">Index Auction {i}</a>" in page for i in range(8))
+
+
+def _scheduler_fixture(app, count, **kwargs):
+    """Auctions ending 1..count minutes from now, and an AuctionCloseScheduler recording its emits."""
+    import fakeredis
+
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.auction_scheduler import AuctionCloseScheduler
+
+    class RecordingSocketIO:
+        def __init__(self):
+            self.events = []
+
+        def emit(self, event, data, to=None):
+            self.events.append((event, data["auction_id"]))
+
+    seller = UserRepository.create_user("sched_seller", "sched_seller@example.com", "pass123")
+    now = datetime.utcnow()
+    auctions = [AuctionRepository.create_auction(
+        item_title=f"Scheduled Auction {i}",
+        item_description="Closed by the scheduler",
+        starting_bid=10.0,
+        end_time=now + timedelta(minutes=count - i),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/sched.png"]
+    ) for i in range(count)]
+    # Created latest-ending first, so heap order can't come from insertion order
+    auctions.reverse()
+    redis_client = fakeredis.FakeRedis()
+    socketio = RecordingSocketIO()
+    scheduler = AuctionCloseScheduler(app, socketio, redis_client, refresh_interval=3600, **kwargs)
+    return scheduler, socketio, redis_client, [str(a.id) for a in auctions], now
+
+
+def test_scheduler_closes_due_auctions_in_end_time_order(app):
+    import pytest
+    pytest.importorskip("fakeredis")
+
+    from src.models.auction import Auction
+
+    with app.app_context():
+        scheduler, socketio, _, ids, now = _scheduler_fixture(app, 4, horizon=600, batch_size=2)
+        assert scheduler._hold_lease()
+        scheduler._step()
+        assert scheduler._heap[0][1] == ids[0]
+        assert [auction_id for _, auction_id in sorted(scheduler._heap)] == ids
+
+        # A reschedule supersedes the earlier heap entry instead of closing on it
+        scheduler._push(ids[0], now + timedelta(minutes=9))
+
+        # Batches are capped at batch_size and popped earliest first
+        scheduler._close_due(now + timedelta(minutes=5))
+        assert socketio.events == [("auction_ended", ids[1]), ("auction_ended", ids[2])]
+        scheduler._close_due(now + timedelta(minutes=5))
+        assert socketio.events[2:] == [("auction_ended", ids[3])]
+        assert Auction.objects.get(id=ids[0]).status == "Active"
+        assert {a.status for a in Auction.objects(id__in=ids[1:])} == {"Completed"}
+
+
+def test_close_auctions_reports_each_close_once(app):
+    import pytest
+    pytest.importorskip("fakeredis")
+
+    from src.models.auction import Auction
+    from src.repositories.auction_repository import AuctionRepository
+
+    with app.app_context():
+        scheduler, socketio, _, ids, now = _scheduler_fixture(app, 3)
+        later = now + timedelta(minutes=10)
+        assert sorted(AuctionRepository.close_auctions(ids[:2], later)) == sorted(ids[:2])
+
+        # An auction extended after it was picked up is neither closed nor reported
+        original_end = Auction.objects.get(id=ids[2]).end_time
+        Auction.objects(id=ids[2]).update_one(set__end_time=later + timedelta(hours=1))
+        assert AuctionRepository.close_auctions([ids[2]], later) == []
+        assert Auction.objects.get(id=ids[2]).status == "Active"
+        Auction.objects(id=ids[2]).update_one(set__end_time=original_end)
+
+        # The overdue sweep and a stale heap entry both see the batch again: only the new close is announced
+        scheduler._close(ids, later)
+        assert socketio.events == [("auction_ended", ids[2])]
+        assert AuctionRepository.close_auctions(ids, later) == []
+
+
+def test_scheduler_lease_and_handoff(app):
+    import pytest
+    pytest.importorskip("fakeredis")
+
+    from src.services.auction_scheduler import AuctionCloseScheduler, LEASE_KEY, schedule_auction_close
+
+    with app.app_context():
+        leader, socketio, redis_client, ids, now = _scheduler_fixture(app, 1, horizon=120)
+        follower = AuctionCloseScheduler(app, socketio, redis_client, horizon=120)
+        assert leader._hold_lease() and not follower._hold_lease()
+        leader._step()
+        assert list(leader._scheduled) == ids
+
+        # Rescheduled inside the loaded window: handed to the leader through Redis, not reloaded from Mongo
+        original_redis = app.extensions.get("redis")
+        app.extensions["redis"] = redis_client
+        try:
+            schedule_auction_close(ids[0], now + timedelta(seconds=30))
+        finally:
+            app.extensions["redis"] = original_redis
+        leader._take_handoffs()
+        assert abs(leader._scheduled[ids[0]] - (now + timedelta(seconds=30))) < timedelta(milliseconds=1)
+
+        # The lease expires: the follower takes over with a fresh heap, the old leader steps down
+        redis_client.delete(LEASE_KEY)
+        assert follower._hold_lease()
+        assert not leader._hold_lease() and leader._heap == []
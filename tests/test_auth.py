@@ -15,3 +15,33 @@ def test_register_and_login(client):
     data = res.get_json()
     assert res.status_code == 200
     assert "access_token" in data
+
+
+def test_request_identity_loads_user_once(app):
+    from flask_jwt_extended import create_access_token
+    from src.repositories.user_repository import UserRepository
+    from src.utils import request_identity
+
+    user = UserRepository.create_user("ident", "ident@example.com", "pass123")
+    with app.app_context():
+        token = create_access_token(identity=str(user.id))
+
+    calls = []
+    original = UserRepository.get_cached_user
+    UserRepository.get_cached_user = staticmethod(lambda user_id: calls.append(user_id) or original(user_id))
+    try:
+        with app.test_request_context("/auction/", headers={"Authorization": f"Bearer {token}"}):
+            request_identity.load_identity()
+            assert request_identity.current_identity() == str(user.id)
+            assert request_identity.current_user().username == "ident"
+            assert request_identity.current_user() is request_identity.current_user()
+        assert len(calls) == 1
+    finally:
+        UserRepository.get_cached_user = original
+
+    # Cached snapshots never carry the password hash and see profile updates
+    assert UserRepository.get_cached_user(user.id).password is None
+    UserRepository.update_user(user.id, first_name="Ida")
+    assert UserRepository.get_cached_user(user.id).first_name == "Ida"
+    UserRepository.update_user_status(user.id, is_active=False)
+    assert UserRepository.get_cached_user(user.id).is_active is False
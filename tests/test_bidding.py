@@ -52,3 +52,777 @@ def test_place_bid(client):
 
     assert res.status_code == 200
     assert b"Bid placed successfully" in res.data
+
+
+def test_concurrent_equal_bids_exactly_one_wins(app):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timedelta
+
+    from src.exceptions.bid_too_low import BidTooLow
+    from src.models.auction import Auction
+    from src.models.bid import Bid
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.bid_service import BidService
+
+    seller = UserRepository.create_user("race_seller", "race_seller@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Contested Auction",
+        item_description="Concurrency test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/race.png"]
+    )
+    bidders = [
+        UserRepository.create_user(f"racer{i}", f"racer{i}@example.com", "pass123")
+        for i in range(10)
+    ]
+
+    # Release every bidder at once so the bids genuinely race
+    barrier = threading.Barrier(len(bidders))
+
+    def attempt(bidder):
+        barrier.wait()
+        try:
+            BidService.place_bid(auction.id, bidder.id, 25.0)
+            return True
+        except BidTooLow:
+            return False
+
+    with ThreadPoolExecutor(max_workers=len(bidders)) as pool:
+        results = list(pool.map(attempt, bidders))
+
+    assert results.count(True) == 1
+    assert Bid.objects(auction_id=auction.id).count() == 1
+    assert Auction.objects.get(id=auction.id).current_bid == 25.0
+
+
+def test_starting_bid_change_applies_until_the_first_bid(app):
+    from datetime import datetime, timedelta
+
+    import pytest
+
+    from src.exceptions.bid_too_low import BidTooLow
+    from src.models.auction import Auction
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.auction_service import AuctionService
+    from src.services.bid_service import BidService
+
+    seller = UserRepository.create_user("reprice_seller", "reprice_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("reprice_bidder", "reprice_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Repriced Auction",
+        item_description="Starting bid edit test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/reprice.png"]
+    )
+
+    # No bids yet: raising the starting bid raises the price bids must beat
+    updated = AuctionService.update_auction(str(auction.id), {"starting_bid": 50.0}, current_user_id=seller.id)
+    assert updated.current_bid == 50.0
+    with pytest.raises(BidTooLow):
+        BidService.place_bid(auction.id, bidder.id, 20.0)
+    BidService.place_bid(auction.id, bidder.id, 60.0)
+
+    # Once bid on, the starting bid no longer moves the price
+    AuctionService.update_auction(str(auction.id), {"starting_bid": 5.0}, current_user_id=seller.id)
+    assert Auction.objects.get(id=auction.id).current_bid == 60.0
+
+
+def test_bid_broadcaster_coalesces_to_latest_bid():
+    import threading
+    import time
+
+    from src.services.bid_broadcaster import BidBroadcaster
+
+    class RecordingSocketIO:
+        def __init__(self):
+            self.events = []
+
+        def emit(self, event, data, to=None):
+            self.events.append((event, data, to))
+
+        def start_background_task(self, target, *args):
+            threading.Thread(target=target, args=args).start()
+
+        def sleep(self, seconds):
+            time.sleep(seconds)
+
+    socketio = RecordingSocketIO()
+    broadcaster = BidBroadcaster(socketio, max_rate=10)
+    for price in (60.0, 70.0, 80.0, 90.0):
+        broadcaster.publish("a1", {"auction_id": "a1", "current_price": price})
+    time.sleep(0.3)
+
+    bid_updates = [data for event, data, to in socketio.events if event == "bid_update"]
+    assert [u["current_price"] for u in bid_updates] == [60.0, 90.0]
+    assert bid_updates[-1]["skipped_bids"] == 2
+    assert all(to == "auction:a1" for event, _, to in socketio.events if event == "bid_update")
+
+
+def test_socket_authenticates_once_per_connection(app):
+    from datetime import datetime, timedelta
+    from flask_jwt_extended import create_access_token
+    from src.models.bid import Bid
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services import socket_auth
+
+    socketio = app.extensions["socketio"]
+    seller = UserRepository.create_user("sock_seller", "sock_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("sock_bidder", "sock_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Socket Auction",
+        item_description="Socket auth test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/socket.png"]
+    )
+    with app.app_context():
+        token = create_access_token(identity=str(bidder.id))
+
+    anonymous = socketio.test_client(app)
+    anonymous.emit("place_bid", {"auction_id": str(auction.id), "bid_amount": 11})
+    errors = [m for m in anonymous.get_received() if m["name"] == "bid_error"]
+    assert errors and errors[0]["args"][0]["message"] == "Authentication required"
+
+    lookups = []
+    original = UserRepository.get_cached_user
+    UserRepository.get_cached_user = staticmethod(lambda user_id: lookups.append(user_id) or original(user_id))
+    try:
+        client = socketio.test_client(app, headers={"Authorization": f"Bearer {token}"})
+        for amount in (20, 30, 40):
+            client.emit("place_bid", {"auction_id": str(auction.id), "bid_amount": amount})
+    finally:
+        UserRepository.get_cached_user = original
+
+    # One lookup at connect, none per bid
+    assert len(lookups) == 1
+    assert Bid.objects(auction_id=auction.id, bidder_id=bidder.id).count() == 3
+
+    socket_auth.disconnect_user(socketio, bidder.id)
+    assert not client.is_connected()
+
+
+def test_redis_bid_engine_orders_concurrent_bids(app):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timedelta
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from src.exceptions.auction_ended import AuctionEnded
+    from src.exceptions.bid_too_low import BidTooLow
+    from src.models.auction import Auction
+    from src.models.bid import Bid
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.auction_service import AuctionService
+    from src.services.bid_engine import RedisBidEngine
+    from src.services.bid_service import BidService
+
+    seller = UserRepository.create_user("engine_seller", "engine_seller@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Engine Auction",
+        item_description="Redis bid engine test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/engine.png"]
+    )
+    bidders = [
+        UserRepository.create_user(f"engine{i}", f"engine{i}@example.com", "pass123")
+        for i in range(10)
+    ]
+
+    app.extensions["bid_engine"] = RedisBidEngine(fakeredis.FakeRedis())
+    try:
+        barrier = threading.Barrier(len(bidders))
+
+        def attempt(args):
+            bidder, amount = args
+            barrier.wait()
+            try:
+                with app.app_context():
+                    return BidService.place_bid(auction.id, bidder.id, amount).seq
+            except BidTooLow:
+                return None
+
+        with ThreadPoolExecutor(max_workers=len(bidders)) as pool:
+            seqs = [s for s in pool.map(attempt, [(b, 20.0 + i) for i, b in enumerate(bidders)]) if s]
+
+        # Every accepted bid got a distinct, gap-free sequence number
+        assert sorted(seqs) == list(range(1, len(seqs) + 1))
+        assert Bid.objects(auction_id=auction.id).count() == len(seqs)
+        stored = Auction.objects.get(id=auction.id)
+        assert stored.current_bid == 29.0
+        assert stored.bid_count == len(seqs)
+
+        with pytest.raises(BidTooLow):
+            BidService.place_bid(auction.id, bidders[0].id, 29.0)
+        AuctionService.close_auction(str(auction.id))
+        with pytest.raises(AuctionEnded):
+            BidService.place_bid(auction.id, bidders[0].id, 100.0)
+    finally:
+        del app.extensions["bid_engine"]
+
+
+def test_write_behind_replays_bids_after_crash(app):
+    from datetime import datetime, timedelta
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from src.models.bid import Bid
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.bid_repository import BidRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.bid_service import BidService
+    from src.services.bid_writer import BidWriteBehind
+
+    seller = UserRepository.create_user("wb_seller", "wb_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("wb_bidder", "wb_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Write-behind Auction",
+        item_description="Write-behind test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/wb.png"]
+    )
+
+    redis_client = fakeredis.FakeRedis()
+    crashed = BidWriteBehind(app, None, redis_client, interval=0.01, consumer="worker-1")
+    app.extensions["bid_writer"] = crashed
+    try:
+        with app.app_context():
+            bids = [BidService.place_bid(auction.id, bidder.id, amount) for amount in (20.0, 30.0, 40.0)]
+    finally:
+        del app.extensions["bid_writer"]
+
+    # Acknowledged, but nothing written yet
+    assert [b.bid_amount for b in bids] == [20.0, 30.0, 40.0]
+    assert Bid.objects(auction_id=auction.id).count() == 0
+
+    # worker-1 reads the batch, gets one bid in, then dies before acking
+    original = BidRepository.insert_many
+
+    def insert_one_then_crash(documents):
+        original(documents[:1])
+        raise ConnectionError("worker died mid-flush")
+
+    BidRepository.insert_many = staticmethod(insert_one_then_crash)
+    try:
+        with pytest.raises(ConnectionError):
+            crashed.flush_once()
+    finally:
+        BidRepository.insert_many = original
+    assert Bid.objects(auction_id=auction.id).count() == 1
+
+    # A restarted worker claims the abandoned entries and replays them without duplicates
+    recovered = BidWriteBehind(app, None, redis_client, interval=0.01, claim_idle=0, consumer="worker-2")
+    recovered.replay()
+    stored = Bid.objects(auction_id=auction.id).order_by("bid_amount")
+    assert [b.id for b in stored] == [b.id for b in bids]
+    assert recovered.flush_once() == 0
+    assert redis_client.xlen("bids:pending") == 0
+
+
+def test_bid_sequencer_commits_one_winner_per_batch(app):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timedelta
+
+    from src.exceptions.bid_too_low import BidTooLow
+    from src.models.auction import Auction
+    from src.models.bid import Bid
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.bid_sequencer import BidSequencer
+    from src.services.bid_service import BidService
+
+    class ThreadSocketIO:
+        def start_background_task(self, target, *args):
+            threading.Thread(target=target, args=args).start()
+
+        def sleep(self, seconds):
+            time.sleep(seconds)
+
+    seller = UserRepository.create_user("seq_seller", "seq_seller@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Sequenced Auction",
+        item_description="Group commit test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/seq.png"]
+    )
+    bidders = [
+        UserRepository.create_user(f"seq{i}", f"seq{i}@example.com", "pass123")
+        for i in range(10)
+    ]
+
+    writes = []
+    original = AuctionRepository.accept_bid
+    AuctionRepository.accept_bid = staticmethod(lambda *args, **kwargs: writes.append(args) or original(*args, **kwargs))
+    app.extensions["bid_sequencer"] = BidSequencer(app, ThreadSocketIO(), BidService.commit_bid, window=0.2)
+    try:
+        barrier = threading.Barrier(len(bidders))
+
+        def attempt(args):
+            bidder, amount = args
+            barrier.wait()
+            with app.app_context():
+                try:
+                    BidService.place_bid(auction.id, bidder.id, amount)
+                    return True
+                except BidTooLow:
+                    return False
+
+        with ThreadPoolExecutor(max_workers=len(bidders)) as pool:
+            results = list(pool.map(attempt, [(b, 20.0 + i) for i, b in enumerate(bidders)]))
+    finally:
+        AuctionRepository.accept_bid = original
+        del app.extensions["bid_sequencer"]
+
+    # All ten bids land in one window: one write, the highest wins, everyone else is told at once
+    assert results == [False] * 9 + [True]
+    assert len(writes) == 1
+    assert Bid.objects(auction_id=auction.id).count() == 1
+    assert Auction.objects.get(id=auction.id).current_bid == 29.0
+
+
+def test_bid_sequencer_survives_a_failed_batch(app):
+    import threading
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    import pytest
+
+    from src.exceptions.database_error import DatabaseError
+    from src.services.bid_sequencer import BidSequencer
+
+    class ThreadSocketIO:
+        def start_background_task(self, target, *args):
+            threading.Thread(target=target, args=args).start()
+
+        def sleep(self, seconds):
+            time.sleep(seconds)
+
+    class ConsumerKilled(BaseException):
+        pass
+
+    commits = []
+
+    def commit(auction_id, bidder_id, bid_amount, bidder_name):
+        commits.append(bid_amount)
+        if len(commits) == 1:
+            raise ConsumerKilled()
+        return bid_amount
+
+    sequencer = BidSequencer(app, ThreadSocketIO(), commit, window=0.2, timeout=2.0)
+    barrier = threading.Barrier(3)
+
+    def attempt(amount):
+        barrier.wait()
+        try:
+            return sequencer.submit("auction-1", "bidder", amount)
+        except DatabaseError as e:
+            return e
+
+    # The crash escapes _decide and kills the consumer: every bid in the batch still gets an answer
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(attempt, [20.0, 21.0, 22.0]))
+    assert all(isinstance(result, DatabaseError) for result in results)
+    assert sequencer._queues == {}
+
+    # ... and the next bid starts a fresh consumer instead of queueing behind the dead one
+    assert sequencer.submit("auction-1", "bidder", 23.0) == 23.0
+
+    # A consumer that never runs cannot hold a submitter forever
+    class StalledSocketIO(ThreadSocketIO):
+        def start_background_task(self, target, *args):
+            pass
+
+    stalled = BidSequencer(app, StalledSocketIO(), commit, window=0.1, timeout=0.2)
+    with pytest.raises(DatabaseError):
+        stalled.submit("auction-2", "bidder", 30.0)
+    assert stalled._queues["auction-2"] == []
+
+
+def test_idempotent_bid_retries_are_placed_once(app):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import datetime, timedelta
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from flask_jwt_extended import create_access_token
+    from src.models.bid import Bid
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+
+    seller = UserRepository.create_user("idem_seller", "idem_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("idem_bidder", "idem_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Idempotent Auction",
+        item_description="Idempotency test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/idem.png"]
+    )
+    with app.app_context():
+        token = create_access_token(identity=str(bidder.id))
+    headers = {"Authorization": f"Bearer {token}", "Idempotency-Key": "retry-me"}
+
+    original_redis = app.extensions["redis"]
+    app.extensions["redis"] = fakeredis.FakeRedis()
+    try:
+        # HTTP: eight copies of the same request race each other
+        barrier = threading.Barrier(8)
+
+        def submit(_):
+            barrier.wait()
+            return app.test_client().post(f"/bid/place/{auction.id}", json={"bid_amount": 25}, headers=headers)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(submit, range(8)))
+        assert [r.status_code for r in responses] == [200] * 8
+        assert {r.get_json()["new_current_bid"] for r in responses} == {25.0}
+        assert Bid.objects(auction_id=auction.id).count() == 1
+
+        # Same key, different bid
+        res = app.test_client().post(f"/bid/place/{auction.id}", json={"bid_amount": 30}, headers=headers)
+        assert res.status_code == 409
+
+        # Socket.IO: duplicates of a rejected bid all get the original error, none touch Mongo again
+        socketio = app.extensions["socketio"]
+        client = socketio.test_client(app, headers={"Authorization": headers["Authorization"]})
+        client.get_received()
+        for _ in range(3):
+            client.emit("place_bid", {"auction_id": str(auction.id), "bid_amount": 20, "idempotency_key": "low"})
+        errors = [m["args"][0]["message"] for m in client.get_received() if m["name"] == "bid_error"]
+        assert len(errors) == 3 and len(set(errors)) == 1
+        client.emit("place_bid", {"auction_id": str(auction.id), "bid_amount": 40, "idempotency_key": "high"})
+        client.emit("place_bid", {"auction_id": str(auction.id), "bid_amount": 40, "idempotency_key": "high"})
+        assert Bid.objects(auction_id=auction.id).count() == 2
+    finally:
+        app.extensions["redis"] = original_redis
+
+
+def test_bid_rate_limiter_rejects_floods_before_touching_mongo(app):
+    from datetime import datetime, timedelta
+    from unittest import mock
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from flask_jwt_extended import create_access_token
+    from src.models.bid import Bid
+    from src.models.user import User
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.utils import metrics
+    from src.utils.rate_limit import RateLimiter
+
+    seller = UserRepository.create_user("flood_seller", "flood_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("flood_bidder", "flood_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Flooded Auction",
+        item_description="Rate limit test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/flood.png"]
+    )
+    with app.app_context():
+        token = create_access_token(identity=str(bidder.id))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Burst of 3 per user, refilled far too slowly to matter during the test
+    app.extensions["bid_rate_limiter"] = RateLimiter(
+        fakeredis.FakeRedis(), "bid", {"user": (0.01, 3), "auction": (100, 100), "ip": (100, 100)}
+    )
+    try:
+        rejected_before = metrics.snapshot()["counters"].get("rate_limit.bid.rejected.user", 0)
+        client = app.test_client()
+        statuses = [
+            client.post(f"/bid/place/{auction.id}", json={"bid_amount": 20 + i}, headers=headers).status_code
+            for i in range(3)
+        ]
+        assert statuses == [200, 200, 200]
+
+        # The limiter answers before the user is loaded, and the rejected bid never reaches Mongo
+        with mock.patch("src.utils.request_identity.UserRepository.get_cached_user") as load_user, \
+                mock.patch.object(User, "objects") as user_query, \
+                mock.patch("src.routers.bid_router.BidService.place_bid_once") as place_bid_once:
+            res = client.post(f"/bid/place/{auction.id}", json={"bid_amount": 50}, headers=headers)
+            assert res.status_code == 429
+            assert res.get_json()["retry_after"] > 0
+            assert "Retry-After" in res.headers
+            load_user.assert_not_called()
+            user_query.assert_not_called()
+            place_bid_once.assert_not_called()
+
+        # The socket path shares the user's bucket and reports a rate_limited event
+        socketio = app.extensions["socketio"]
+        socket_client = socketio.test_client(app, headers=headers)
+        socket_client.get_received()
+        socket_client.emit("place_bid", {"auction_id": str(auction.id), "bid_amount": 60})
+        events = [m["name"] for m in socket_client.get_received()]
+        assert events == ["rate_limited"]
+
+        assert Bid.objects(auction_id=auction.id).count() == 3
+        assert metrics.snapshot()["counters"]["rate_limit.bid.rejected.user"] == rejected_before + 2
+    finally:
+        app.extensions.pop("bid_rate_limiter", None)
+
+
+def test_resume_replays_missed_bids_or_sends_snapshot(app):
+    from datetime import datetime, timedelta
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from flask_jwt_extended import create_access_token
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.bid_broadcaster import BidBroadcaster
+    from src.services.bid_event_log import BidEventLog
+
+    seller = UserRepository.create_user("resume_seller", "resume_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("resume_bidder", "resume_bidder@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Resumable Auction",
+        item_description="Event log test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/resume.png"]
+    )
+    with app.app_context():
+        token = create_access_token(identity=str(bidder.id))
+    headers = {"Authorization": f"Bearer {token}"}
+
+    # Keeps only the last 4 events; every bid is emitted (no coalescing)
+    original_broadcaster = app.extensions.get("bid_broadcaster")
+    app.extensions["bid_broadcaster"] = BidBroadcaster(app.extensions["socketio"], max_rate=0)
+    app.extensions["bid_event_log"] = BidEventLog(fakeredis.FakeRedis(), maxlen=4, max_replay=4)
+    try:
+        client = app.test_client()
+        for amount in (20, 30, 40, 50, 60, 70):
+            assert client.post(f"/bid/place/{auction.id}", json={"bid_amount": amount}, headers=headers).status_code == 200
+
+        socket_client = app.extensions["socketio"].test_client(app, headers=headers)
+        socket_client.get_received()
+
+        # Two bids behind: only those are replayed, in order
+        socket_client.emit("resume", {"auction_id": str(auction.id), "last_seq": 4})
+        [message] = socket_client.get_received()
+        assert message["name"] == "bid_replay"
+        events = message["args"][0]["events"]
+        assert [(e["seq"], e["bid_amount"]) for e in events] == [(5, 60), (6, 70)]
+
+        # Up to date: nothing to replay
+        socket_client.emit("resume", {"auction_id": str(auction.id), "last_seq": 6})
+        assert socket_client.get_received()[0]["args"][0]["events"] == []
+
+        # Seq 2 was trimmed from the log: the client gets a snapshot instead
+        socket_client.emit("resume", {"auction_id": str(auction.id), "last_seq": 1})
+        [message] = socket_client.get_received()
+        assert message["name"] == "bid_snapshot"
+        snapshot = message["args"][0]
+        assert snapshot["seq"] == 6
+        assert snapshot["current_price"] == 70.0 and snapshot["bid_count"] == 6
+        assert snapshot["bids"][0] == {
+            "bid_amount": 70.0, "bidder_id": str(bidder.id), "bidder_name": "resume_bidder",
+            "timestamp": snapshot["bids"][0]["timestamp"]
+        }
+
+        # Later bids reach the resumed client live, with the next seq
+        client.post(f"/bid/place/{auction.id}", json={"bid_amount": 80}, headers=headers)
+        updates = [m["args"][0] for m in socket_client.get_received() if m["name"] == "bid_update"]
+        assert [u["seq"] for u in updates] == [7]
+    finally:
+        app.extensions.pop("bid_event_log", None)
+        if original_broadcaster is None:
+            app.extensions.pop("bid_broadcaster", None)
+        else:
+            app.extensions["bid_broadcaster"] = original_broadcaster
+
+
+def test_user_bid_page_flags_winning_bids(app):
+    from datetime import datetime, timedelta
+
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.bid_service import BidService
+
+    seller = UserRepository.create_user("profile_seller", "profile_seller@example.com", "pass123")
+    bidder = UserRepository.create_user("profile_bidder", "profile_bidder@example.com", "pass123")
+    rival = UserRepository.create_user("profile_rival", "profile_rival@example.com", "pass123")
+    auctions = [
+        AuctionRepository.create_auction(
+            item_title=f"Profile Auction {i}",
+            item_description="Profile page test",
+            starting_bid=10.0,
+            end_time=datetime.utcnow() + timedelta(days=1),
+            item_condition="New",
+            seller=seller,
+            images=["http://example.com/profile.png"]
+        ) for i in range(3)
+    ]
+    for auction in auctions:
+        BidService.place_bid(str(auction.id), bidder.id, 20)
+    # Outbid on the first auction only
+    BidService.place_bid(str(auctions[0].id), rival.id, 30)
+
+    first, cursor = BidService.get_user_bid_page(bidder.id, limit=2)
+    rest, end = BidService.get_user_bid_page(bidder.id, limit=2, before=cursor)
+    assert cursor and end is None
+    rows = first + rest
+    # Newest first, each row already joined with its auction
+    assert [row["item_title"] for row in rows] == ["Profile Auction 2", "Profile Auction 1", "Profile Auction 0"]
+    assert [row["winning"] for row in rows] == [True, True, False]
+    assert rows[2]["current_bid"] == 30.0 and rows[2]["bid_amount"] == 20.0
+
+
+def test_accepted_bids_update_denormalized_stats(app):
+    from datetime import datetime, timedelta
+
+    import pytest
+
+    from src.exceptions.bid_too_low import BidTooLow
+    from src.models.auction import Auction
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.user_repository import UserRepository
+    from src.services.bid_service import BidService
+
+    seller = UserRepository.create_user("stats_seller", "stats_seller@example.com", "pass123")
+    alice = UserRepository.create_user("stats_alice", "stats_alice@example.com", "pass123")
+    bob = UserRepository.create_user("stats_bob", "stats_bob@example.com", "pass123")
+    auction = AuctionRepository.create_auction(
+        item_title="Stats Auction",
+        item_description="Denormalized stats test",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/stats.png"]
+    )
+    with app.app_context():
+        BidService.place_bid(str(auction.id), alice.id, 20.0, bidder_name="stats_alice")
+        second = BidService.place_bid(str(auction.id), bob.id, 30.0, bidder_name="stats_bob")
+        with pytest.raises(BidTooLow):
+            BidService.place_bid(str(auction.id), alice.id, 25.0, bidder_name="stats_alice")
+
+    # The accepting write keeps the stats; a rejected bid leaves them alone
+    stored = Auction._get_collection().find_one({"_id": auction.id})
+    assert stored["current_bid"] == 30.0
+    assert stored["bid_count"] == 2
+    assert stored["highest_bidder"] == bob.id
+    assert stored["highest_bidder_name"] == "stats_bob"
+    assert abs(stored["last_bid_at"] - second.created_at) < timedelta(seconds=1)
+
+
+def test_backfill_bid_stats_command(app):
+    from datetime import datetime, timedelta
+
+    from src.models.auction import Auction
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.bid_repository import BidRepository
+    from src.repositories.user_repository import UserRepository
+
+    seller = UserRepository.create_user("backfill_seller", "backfill_seller@example.com", "pass123")
+    alice = UserRepository.create_user("backfill_alice", "backfill_alice@example.com", "pass123")
+    bob = UserRepository.create_user("backfill_bob", "backfill_bob@example.com", "pass123")
+    auctions = [AuctionRepository.create_auction(
+        item_title=f"Backfill Auction {i}",
+        item_description="Bids placed before the stats existed",
+        starting_bid=10.0,
+        end_time=datetime.utcnow() + timedelta(days=1),
+        item_condition="New",
+        seller=seller,
+        images=["http://example.com/backfill.png"]
+    ) for i in range(3)]
+
+    # Bids written without touching the auctions, as they were before the denormalized fields
+    start = datetime.utcnow() - timedelta(hours=1)
+    with app.app_context():
+        BidRepository.place_bid(auctions[0].id, alice.id, 20.0, created_at=start)
+        BidRepository.place_bid(auctions[0].id, bob.id, 35.0, created_at=start + timedelta(minutes=1))
+        BidRepository.place_bid(auctions[0].id, alice.id, 30.0, created_at=start + timedelta(minutes=2))
+        BidRepository.place_bid(auctions[1].id, bob.id, 15.0, created_at=start)
+
+    result = app.test_cli_runner().invoke(args=["backfill-bid-stats", "--batch-size", "1"])
+    assert result.exit_code == 0, result.output
+    assert "Backfill complete: 2 auctions with bids, 2 updated." in result.output
+
+    collection = Auction._get_collection()
+    first = collection.find_one({"_id": auctions[0].id})
+    assert (first["bid_count"], first["current_bid"]) == (3, 35.0)
+    assert (first["highest_bidder"], first["highest_bidder_name"]) == (bob.id, "backfill_bob")
+    assert abs(first["last_bid_at"] - (start + timedelta(minutes=2))) < timedelta(seconds=1)
+    second = collection.find_one({"_id": auctions[1].id})
+    assert (second["bid_count"], second["current_bid"], second["highest_bidder_name"]) == (1, 15.0, "backfill_bob")
+    untouched = collection.find_one({"_id": auctions[2].id})
+    assert untouched["bid_count"] == 0 and untouched.get("highest_bidder") is None
+
+    # Re-running is a no-op
+    result = app.test_cli_runner().invoke(args=["backfill-bid-stats"])
+    assert "Backfill complete: 2 auctions with bids, 0 updated." in result.output
+
+
+def test_abandoned_idempotency_claim_expires(app):
+    import time
+
+    import pytest
+    fakeredis = pytest.importorskip("fakeredis")
+
+    from src.exceptions.idempotency_conflict import IdempotencyConflict
+    from src.utils.idempotency import DEFAULT_TTL, KEY_PREFIX, run_once
+
+    class WorkerKilled(BaseException):
+        """Like eventlet's Timeout or GreenletExit: not caught by `except Exception`."""
+
+    redis_client = fakeredis.FakeRedis()
+    original_redis = app.extensions["redis"]
+    app.extensions["redis"] = redis_client
+    try:
+        with app.app_context():
+            def killed():
+                raise WorkerKilled()
+
+            # The worker dies between the claim and storing an outcome: the claim is left behind
+            with pytest.raises(WorkerKilled):
+                run_once("abandoned", "fp", killed, pending_ttl=1)
+            assert 0 < redis_client.ttl(KEY_PREFIX + "abandoned") <= 1
+            with pytest.raises(IdempotencyConflict):
+                run_once("abandoned", "fp", lambda: {"placed": True}, wait=0.1)
+
+            # ...but only for pending_ttl; the retry then runs and its outcome is kept for the full TTL
+            time.sleep(1.1)
+            assert run_once("abandoned", "fp", lambda: {"placed": True}, wait=0.1) == ({"placed": True}, False)
+            assert redis_client.ttl(KEY_PREFIX + "abandoned") > DEFAULT_TTL - 60
+            assert run_once("abandoned", "fp", lambda: {"placed": False}) == ({"placed": True}, True)
+    finally:
+        app.extensions["redis"] = original_redis
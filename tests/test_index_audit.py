@@ -0,0 +1,27 @@
+def test_every_repository_query_is_audited(app):
+    import inspect
+
+    from src.repositories.auction_repository import AuctionRepository
+    from src.repositories.bid_repository import BidRepository
+    from src.repositories.contact_repository import ContactMessageRepository
+    from src.repositories.user_repository import UserRepository
+    from src.utils.index_audit import UNAUDITED_QUERIES, repository_queries
+
+    # A method queries Mongo if it builds a queryset, touches the raw collection or uses the search helper
+    query_markers = (".objects", "_get_collection(", "_search_query(", ".aggregate(")
+
+    methods, query_methods = set(), set()
+    for repository in (AuctionRepository, BidRepository, UserRepository, ContactMessageRepository):
+        for name, method in inspect.getmembers(repository, inspect.isfunction):
+            if name.startswith("_"):
+                continue
+            qualified = f"{repository.__name__}.{name}"
+            methods.add(qualified)
+            if any(marker in inspect.getsource(method) for marker in query_markers):
+                query_methods.add(qualified)
+
+    audited = {name.split("(")[0] for name, _ in repository_queries()}
+    assert sorted(query_methods - audited - set(UNAUDITED_QUERIES)) == [], \
+        "add these to index_audit.repository_queries() (or UNAUDITED_QUERIES with a reason)"
+    # No entries for methods that were renamed or removed
+    assert sorted((audited | set(UNAUDITED_QUERIES)) - methods) == []